@@ -0,0 +1,128 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from Caeser_Cipher import caesar_translate
+
+# English letter frequencies (percent), A to Z
+ENGLISH_FREQUENCIES = [
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+    6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+]
+
+INVERSE_FREQUENCIES = [100 / frequency for frequency in ENGLISH_FREQUENCIES]
+
+LOWERCASE = 'abcdefghijklmnopqrstuvwxyz'
+UPPERCASE = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+def letter_histogram(text):
+    """ Counts each letter A-Z (case-insensitive) in a single pass over the text """
+    counts = Counter(text)
+    return [counts[lower] + counts[upper] for lower, upper in zip(LOWERCASE, UPPERCASE)]
+
+def shift_scores(histogram):
+    """
+    Returns the chi-squared distance from English for every decryption shift
+    0-25. Decrypting by `shift` turns ciphertext letter i + shift into
+    plaintext letter i, so each shift is scored by rotating the histogram
+    instead of decrypting the text. Since the observed and expected counts
+    both sum to the letter total N, chi-squared reduces to
+    sum(observed ** 2 / expected) - N, which only needs the letters present.
+    """
+    total = sum(histogram)
+    present = [(letter, count * count / total) for letter, count in enumerate(histogram) if count]
+    scores = []
+    for shift in range(26):
+        score = 0.0
+        for letter, weight in present:
+            score += weight * INVERSE_FREQUENCIES[(letter - shift) % 26]
+        scores.append(score - total)
+    return scores
+
+def break_caesar(text):
+    """
+    Finds the most likely Caesar shift of `text`. Returns the shift to pass
+    to caesar_cipher(..., 'decrypt'), a 0-1 confidence (how far the best
+    shift is ahead of the runner-up), its chi-squared score and the
+    decrypted plaintext.
+    """
+    histogram = letter_histogram(text)
+    if not any(histogram):
+        return {'shift': 0, 'confidence': 0.0, 'chi_squared': None, 'plaintext': text}
+
+    scores = shift_scores(histogram)
+    ranked = sorted(range(26), key=scores.__getitem__)
+    best, runner_up = scores[ranked[0]], scores[ranked[1]]
+    confidence = (runner_up - best) / runner_up if runner_up else 0.0
+    return {
+        'shift': ranked[0],
+        'confidence': round(confidence, 4),
+        'chi_squared': round(best, 4),
+        'plaintext': caesar_translate(text, ranked[0], 'decrypt'),
+    }
+
+def _break_lines(lines):
+    return [break_caesar(line) for line in lines]
+
+def break_file(src, dst, workers=None, batch_size=1000):
+    """
+    Breaks every line of `src` and writes one JSON object per line to `dst`,
+    numbered and in input order. `src` is read only 2 * workers batches of
+    `batch_size` lines ahead of the output. If a worker raises, the batches
+    not yet started are cancelled and the exception propagates. Returns the
+    number of lines processed.
+    """
+    lines = (line.rstrip('\r\n') for line in src)
+    count = 0
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = 2 * workers
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        in_flight = []
+        while True:
+            while len(in_flight) < max_in_flight:
+                batch = list(islice(lines, batch_size))
+                if not batch:
+                    break
+                in_flight.append(pool.submit(_break_lines, batch))
+            if not in_flight:
+                return count
+            for result in in_flight.pop(0).result():
+                result['line'] = count + 1
+                dst.write(json.dumps(result) + '\n')
+                count += 1
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Break Caesar-shifted ciphertexts, one per line, into JSONL.")
+    parser.add_argument('file', nargs='?', help="newline-delimited ciphertexts (default: stdin)")
+    parser.add_argument('-o', '--output', help="JSONL output file (default: stdout)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--batch-size', type=int, default=1000, help="lines per worker task (default: 1000)")
+    args = parser.parse_args(argv)
+
+    src = dst = None
+    start = time.perf_counter()
+    try:
+        src = open(args.file, encoding='utf-8', errors='surrogateescape') if args.file else sys.stdin
+        dst = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+        count = break_file(src, dst, args.workers, args.batch_size)
+    except OSError as e:
+        parser.error(str(e))
+    finally:
+        if args.file and src is not None:
+            src.close()
+        if args.output and dst is not None:
+            dst.close()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"Broke {count:,} lines in {elapsed:.2f}s - {rate:,.0f} lines/sec", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,10 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache
 
 def caesar_cipher(text, shift, mode):
     """
@@ -32,72 +37,231 @@ def caesar_cipher(text, shift, mode):
             result += char
     return result
 
-def handle_encryption():
+class _ShiftTable(dict):
     """
-    Retrieves input values, encrypts or decrypts the message using Caesar Cipher,
-    and updates the output text area.
+    str.translate table for one shift. ASCII letters are filled in up front;
+    any other character is worked out with caesar_cipher the first time it
+    is seen, so the table agrees with caesar_cipher on every character.
     """
-    try:
-        text = input_text.get("1.0", "end-1c")
-        shift = int(shift_entry.get())
-        mode = mode_var.get()
+    def __init__(self, shift, mode):
+        super().__init__()
+        self.shift = shift
+        self.mode = mode
+        for char in 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ':
+            self[ord(char)]
 
-        if mode not in ['encrypt', 'decrypt']:
-            raise ValueError("Invalid mode! Please enter 'encrypt' or 'decrypt'.")
+    def __missing__(self, codepoint):
+        value = ord(caesar_cipher(chr(codepoint), self.shift, self.mode))
+        self[codepoint] = value
+        return value
 
-        result = caesar_cipher(text, shift, mode)
-        output_text.delete("1.0", "end")
-        output_text.insert("end", result)
+@lru_cache(maxsize=None)
+def translation_table(shift, mode):
+    """ Returns the cached str.translate table for a shift and mode """
+    return _ShiftTable(shift, mode)
 
-    except ValueError as e:
-        messagebox.showerror("Error", str(e))
+@lru_cache(maxsize=None)
+def byte_translation_table(shift, mode):
+    """
+    Returns the cached bytes.translate table for a shift and mode. Only
+    ASCII letters are shifted; every other byte maps to itself.
+    """
+    table = bytearray(range(256))
+    for char in b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ':
+        shifted = ord(caesar_cipher(chr(char), shift, mode))
+        if shifted > 255:
+            raise ValueError(f"Shift {shift} moves letters outside the byte range")
+        table[char] = shifted
+    return bytes(table)
 
-def on_button_hover(event=None):
+def caesar_translate(text, shift, mode):
+    """ Same result as caesar_cipher, computed with one str.translate call """
+    return text.translate(translation_table(shift, mode))
+
+def caesar_translate_bytes(data, shift, mode):
+    """ Shifts the ASCII letters of `data` with one bytes.translate call """
+    return data.translate(byte_translation_table(shift, mode))
+
+# Headless bulk processing
+def stream_caesar(src, dst, shift, mode, binary=False, chunk_size=1024 * 1024):
     """
-    Changes the background color of the encrypt/decrypt button on hover.
+    Copies `src` to `dst` chunk by chunk through the cipher, so memory stays
+    bounded by the chunk size. Both are file objects, binary when `binary`
+    is set and text otherwise. Returns the number of characters or bytes.
     """
-    encrypt_button.configure(bg="#43a047")
+    transform = caesar_translate_bytes if binary else caesar_translate
+    total = 0
+    while True:
+        chunk = src.read(chunk_size)
+        if not chunk:
+            return total
+        dst.write(transform(chunk, shift, mode))
+        total += len(chunk)
+
+def _open_input(path, binary):
+    if binary:
+        return open(path, 'rb')
+    # surrogateescape round-trips bytes that are not valid UTF-8 untouched
+    return open(path, 'r', encoding='utf-8', errors='surrogateescape', newline='')
 
-def on_button_leave(event=None):
+def _open_output(path, binary):
+    if binary:
+        return open(path, 'wb')
+    return open(path, 'w', encoding='utf-8', errors='surrogateescape', newline='')
+
+def process_file(input_path, output_path, shift, mode, binary=False, chunk_size=1024 * 1024):
+    """ Encrypts or decrypts one file into another, returning (input_path, size, seconds) """
+    start = time.perf_counter()
+    with _open_input(input_path, binary) as src, _open_output(output_path, binary) as dst:
+        total = stream_caesar(src, dst, shift, mode, binary, chunk_size)
+    return input_path, total, time.perf_counter() - start
+
+def process_files(input_paths, output_dir, shift, mode, binary=False, chunk_size=1024 * 1024, workers=None):
     """
-    Restores the background color of the encrypt/decrypt button when not hovered.
+    Fans several files out over a process pool. Each output keeps its input
+    file name inside `output_dir`, so two inputs with the same name are
+    refused with ValueError. Yields (input_path, size, seconds) as files
+    finish.
     """
-    encrypt_button.configure(bg="#4caf50")
+    outputs = {}
+    for path in input_paths:
+        name = os.path.basename(path)
+        if name in outputs:
+            raise ValueError(f"{outputs[name]} and {path} would both be written to {name}")
+        outputs[name] = path
+    os.makedirs(output_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = [
+            pool.submit(process_file, path, os.path.join(output_dir, name), shift, mode, binary, chunk_size)
+            for name, path in outputs.items()
+        ]
+        for job in jobs:
+            yield job.result()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Caesar cipher for text, files and raw bytes.")
+    parser.add_argument('shift', type=int, help="number of positions to shift")
+    parser.add_argument('mode', choices=['encrypt', 'decrypt'])
+    parser.add_argument('files', nargs='*', help="input files (default: stdin)")
+    parser.add_argument('-o', '--output', help="output file for a single input (default: stdout)")
+    parser.add_argument('-d', '--output-dir', help="output directory for several inputs, processed in parallel")
+    parser.add_argument('-b', '--bytes', action='store_true', help="treat input as raw bytes, shifting only ASCII letters")
+    parser.add_argument('--chunk-size', type=int, default=1024 * 1024, help="characters or bytes read per chunk")
+    parser.add_argument('--workers', type=int, help="worker processes for several inputs (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.bytes:
+            byte_translation_table(args.shift, args.mode)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if len(args.files) > 1 and not args.output_dir:
+        parser.error("Use --output-dir with several input files")
+
+    start = time.perf_counter()
+    try:
+        if args.output_dir:
+            total = 0
+            for path, size, seconds in process_files(args.files, args.output_dir, args.shift, args.mode,
+                                                     args.bytes, args.chunk_size, args.workers):
+                total += size
+                print(f"{path}: {size:,} in {seconds:.2f}s", file=sys.stderr)
+        else:
+            with ExitStack() as stack:
+                if args.files:
+                    src = stack.enter_context(_open_input(args.files[0], args.bytes))
+                else:
+                    src = sys.stdin.buffer if args.bytes else sys.stdin
+                if args.output:
+                    dst = stack.enter_context(_open_output(args.output, args.bytes))
+                else:
+                    dst = sys.stdout.buffer if args.bytes else sys.stdout
+                total = stream_caesar(src, dst, args.shift, args.mode, args.bytes, args.chunk_size)
+                dst.flush()
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed / 1e6 if elapsed > 0 else 0.0
+    print(f"Processed {total:,} {'bytes' if args.bytes else 'characters'} in {elapsed:.2f}s - {rate:.1f} M/s", file=sys.stderr)
+    return 0
+
+def run_gui():
+    import tkinter as tk
+    from tkinter import ttk, messagebox
+
+    def handle_encryption():
+        """
+        Retrieves input values, encrypts or decrypts the message using Caesar Cipher,
+        and updates the output text area.
+        """
+        try:
+            text = input_text.get("1.0", "end-1c")
+            shift = int(shift_entry.get())
+            mode = mode_var.get()
+
+            if mode not in ['encrypt', 'decrypt']:
+                raise ValueError("Invalid mode! Please enter 'encrypt' or 'decrypt'.")
+
+            result = caesar_translate(text, shift, mode)
+            output_text.delete("1.0", "end")
+            output_text.insert("end", result)
+
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+
+    def on_button_hover(event=None):
+        """
+        Changes the background color of the encrypt/decrypt button on hover.
+        """
+        encrypt_button.configure(bg="#43a047")
+
+    def on_button_leave(event=None):
+        """
+        Restores the background color of the encrypt/decrypt button when not hovered.
+        """
+        encrypt_button.configure(bg="#4caf50")
+
+    # GUI setup
+    root = tk.Tk()
+    root.title("Advanced Caesar Cipher")
+    root.configure(background="#f0f0f0")
 
-# GUI setup
-root = tk.Tk()
-root.title("Advanced Caesar Cipher")
-root.configure(background="#f0f0f0")
+    main_frame = ttk.Frame(root, padding="20")
+    main_frame.grid(row=0, column=0, sticky="nsew")
 
-main_frame = ttk.Frame(root, padding="20")
-main_frame.grid(row=0, column=0, sticky="nsew")
+    style = ttk.Style()
+    style.configure("Custom.TFrame", background="#f0f0f0")
+    style.configure("Custom.TLabel", background="#f0f0f0", font=("Arial", 12))
+    style.configure("Custom.TButton", background="#4caf50", foreground="white", font=("Arial", 12, "bold"))
 
-style = ttk.Style()
-style.configure("Custom.TFrame", background="#f0f0f0")
-style.configure("Custom.TLabel", background="#f0f0f0", font=("Arial", 12))
-style.configure("Custom.TButton", background="#4caf50", foreground="white", font=("Arial", 12, "bold"))
+    # Widgets
+    ttk.Label(main_frame, text="Enter the message:", style="Custom.TLabel").grid(row=0, column=0, sticky="w")
+    input_text = tk.Text(main_frame, height=5, width=40)
+    input_text.grid(row=1, column=0, columnspan=3, padx=(0, 10), pady=5, sticky="w")
 
-# Widgets
-ttk.Label(main_frame, text="Enter the message:", style="Custom.TLabel").grid(row=0, column=0, sticky="w")
-input_text = tk.Text(main_frame, height=5, width=40)
-input_text.grid(row=1, column=0, columnspan=3, padx=(0, 10), pady=5, sticky="w")
+    ttk.Label(main_frame, text="Enter the shift value:", style="Custom.TLabel").grid(row=2, column=0, sticky="w")
+    shift_entry = ttk.Entry(main_frame, width=10)
+    shift_entry.grid(row=2, column=1, pady=5, sticky="w")
 
-ttk.Label(main_frame, text="Enter the shift value:", style="Custom.TLabel").grid(row=2, column=0, sticky="w")
-shift_entry = ttk.Entry(main_frame, width=10)
-shift_entry.grid(row=2, column=1, pady=5, sticky="w")
+    ttk.Label(main_frame, text="Select 'encrypt' or 'decrypt':", style="Custom.TLabel").grid(row=3, column=0, sticky="w")
+    mode_var = tk.StringVar(value="encrypt")
+    mode_combobox = ttk.Combobox(main_frame, textvariable=mode_var, values=["encrypt", "decrypt"], width=10)
+    mode_combobox.grid(row=3, column=1, pady=5, sticky="w")
 
-ttk.Label(main_frame, text="Select 'encrypt' or 'decrypt':", style="Custom.TLabel").grid(row=3, column=0, sticky="w")
-mode_var = tk.StringVar(value="encrypt")
-mode_combobox = ttk.Combobox(main_frame, textvariable=mode_var, values=["encrypt", "decrypt"], width=10)
-mode_combobox.grid(row=3, column=1, pady=5, sticky="w")
+    encrypt_button = tk.Button(main_frame, text="Encrypt/Decrypt", command=handle_encryption, bg="#4caf50", fg="white", font=("Arial", 12, "bold"))
+    encrypt_button.grid(row=4, column=0, columnspan=2, pady=10)
+    encrypt_button.bind("<Enter>", on_button_hover)
+    encrypt_button.bind("<Leave>", on_button_leave)
 
-encrypt_button = tk.Button(main_frame, text="Encrypt/Decrypt", command=handle_encryption, bg="#4caf50", fg="white", font=("Arial", 12, "bold"))
-encrypt_button.grid(row=4, column=0, columnspan=2, pady=10)
-encrypt_button.bind("<Enter>", on_button_hover)
-encrypt_button.bind("<Leave>", on_button_leave)
+    ttk.Label(main_frame, text="Result:", style="Custom.TLabel").grid(row=5, column=0, sticky="w")
+    output_text = tk.Text(main_frame, height=5, width=40)
+    output_text.grid(row=6, column=0, columnspan=3, padx=(0, 10), pady=5, sticky="w")
 
-ttk.Label(main_frame, text="Result:", style="Custom.TLabel").grid(row=5, column=0, sticky="w")
-output_text = tk.Text(main_frame, height=5, width=40)
-output_text.grid(row=6, column=0, columnspan=3, padx=(0, 10), pady=5, sticky="w")
+    root.mainloop()
 
-root.mainloop()
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(main())
+    run_gui()
@@ -1,6 +1,10 @@
-import tkinter as tk
-from tkinter import messagebox
-from tkinter import ttk
+import argparse
+import itertools
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 
 class Rotor:
     def __init__(self, wiring, notch):
@@ -62,51 +66,273 @@ class EnigmaMachine:
                 break
 
     def process_message(self, message):
-        encoded_message = ''
+        encoded_message = []
         for letter in message:
             if letter.isalpha():
                 self.rotate_rotors()
-                encoded_message += self.encode(letter.upper())
+                encoded_message.append(self.encode(letter.upper()))
             else:
-                encoded_message += letter
-        return encoded_message
-
-def on_encode_decode(action):
-    try:
-        message = input_text.get("1.0", tk.END).strip()
-        if not message:
-            raise ValueError("Input message cannot be empty")
-
-        rotor1_pos = rotor1_entry.get().upper()
-        rotor2_pos = rotor2_entry.get().upper()
-        rotor3_pos = rotor3_entry.get().upper()
-
-        if not (rotor1_pos.isalpha() and rotor2_pos.isalpha() and rotor3_pos.isalpha()):
-            raise ValueError("Rotor positions must be alphabetic characters (A-Z)")
-
-        rotor1.set_position(rotor1_pos)
-        rotor2.set_position(rotor2_pos)
-        rotor3.set_position(rotor3_pos)
-
-        if action == "encode":
-            result_message = enigma.process_message(message)
-        elif action == "decode":
-            result_message = enigma.process_message(message)
+                encoded_message.append(letter)
+        return ''.join(encoded_message)
+
+def _notch_hits(steps, start, notch):
+    """
+    Counts how many of the first `steps` steps of a rotor starting at `start`
+    leave it on its notch, i.e. how many times it turns over the next rotor.
+    Works on plain ints and on NumPy arrays alike.
+    """
+    first = (notch - start - 1) % 26 + 1
+    return (steps - first + 26) // 26
+
+def _offset_tables(wiring):
+    """ Returns flat forward/inverse tables indexed by offset * 26 + letter """
+    wiring = np.frombuffer(wiring.encode(), dtype=np.uint8).astype(np.int32) - ord('A')
+    offsets = np.arange(26)[:, None]
+    letters = np.arange(26)[None, :]
+    forward = (wiring[(letters + offsets) % 26] - offsets) % 26
+    backward = np.argsort(forward, axis=1)
+    return forward.astype(np.uint8).ravel(), backward.astype(np.uint8).ravel()
+
+class EnigmaEngine:
+    """
+    Table-driven, NumPy-vectorized counterpart of EnigmaMachine.
+
+    Forward and inverse permutation tables are built once for every rotor
+    offset. A message is enciphered by first computing the rotor positions
+    for every letter and then pushing all letters through the tables as one
+    batched array operation. Letters A-Z (either case) are enciphered and
+    upper-cased; everything else passes through unchanged.
+
+    Rotor stepping is deterministic, so the engine only tracks the start
+    positions and how many letters have been processed. seek() jumps to the
+    machine state at any letter offset without stepping through the prefix.
+    """
+    def __init__(self, rotors, reflector, plugboard):
+        self.wirings = [rotor.wiring for rotor in rotors]
+        self.notches = [rotor.notch for rotor in rotors]
+        self.reflector_wiring = reflector.wiring
+        self.plugboard_wiring = plugboard.wiring
+        self.start_positions = [rotor.position for rotor in rotors]
+        self.offset = 0
+        self.rotor_tables = [_offset_tables(wiring) for wiring in self.wirings]
+        self.reflector_table = np.frombuffer(reflector.wiring.encode(), dtype=np.uint8) - ord('A')
+        self.plugboard_table = np.frombuffer(plugboard.wiring.encode(), dtype=np.uint8) - ord('A')
+        self.state_table = None
+        self.chars_per_sec = 0.0
+
+    @classmethod
+    def from_settings(cls, settings):
+        """ Rebuilds an engine from the plain tuple returned by settings() """
+        wirings, notches, reflector_wiring, plugboard_wiring, start_positions, offset = settings
+        rotors = [Rotor(wiring, notch) for wiring, notch in zip(wirings, notches)]
+        engine = cls(rotors, Reflector(reflector_wiring), Plugboard(plugboard_wiring))
+        engine.start_positions = list(start_positions)
+        engine.offset = offset
+        return engine
+
+    def settings(self):
+        """ Returns the machine settings and state as a picklable tuple """
+        notches = ''.join(chr(notch + ord('A')) for notch in self.notches)
+        return (self.wirings, notches, self.reflector_wiring, self.plugboard_wiring,
+                self.start_positions, self.offset)
+
+    def set_positions(self, positions):
+        self.start_positions = [ord(char.upper()) - ord('A') for char in positions]
+        self.offset = 0
+
+    def seek(self, offset):
+        """ Moves to the state reached after `offset` letters from the start positions """
+        if offset < 0:
+            raise ValueError("Offset must not be negative")
+        self.offset = offset
+
+    def tell(self):
+        return self.offset
+
+    @property
+    def positions(self):
+        return self.positions_at(self.offset)
+
+    def positions_at(self, offset):
+        """ Returns the rotor positions after `offset` letters, in O(1) """
+        return [int(position) for position in self.positions_from(self.start_positions, offset)]
+
+    def positions_from(self, start_positions, steps):
+        """
+        Returns the position of every rotor after `steps` letters from
+        `start_positions`. Both may be NumPy arrays; they broadcast, so a
+        column of start positions against a row of steps gives one row of
+        positions per start.
+        """
+        positions = []
+        for start, notch in zip(start_positions, self.notches):
+            positions.append((start + steps) % 26)
+            steps = _notch_hits(steps, start, notch)
+        return positions
+
+    def rotor_positions(self, count):
+        """ Returns one array of positions per rotor for the next `count` letters """
+        steps = np.arange(self.offset + 1, self.offset + count + 1, dtype=np.int64)
+        return self.positions_from(self.start_positions, steps)
+
+    def encode_letters(self, letters, positions):
+        """ Enciphers an array of letter indices (0-25) at the given rotor positions """
+        letters = self.plugboard_table[letters]
+        if self.state_table is not None:
+            state = positions[0].astype(np.intp) + positions[1] * 26 + positions[2] * 676
+            return self.plugboard_table[self.state_table[state * 26 + letters]]
+        offsets = [position.astype(np.intp) * 26 for position in positions]
+        for (forward, _), offset in zip(self.rotor_tables, offsets):
+            letters = forward[offset + letters]
+        letters = self.reflector_table[letters]
+        for (_, backward), offset in zip(reversed(self.rotor_tables), reversed(offsets)):
+            letters = backward[offset + letters]
+        return self.plugboard_table[letters]
+
+    def attach_cache(self, cache):
+        """ Switches to the precomputed substitution tables of a StateCache """
+        if len(self.wirings) != 3:
+            raise ValueError("The state cache only covers three-rotor machines")
+        self.state_table = cache.table(self.wirings, self.reflector_wiring).reshape(-1)
+
+    def process_bytes(self, data):
+        """ Enciphers ASCII letters in `data` and advances the rotors past them """
+        start = time.perf_counter()
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        mask = _letter_mask(buffer)
+        letters = (buffer[mask] & 0xDF) - ord('A')
+        output = buffer.copy()
+        if letters.size:
+            positions = self.rotor_positions(letters.size)
+            output[mask] = self.encode_letters(letters, positions) + ord('A')
+            self.offset += int(letters.size)
+        elapsed = time.perf_counter() - start
+        if elapsed > 0:
+            self.chars_per_sec = buffer.size / elapsed
+        return output.tobytes()
 
-        output_text.config(state=tk.NORMAL)
-        output_text.delete("1.0", tk.END)
-        output_text.insert(tk.END, result_message)
-        output_text.config(state=tk.DISABLED)
-    except ValueError as e:
-        messagebox.showerror("Input Error", str(e))
+    def process_message(self, message):
+        return self.process_bytes(message.encode('utf-8')).decode('utf-8')
+
+def _letter_mask(buffer):
+    upper = buffer & 0xDF
+    return (upper >= ord('A')) & (upper <= ord('Z'))
+
+def count_letters(data):
+    """ Counts the bytes of `data` that the engine enciphers (ASCII letters) """
+    return int(np.count_nonzero(_letter_mask(np.frombuffer(data, dtype=np.uint8))))
+
+def _process_chunk(args):
+    settings, offset, data = args
+    engine = EnigmaEngine.from_settings(settings)
+    engine.seek(offset)
+    return engine.process_bytes(data)
+
+def parallel_process(engine, data, workers=None, chunk_size=4 * 1024 * 1024, pool=None):
+    """
+    Enciphers `data` on a process pool and returns the same bytes as
+    engine.process_bytes(data). Every chunk is handed to a worker together
+    with the letter offset it starts at, so workers seek straight to their
+    state instead of replaying the chunks before them. The engine is left
+    positioned after the last letter, as in the serial path. Pass `pool` to
+    reuse a running pool; otherwise one is started for this call.
+    """
+    chunks = [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+    offsets = []
+    offset = engine.offset
+    for chunk in chunks:
+        offsets.append(offset)
+        offset += count_letters(chunk)
+
+    start = time.perf_counter()
+    settings = engine.settings()
+    jobs = [(settings, chunk_offset, chunk) for chunk_offset, chunk in zip(offsets, chunks)]
+    if pool is None:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            output = b''.join(pool.map(_process_chunk, jobs))
+    else:
+        output = b''.join(pool.map(_process_chunk, jobs))
+    elapsed = time.perf_counter() - start
+    if elapsed > 0:
+        engine.chars_per_sec = len(data) / elapsed
+    engine.seek(offset)
+    return output
+
+def process_file_slice(engine, filepath, byte_start, byte_length, letter_offset=None):
+    """
+    Enciphers `byte_length` bytes of `filepath` starting at `byte_start`,
+    relative to the engine's start positions. Pass `letter_offset` (the
+    number of letters before `byte_start`) to skip the prefix entirely; for
+    letters-only ciphertext it equals `byte_start`. Without it the prefix
+    letters are counted, which reads but never enciphers the prefix.
+    """
+    with open(filepath, 'rb') as f:
+        if letter_offset is None:
+            letter_offset = 0
+            remaining = byte_start
+            while remaining:
+                block = f.read(min(remaining, 4 * 1024 * 1024))
+                if not block:
+                    break
+                letter_offset += count_letters(block)
+                remaining -= len(block)
+        f.seek(byte_start)
+        data = f.read(byte_length)
+    engine.seek(letter_offset)
+    return engine.process_bytes(data)
+
+def benchmark_engine(length=1_000_000, positions='AAA'):
+    """ Compares EnigmaEngine against EnigmaMachine on random text, in chars/sec """
+    rng = np.random.default_rng(0)
+    alphabet = np.frombuffer(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ abcdefghijklmnopqrstuvwxyz.', dtype=np.uint8)
+    message = alphabet[rng.integers(0, alphabet.size, length)].tobytes().decode()
+
+    machine = EnigmaMachine(
+        [Rotor(rotor.wiring, chr(rotor.notch + ord('A'))) for rotor in enigma.rotors],
+        enigma.reflector,
+        enigma.plugboard,
+    )
+    for rotor, char in zip(machine.rotors, positions):
+        rotor.set_position(char)
+    engine = EnigmaEngine(machine.rotors, machine.reflector, machine.plugboard)
+
+    sample = message[:min(length, 100_000)]
+    start = time.perf_counter()
+    expected = machine.process_message(sample)
+    machine_rate = len(sample) / (time.perf_counter() - start)
+
+    engine.set_positions(positions)
+    if engine.process_message(sample) != expected:
+        raise AssertionError("EnigmaEngine output differs from EnigmaMachine")
+    engine.set_positions(positions)
+    engine.process_message(message)
+
+    print(f"EnigmaMachine: {machine_rate:,.0f} chars/sec")
+    print(f"EnigmaEngine:  {engine.chars_per_sec:,.0f} chars/sec")
+    return machine_rate, engine.chars_per_sec
+
+# Standard rotor wirings and notch positions
+ROTORS = {
+    'I': ('EKMFLGDQVZNTOWYHXUSPAIBRCJ', 'Q'),
+    'II': ('AJDKSIRUXBLHWTMCQGZNPYFVOE', 'E'),
+    'III': ('BDFHJLCPRTXVZNYEIWGAKMUSQO', 'V'),
+    'IV': ('ESOVPZJAYQUIRHXLNFTGKDCMWB', 'J'),
+    'V': ('VZBRGITYUPSDNHLXAWMJQOFECK', 'Z'),
+}
+
+# Standard reflector wirings
+REFLECTORS = {
+    'B': 'YRUHQSLDPXNGOKMIEBFZCWVJAT',
+    'C': 'FVPJIAOYEDRZXWGCTKUQSBNMHL',
+}
 
 # Define rotor wirings and notch positions
-rotor1 = Rotor('EKMFLGDQVZNTOWYHXUSPAIBRCJ', 'Q')  # Notch at 'Q'
-rotor2 = Rotor('AJDKSIRUXBLHWTMCQGZNPYFVOE', 'E')  # Notch at 'E'
-rotor3 = Rotor('BDFHJLCPRTXVZNYEIWGAKMUSQO', 'V')  # Notch at 'V'
+rotor1 = Rotor(*ROTORS['I'])  # Notch at 'Q'
+rotor2 = Rotor(*ROTORS['II'])  # Notch at 'E'
+rotor3 = Rotor(*ROTORS['III'])  # Notch at 'V'
 
 # Define reflector wiring
-reflector = Reflector('YRUHQSLDPXNGOKMIEBFZCWVJAT')
+reflector = Reflector(REFLECTORS['B'])
 
 # Define plugboard wiring (identity in this example, no swaps)
 plugboard = Plugboard('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
@@ -114,56 +340,279 @@ plugboard = Plugboard('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
 # Create Enigma machine with 3 rotors, a reflector, and a plugboard
 enigma = EnigmaMachine([rotor1, rotor2, rotor3], reflector, plugboard)
 
-# GUI Setup
-root = tk.Tk()
-root.title("Enigma Machine")
-root.geometry("600x400")
-
-style = ttk.Style()
-style.configure("TLabel", font=("Arial", 12))
-style.configure("TButton", font=("Arial", 12))
-style.configure("TEntry", font=("Arial", 12))
-
-frame = ttk.Frame(root, padding="10")
-frame.pack(fill=tk.BOTH, expand=True)
-
-input_label = ttk.Label(frame, text="Input Message:")
-input_label.grid(row=0, column=0, sticky=tk.W)
-
-input_text = tk.Text(frame, height=5, width=50, font=("Arial", 12))
-input_text.grid(row=1, column=0, columnspan=3, pady=10)
+# Headless streaming pipeline
+def plugboard_wiring(pairs):
+    """ Turns letter pairs such as "AB CD EF" into a plugboard wiring string """
+    wiring = list('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+    used = set()
+    for pair in pairs.upper().replace(',', ' ').split():
+        if len(pair) != 2 or not pair.isalpha() or not pair.isascii():
+            raise ValueError(f"Invalid plugboard pair: {pair}")
+        a, b = pair
+        if a == b or a in used or b in used:
+            raise ValueError(f"Letter reused in plugboard pair: {pair}")
+        used.update(pair)
+        wiring[ord(a) - ord('A')], wiring[ord(b) - ord('A')] = b, a
+    return ''.join(wiring)
+
+def build_engine(rotor_order=('I', 'II', 'III'), positions='AAA', reflector_name='B', plugboard_pairs=''):
+    """ Builds an EnigmaEngine from rotor names, start letters, reflector name and plugboard pairs """
+    if len(positions) != len(rotor_order) or not (positions.isalpha() and positions.isascii()):
+        raise ValueError("Give one start position (A-Z) per rotor")
+    rotors = []
+    for name in rotor_order:
+        if name not in ROTORS:
+            raise ValueError(f"Unknown rotor: {name}")
+        rotors.append(Rotor(*ROTORS[name]))
+    if reflector_name not in REFLECTORS:
+        raise ValueError(f"Unknown reflector: {reflector_name}")
+    engine = EnigmaEngine(rotors, Reflector(REFLECTORS[reflector_name]), Plugboard(plugboard_wiring(plugboard_pairs)))
+    engine.set_positions(positions)
+    return engine
+
+def read_chunks(f, chunk_size=1024 * 1024):
+    """ Yields fixed-size blocks from a binary file object """
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+def stream_process(engine, chunks, workers=1):
+    """
+    Enciphers an iterable of byte chunks, yielding output chunks as they are
+    ready. The rotor state lives in the engine and carries across chunk
+    boundaries, so memory stays bounded by the chunk size. With workers > 1
+    one process pool serves the whole stream.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield engine.process_bytes(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in chunks:
+            yield parallel_process(engine, chunk, workers, max(len(chunk) // workers, 1), pool)
+
+# Precomputed state-transition cache
+CACHE_MAGIC = b'ENIGMA-STATES\x00\x01\x00'
+STATE_COUNT = 26 ** 3
+
+class StateCache:
+    """
+    Memory-mapped substitution tables for every rotor order, start-position
+    triple and reflector, as written by build_state_cache(). Opening the
+    file only reads a small header; looking up a setting is one array index
+    into the mapped table (state = p0 + 26 * p1 + 676 * p2, plugboard not
+    included).
+    """
+    def __init__(self, filepath):
+        with open(filepath, 'rb') as f:
+            if f.read(len(CACHE_MAGIC)) != CACHE_MAGIC:
+                raise ValueError(f"{filepath} is not an Enigma state cache")
+            header = json.loads(f.read(int.from_bytes(f.read(4), 'little')))
+        self.rotor_orders = [tuple(order) for order in header['rotor_orders']]
+        self.reflectors = header['reflectors']
+        self.slots = {}
+        for i, order in enumerate(self.rotor_orders):
+            wirings = tuple(header['rotors'][name] for name in order)
+            for j, name in enumerate(self.reflectors):
+                self.slots[(wirings, header['reflector_wirings'][name])] = (i, j)
+        self.tables = np.memmap(filepath, dtype=np.uint8, mode='r', offset=header['offset'],
+                                shape=(len(self.rotor_orders), len(self.reflectors), STATE_COUNT, 26))
+
+    def table(self, wirings, reflector_wiring):
+        """ Returns the (17576, 26) substitution table for one rotor order and reflector """
+        slot = self.slots.get((tuple(wirings), reflector_wiring))
+        if slot is None:
+            raise KeyError("Rotor order or reflector is not in the state cache")
+        return self.tables[slot]
+
+    def lookup(self, wirings, reflector_wiring, positions):
+        """ Returns the 26-letter substitution for one setting, e.g. positions 'QEV' """
+        p0, p1, p2 = (ord(char.upper()) - ord('A') for char in positions)
+        return self.table(wirings, reflector_wiring)[p0 + p1 * 26 + p2 * 676]
+
+def build_state_cache(filepath, rotor_names=tuple(ROTORS), reflector_names=tuple(REFLECTORS)):
+    """
+    Computes the substitution table of every three-rotor order, start triple
+    and reflector and writes them to `filepath` for StateCache to map.
+    """
+    rotor_orders = list(itertools.permutations(rotor_names, 3))
+    steps = np.arange(STATE_COUNT)
+    positions = [(steps % 26)[:, None], (steps // 26 % 26)[:, None], (steps // 676)[:, None]]
+    letters = np.arange(26)[None, :]
+
+    header = {
+        'rotor_orders': rotor_orders,
+        'reflectors': list(reflector_names),
+        'rotors': {name: ROTORS[name][0] for name in rotor_names},
+        'reflector_wirings': {name: REFLECTORS[name] for name in reflector_names},
+        'offset': 0,
+    }
+    # Pad the header so the tables start on a page boundary
+    encoded = json.dumps(header).encode()
+    header['offset'] = -(-(len(CACHE_MAGIC) + 4 + len(encoded) + 32) // 4096) * 4096
+    encoded = json.dumps(header).encode()
+
+    with open(filepath, 'wb') as f:
+        f.write(CACHE_MAGIC + len(encoded).to_bytes(4, 'little') + encoded)
+        f.write(b'\x00' * (header['offset'] - f.tell()))
+        for order in rotor_orders:
+            for name in reflector_names:
+                engine = build_engine(order, 'AAA', name)
+                f.write(engine.encode_letters(letters, positions).astype(np.uint8).tobytes())
+    return filepath
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless, streaming Enigma encoder/decoder.")
+    parser.add_argument('files', nargs='*',
+                        help="input files, processed as one continuous stream; '-' reads stdin (default: stdin)")
+    parser.add_argument('-r', '--rotors', default='I,II,III', help="comma-separated rotor order, fast rotor first (default: I,II,III)")
+    parser.add_argument('-p', '--positions', default='AAA', help="start positions, one letter per rotor (default: AAA)")
+    parser.add_argument('--reflector', default='B', choices=sorted(REFLECTORS), help="reflector (default: B)")
+    parser.add_argument('--plugboard', default='', help='plugboard pairs, e.g. "AB CD EF"')
+    parser.add_argument('-o', '--output', help="output file (default: stdout)")
+    parser.add_argument('--chunk-size', type=int, default=1024 * 1024, help="bytes read per chunk (default: 1 MiB)")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes per chunk (default: 1)")
+    parser.add_argument('--cache', help="state cache file to use for lookups")
+    parser.add_argument('--build-cache', metavar='PATH', help="write the state cache for all rotors and reflectors and exit")
+    parser.add_argument('--benchmark', action='store_true', help="compare EnigmaEngine against EnigmaMachine and exit")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark_engine()
+        return 0
+
+    if args.build_cache:
+        start = time.perf_counter()
+        build_state_cache(args.build_cache)
+        print(f"Wrote {args.build_cache} in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+        return 0
 
-rotor_frame = ttk.Frame(frame, padding="10")
-rotor_frame.grid(row=2, column=0, columnspan=3)
-
-rotor1_label = ttk.Label(rotor_frame, text="Rotor 1 Position (A-Z):")
-rotor1_label.grid(row=0, column=0)
-rotor1_entry = ttk.Entry(rotor_frame, width=3)
-rotor1_entry.grid(row=0, column=1)
-
-rotor2_label = ttk.Label(rotor_frame, text="Rotor 2 Position (A-Z):")
-rotor2_label.grid(row=1, column=0)
-rotor2_entry = ttk.Entry(rotor_frame, width=3)
-rotor2_entry.grid(row=1, column=1)
-
-rotor3_label = ttk.Label(rotor_frame, text="Rotor 3 Position (A-Z):")
-rotor3_label.grid(row=2, column=0)
-rotor3_entry = ttk.Entry(rotor_frame, width=3)
-rotor3_entry.grid(row=2, column=1)
-
-button_frame = ttk.Frame(frame)
-button_frame.grid(row=3, column=0, columnspan=3, pady=10)
-
-encode_button = ttk.Button(button_frame, text="Encode", command=lambda: on_encode_decode("encode"))
-encode_button.grid(row=0, column=0, padx=5)
-
-decode_button = ttk.Button(button_frame, text="Decode", command=lambda: on_encode_decode("decode"))
-decode_button.grid(row=0, column=1, padx=5)
-
-output_label = ttk.Label(frame, text="Output Message:")
-output_label.grid(row=4, column=0, sticky=tk.W)
-
-output_text = tk.Text(frame, height=5, width=50, font=("Arial", 12), state=tk.DISABLED)
-output_text.grid(row=5, column=0, columnspan=3, pady=10)
-
-root.mainloop()
+    try:
+        engine = build_engine(args.rotors.split(','), args.positions.upper(), args.reflector, args.plugboard)
+        if args.cache:
+            engine.attach_cache(StateCache(args.cache))
+    except (ValueError, KeyError, OSError) as e:
+        parser.error(str(e))
+
+    def chunks():
+        for filepath in args.files or ['-']:
+            if filepath == '-':
+                yield from read_chunks(sys.stdin.buffer, args.chunk_size)
+                continue
+            with open(filepath, 'rb') as f:
+                yield from read_chunks(f, args.chunk_size)
+
+    out = None
+    total = 0
+    start = time.perf_counter()
+    try:
+        out = open(args.output, 'wb') if args.output else sys.stdout.buffer
+        for output in stream_process(engine, chunks(), args.workers):
+            out.write(output)
+            total += len(output)
+    except OSError as e:
+        parser.error(str(e))
+    finally:
+        if args.output and out is not None:
+            out.close()
+        elif out is not None:
+            out.flush()
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed / 1e6 if elapsed > 0 else 0.0
+    print(f"Processed {total:,} bytes ({engine.tell():,} letters) in {elapsed:.2f}s - {rate:.1f} MB/s", file=sys.stderr)
+    return 0
+
+def run_gui():
+    import tkinter as tk
+    from tkinter import messagebox
+    from tkinter import ttk
+
+    def on_encode_decode(action):
+        try:
+            message = input_text.get("1.0", tk.END).strip()
+            if not message:
+                raise ValueError("Input message cannot be empty")
+
+            rotor1_pos = rotor1_entry.get().upper()
+            rotor2_pos = rotor2_entry.get().upper()
+            rotor3_pos = rotor3_entry.get().upper()
+
+            if not (rotor1_pos.isalpha() and rotor2_pos.isalpha() and rotor3_pos.isalpha()):
+                raise ValueError("Rotor positions must be alphabetic characters (A-Z)")
+
+            rotor1.set_position(rotor1_pos)
+            rotor2.set_position(rotor2_pos)
+            rotor3.set_position(rotor3_pos)
+
+            if action == "encode":
+                result_message = enigma.process_message(message)
+            elif action == "decode":
+                result_message = enigma.process_message(message)
+
+            output_text.config(state=tk.NORMAL)
+            output_text.delete("1.0", tk.END)
+            output_text.insert(tk.END, result_message)
+            output_text.config(state=tk.DISABLED)
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e))
+
+    # GUI Setup
+    root = tk.Tk()
+    root.title("Enigma Machine")
+    root.geometry("600x400")
+
+    style = ttk.Style()
+    style.configure("TLabel", font=("Arial", 12))
+    style.configure("TButton", font=("Arial", 12))
+    style.configure("TEntry", font=("Arial", 12))
+
+    frame = ttk.Frame(root, padding="10")
+    frame.pack(fill=tk.BOTH, expand=True)
+
+    input_label = ttk.Label(frame, text="Input Message:")
+    input_label.grid(row=0, column=0, sticky=tk.W)
+
+    input_text = tk.Text(frame, height=5, width=50, font=("Arial", 12))
+    input_text.grid(row=1, column=0, columnspan=3, pady=10)
+
+    rotor_frame = ttk.Frame(frame, padding="10")
+    rotor_frame.grid(row=2, column=0, columnspan=3)
+
+    rotor1_label = ttk.Label(rotor_frame, text="Rotor 1 Position (A-Z):")
+    rotor1_label.grid(row=0, column=0)
+    rotor1_entry = ttk.Entry(rotor_frame, width=3)
+    rotor1_entry.grid(row=0, column=1)
+
+    rotor2_label = ttk.Label(rotor_frame, text="Rotor 2 Position (A-Z):")
+    rotor2_label.grid(row=1, column=0)
+    rotor2_entry = ttk.Entry(rotor_frame, width=3)
+    rotor2_entry.grid(row=1, column=1)
+
+    rotor3_label = ttk.Label(rotor_frame, text="Rotor 3 Position (A-Z):")
+    rotor3_label.grid(row=2, column=0)
+    rotor3_entry = ttk.Entry(rotor_frame, width=3)
+    rotor3_entry.grid(row=2, column=1)
+
+    button_frame = ttk.Frame(frame)
+    button_frame.grid(row=3, column=0, columnspan=3, pady=10)
+
+    encode_button = ttk.Button(button_frame, text="Encode", command=lambda: on_encode_decode("encode"))
+    encode_button.grid(row=0, column=0, padx=5)
+
+    decode_button = ttk.Button(button_frame, text="Decode", command=lambda: on_encode_decode("decode"))
+    decode_button.grid(row=0, column=1, padx=5)
+
+    output_label = ttk.Label(frame, text="Output Message:")
+    output_label.grid(row=4, column=0, sticky=tk.W)
+
+    output_text = tk.Text(frame, height=5, width=50, font=("Arial", 12), state=tk.DISABLED)
+    output_text.grid(row=5, column=0, columnspan=3, pady=10)
+
+    root.mainloop()
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(main())
+    run_gui()
@@ -0,0 +1,259 @@
+import argparse
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from Enigma import ROTORS, StateCache, build_engine
+
+# English letter frequencies (percent), used when no n-gram file is given
+ENGLISH_FREQUENCIES = [
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153, 0.772, 4.025, 2.406,
+    6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+]
+
+# Every start-position triple, as one row per candidate
+START_POSITIONS = np.indices((26, 26, 26)).reshape(3, -1).T[:, ::-1]
+
+# Module 1: Scoring
+def load_ngrams(filepath=None):
+    """
+    Returns (n, table) where table holds the log10 probability of every
+    n-gram, indexed by its letters read as a base-26 number. The file holds
+    one "NGRAM COUNT" pair per line; without a file English unigram
+    frequencies are used.
+    """
+    if filepath is None:
+        counts = {chr(ord('A') + i): freq for i, freq in enumerate(ENGLISH_FREQUENCIES)}
+    else:
+        counts = {}
+        with open(filepath) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2 and parts[0].isalpha():
+                    counts[parts[0].upper()] = float(parts[1])
+        if not counts:
+            raise ValueError(f"No n-grams found in {filepath}")
+
+    n = len(next(iter(counts)))
+    total = sum(counts.values())
+    table = np.full(26 ** n, np.log10(0.01 / total))
+    for gram, count in counts.items():
+        if len(gram) != n:
+            raise ValueError(f"Mixed n-gram lengths in {filepath}")
+        index = 0
+        for char in gram:
+            index = index * 26 + ord(char) - ord('A')
+        table[index] = np.log10(count / total)
+    return n, table
+
+def ngram_score(rows, ngrams):
+    """ Mean n-gram log-likelihood of every row of letter indices; -inf for rows shorter than n """
+    n, table = ngrams
+    length = rows.shape[1] - n + 1
+    if length < 1:
+        return np.full(rows.shape[0], -np.inf)
+    index = np.zeros((rows.shape[0], length), dtype=np.intp)
+    for i in range(n):
+        index = index * 26 + rows[:, i:i + length]
+    return table[index].mean(axis=1)
+
+def ioc_score(rows):
+    """ Index of coincidence of every row of letter indices """
+    count, length = rows.shape
+    flat = (np.arange(count)[:, None] * 26 + rows).ravel()
+    histogram = np.bincount(flat, minlength=count * 26).reshape(count, 26).astype(np.float64)
+    return (histogram * (histogram - 1)).sum(axis=1) / (length * (length - 1))
+
+def ciphertext_letters(text):
+    """ Returns the ciphertext letters as an array of indices 0-25 """
+    data = np.frombuffer(text.upper().encode('ascii', 'ignore'), dtype=np.uint8)
+    return (data[(data >= ord('A')) & (data <= ord('Z'))] - ord('A')).astype(np.uint8)
+
+# Module 2: Rotor order x start position search
+def search_shard(letters, rotor_order, reflector_name, top=10, batch_size=1024, cache_path=None):
+    """
+    Decrypts `letters` at all 17,576 start positions of one rotor order with
+    an empty plugboard and returns the `top` candidates by index of
+    coincidence, as (score, rotor_order, reflector, positions) tuples.
+    With `cache_path` the substitutions come from a StateCache file.
+    """
+    engine = build_engine(rotor_order, 'A' * len(rotor_order), reflector_name)
+    if cache_path:
+        engine.attach_cache(StateCache(cache_path))
+    steps = np.arange(1, letters.size + 1, dtype=np.int64)
+    scores = np.empty(len(START_POSITIONS))
+    for begin in range(0, len(START_POSITIONS), batch_size):
+        starts = START_POSITIONS[begin:begin + batch_size]
+        positions = engine.positions_from([starts[:, i:i + 1] for i in range(len(rotor_order))], steps)
+        plaintext = engine.encode_letters(letters[None, :], positions)
+        scores[begin:begin + len(starts)] = ioc_score(plaintext)
+
+    best = np.argsort(scores)[::-1][:top]
+    return [
+        (float(scores[i]), tuple(rotor_order), reflector_name,
+         ''.join(chr(ord('A') + int(p)) for p in START_POSITIONS[i]))
+        for i in best
+    ]
+
+# Module 3: Plugboard hill-climb
+def climb_plugboard(letters, candidate, ngrams, max_pairs=10):
+    """
+    Greedily adds the plugboard pair that most improves the n-gram score
+    until no pair helps or `max_pairs` pairs are set. All swaps of a round
+    are scored together as one batch.
+    """
+    _, rotor_order, reflector_name, positions = candidate
+    engine = build_engine(rotor_order, positions, reflector_name)
+    rotor_positions = [p[:, None] for p in engine.rotor_positions(letters.size)]
+    # core[i, c] is the rotor/reflector substitution of letter c at step i
+    core = engine.encode_letters(np.arange(26)[None, :], rotor_positions)
+    rows = np.arange(letters.size)[None, :]
+
+    def decrypt(plugboards):
+        swapped = plugboards[:, letters]
+        return np.take_along_axis(plugboards, core[rows, swapped], axis=1)
+
+    plugboard = np.arange(26)
+    best_score = float(ngram_score(decrypt(plugboard[None, :]), ngrams)[0])
+    pairs = []
+    while len(pairs) < max_pairs:
+        free = [i for i in range(26) if plugboard[i] == i]
+        swaps = list(itertools.combinations(free, 2))
+        if not swaps:
+            break
+        trials = np.tile(plugboard, (len(swaps), 1))
+        for row, (a, b) in enumerate(swaps):
+            trials[row, a], trials[row, b] = b, a
+        scores = ngram_score(decrypt(trials), ngrams)
+        best = int(np.argmax(scores))
+        if scores[best] <= best_score:
+            break
+        best_score = float(scores[best])
+        plugboard = trials[best]
+        pairs.append(''.join(chr(ord('A') + i) for i in swaps[best]))
+
+    plaintext = decrypt(plugboard[None, :])
+    return {
+        'score': best_score,
+        'ioc': float(ioc_score(plaintext)[0]),
+        'rotors': tuple(rotor_order),
+        'reflector': reflector_name,
+        'positions': positions,
+        'plugboard': ' '.join(pairs),
+        'plaintext': (plaintext[0] + ord('A')).astype(np.uint8).tobytes().decode(),
+    }
+
+# Module 4: Checkpointing
+def load_checkpoint(filepath, digest):
+    if filepath and os.path.isfile(filepath):
+        with open(filepath) as f:
+            state = json.load(f)
+        if state.get('ciphertext') == digest:
+            # JSON turns the rotor order tuples into lists; restore them
+            candidates = [(score, tuple(order), reflector_name, positions)
+                          for score, order, reflector_name, positions in state['candidates']]
+            return set(tuple(shard) for shard in state['done']), candidates
+        print(f"Ignoring checkpoint {filepath}: it belongs to another ciphertext", file=sys.stderr)
+    return set(), []
+
+def save_checkpoint(filepath, digest, done, candidates):
+    temp_path = filepath + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump({'ciphertext': digest, 'done': sorted(done), 'candidates': candidates}, f)
+    os.replace(temp_path, filepath)
+
+def shard_key(rotor_order, reflector_name):
+    return (','.join(rotor_order), reflector_name)
+
+# Module 5: Search driver
+def search(text, rotor_names=tuple(ROTORS), reflectors=('B',), rotor_count=3, workers=None,
+           top=10, max_pairs=10, ngrams=None, checkpoint=None, cache_path=None):
+    """
+    Shards the rotor-order x reflector space across worker processes, each
+    scanning every start position. Best candidates are reported as shards
+    finish, progress is saved to `checkpoint` after every shard, and the
+    plugboard is then hill-climbed for the overall best candidates.
+    """
+    letters = ciphertext_letters(text)
+    ngrams = ngrams or load_ngrams()
+    if letters.size < max(2, ngrams[0]):
+        raise ValueError(f"Ciphertext needs at least {max(2, ngrams[0])} letters")
+    digest = hashlib.sha256(letters.tobytes()).hexdigest()
+    done, candidates = load_checkpoint(checkpoint, digest)
+
+    shards = [
+        (order, reflector_name)
+        for order in itertools.permutations(rotor_names, rotor_count)
+        for reflector_name in reflectors
+        if shard_key(order, reflector_name) not in done
+    ]
+    total = len(done) + len(shards)
+    keys = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = {pool.submit(search_shard, letters, order, reflector_name, top, cache_path=cache_path): (order, reflector_name)
+                for order, reflector_name in shards}
+        for job in as_completed(jobs):
+            order, reflector_name = jobs[job]
+            candidates = heapq.nlargest(top, candidates + job.result())
+            done.add(shard_key(order, reflector_name))
+            keys += len(START_POSITIONS)
+            if checkpoint:
+                save_checkpoint(checkpoint, digest, done, candidates)
+            rate = keys / (time.perf_counter() - start)
+            score, best_order, best_reflector, best_positions = candidates[0]
+            print(f"[{len(done)}/{total}] {','.join(order)} {reflector_name} | best IoC {score:.4f} "
+                  f"{','.join(best_order)} {best_reflector} {best_positions} | {rate:,.0f} keys/sec",
+                  file=sys.stderr)
+
+        jobs = [pool.submit(climb_plugboard, letters, candidate, ngrams, max_pairs) for candidate in candidates]
+        results = [job.result() for job in jobs]
+    return sorted(results, key=lambda result: result['score'], reverse=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ciphertext-only key search for Enigma.py settings.")
+    parser.add_argument('file', nargs='?', help="ciphertext file (default: stdin)")
+    parser.add_argument('--rotors', default=','.join(ROTORS), help="rotors to try (default: all)")
+    parser.add_argument('--reflectors', default='B', help="reflectors to try (default: B)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--top', type=int, default=10, help="candidates kept for the plugboard stage (default: 10)")
+    parser.add_argument('--pairs', type=int, default=10, help="maximum plugboard pairs (default: 10)")
+    parser.add_argument('--ngrams', help='n-gram counts file with "NGRAM COUNT" lines (default: English unigrams)')
+    parser.add_argument('--checkpoint', help="checkpoint file to resume from and save progress to")
+    parser.add_argument('--cache', help="state cache written by Enigma.py --build-cache")
+    args = parser.parse_args(argv)
+
+    if args.file:
+        with open(args.file) as f:
+            text = f.read()
+    else:
+        text = sys.stdin.read()
+
+    try:
+        results = search(
+            text,
+            rotor_names=args.rotors.split(','),
+            reflectors=args.reflectors.split(','),
+            workers=args.workers,
+            top=args.top,
+            max_pairs=args.pairs,
+            ngrams=load_ngrams(args.ngrams),
+            checkpoint=args.checkpoint,
+            cache_path=args.cache,
+        )
+    except (ValueError, KeyError) as e:
+        parser.error(str(e))
+
+    for result in results:
+        print(f"{result['score']:.4f}  IoC {result['ioc']:.4f}  rotors {','.join(result['rotors'])}  "
+              f"reflector {result['reflector']}  positions {result['positions']}  "
+              f"plugboard {result['plugboard'] or '-'}  {result['plaintext'][:60]}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
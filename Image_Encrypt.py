@@ -1,152 +1,812 @@
 import os
-from tkinter import filedialog, messagebox, Tk, Label, Button, StringVar, OptionMenu
-from PIL import Image, ImageTk
+from PIL import Image
+try:
+    from tkinter import filedialog, messagebox, simpledialog, ttk, Tk, Label, Button, StringVar, OptionMenu
+    from PIL import ImageTk
+except ImportError:  # Headless installs without Tk can still use the core functions
+    Tk = None
 import numpy as np
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.exceptions import InvalidTag
 import base64
+import hashlib
+import hmac
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 # Module 1: Image Loader
 def load_image(filepath):
-    try:
-        if not os.path.isfile(filepath):
-            raise FileNotFoundError("The selected file does not exist.")
-        
-        image = Image.open(filepath).convert('RGB')
-        return np.array(image), image
-    except Exception as e:
-        messagebox.showerror("Error", f"Error loading image: {e}")
-        return None, None
+    if not os.path.isfile(filepath):
+        raise FileNotFoundError("The selected file does not exist.")
+    
+    image = Image.open(filepath).convert('RGB')
+    return np.array(image), image
 
 # Module 2: Secure Key Management
-def generate_key(password, salt=None):
-    try:
-        if salt is None:
-            salt = os.urandom(16)
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-            backend=default_backend()
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
-        return key, salt
-    except Exception as e:
-        messagebox.showerror("Error", f"Error generating key: {e}")
-        return None, None
+class DerivedKeyCache:
+    """
+    Bounded in-process cache of PBKDF2-derived keys with LRU eviction and a
+    time-to-live. Entries are keyed by a SHA-256 digest of (password, salt,
+    iterations), so no password is kept, and each key lives in a bytearray
+    that is zeroed when the entry is evicted, expires or is cleared. Keys
+    are never written to disk; callers receive their own bytes copy.
+    """
+    def __init__(self, maxsize=32, ttl=600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def digest(password, salt, iterations):
+        h = hashlib.sha256()
+        for part in (password.encode(), salt, str(iterations).encode()):
+            h.update(len(part).to_bytes(8, 'little'))
+            h.update(part)
+        return h.digest()
+
+    @staticmethod
+    def _wipe(buffer):
+        buffer[:] = bytes(len(buffer))
+
+    def _purge_expired(self):
+        # Caller holds the lock. LRU order is not expiry order, so scan all
+        now = time.monotonic()
+        for digest in [digest for digest, (_, expires) in self.entries.items() if now >= expires]:
+            self._wipe(self.entries.pop(digest)[0])
+
+    def get(self, digest):
+        with self.lock:
+            self._purge_expired()
+            entry = self.entries.get(digest)
+            if entry is None:
+                return None
+            self.entries.move_to_end(digest)
+            return bytes(entry[0])
+
+    def put(self, digest, key):
+        with self.lock:
+            self._purge_expired()
+            if digest in self.entries:
+                self._wipe(self.entries.pop(digest)[0])
+            self.entries[digest] = (bytearray(key), time.monotonic() + self.ttl)
+            while len(self.entries) > self.maxsize:
+                self._wipe(self.entries.popitem(last=False)[1][0])
+
+    def clear(self):
+        with self.lock:
+            for buffer, _ in self.entries.values():
+                self._wipe(buffer)
+            self.entries.clear()
+
+KEY_CACHE = DerivedKeyCache()
+
+def generate_key(password, salt=None, iterations=100000, use_cache=True):
+    """
+    Derives a base64 key from a password with PBKDF2-SHA256. When a salt is
+    given, the result is looked up in (and stored to) KEY_CACHE, so a batch
+    reusing one password and salt pays the KDF cost once. Keys derived with
+    a fresh random salt are never cached, since no lookup could match them.
+    """
+    if salt is None:
+        salt = os.urandom(16)
+        use_cache = False
+    digest = DerivedKeyCache.digest(password, salt, iterations) if use_cache else None
+    if digest:
+        key = KEY_CACHE.get(digest)
+        if key is not None:
+            return key, salt
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=iterations,
+        backend=default_backend()
+    )
+    key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
+    if digest:
+        KEY_CACHE.put(digest, key)
+    return key, salt
 
 def save_key(key, filepath):
-    try:
-        with open(filepath, 'wb') as f:
-            f.write(key)
-    except Exception as e:
-        messagebox.showerror("Error", f"Error saving key: {e}")
+    with open(filepath, 'wb') as f:
+        f.write(key)
 
 def load_key(filepath):
-    try:
-        with open(filepath, 'rb') as f:
-            return f.read()
-    except Exception as e:
-        messagebox.showerror("Error", f"Error loading key: {e}")
-        return None
+    with open(filepath, 'rb') as f:
+        return f.read()
 
 # Module 3: Advanced Pixel Manipulation
-def encrypt_image(image, key, method="scramble"):
-    try:
-        if method == "scramble":
-            return scramble_encrypt(image, key)
-        elif method == "aes":
-            return aes_encrypt(image, key)
-        else:
-            raise ValueError("Unsupported encryption method")
-    except Exception as e:
-        messagebox.showerror("Error", f"Error during encryption: {e}")
-        return None
+class OperationCancelled(Exception):
+    """ Raised by a progress callback to stop an encryption or decryption early """
 
-def decrypt_image(image, key, method="scramble"):
-    try:
-        if method == "scramble":
-            return scramble_decrypt(image, key)
-        elif method == "aes":
-            return aes_decrypt(image, key)
+def encrypt_image(image, key, method="scramble", progress=None):
+    """
+    Encrypts with the chosen method. `progress`, if given, is called with the
+    completed fraction (0.0-1.0) as work proceeds, once per block; it may
+    raise OperationCancelled to abort.
+    """
+    if method == "feistel":
+        return feistel_apply(image, key, progress=progress)
+    elif method == "aes-ctr":
+        return aes_ctr_encrypt(image, key, progress=progress)
+    elif method == "scramble":
+        return scramble_encrypt(image, key, progress)
+    elif method == "aes":
+        return aes_encrypt(image, key, progress)
+    raise ValueError("Unsupported encryption method")
+
+def decrypt_image(image, key, method="scramble", progress=None):
+    if method == "feistel":
+        return feistel_apply(image, key, inverse=True, progress=progress)
+    elif method == "aes-ctr":
+        return aes_ctr_decrypt(image, key, progress=progress)
+    elif method == "scramble":
+        return scramble_decrypt(image, key, progress)
+    elif method == "aes":
+        return aes_decrypt(image, key, progress)
+    raise ValueError("Unsupported decryption method")
+
+# The scramble and AES-ECB methods gather or encrypt this many bytes at a
+# time, reporting progress (and so checking for cancel) after each block
+PROGRESS_BLOCK = 4 * 1024 * 1024
+
+def _scramble_indices(image, key, progress):
+    if progress:
+        progress(0.0)
+    np.random.seed(int.from_bytes(key[:4], 'little'))
+    indices = np.arange(image.size)
+    np.random.shuffle(indices)
+    return indices
+
+def scramble_encrypt(image, key, progress=None):
+    indices = _scramble_indices(image, key, progress)
+    flat = image.reshape(-1)
+    encrypted_image = np.empty_like(flat)
+    for start in range(0, flat.size, PROGRESS_BLOCK):
+        end = min(start + PROGRESS_BLOCK, flat.size)
+        encrypted_image[start:end] = flat[indices[start:end]]
+        if progress:
+            progress(end / flat.size)
+    return encrypted_image.reshape(image.shape)
+
+def scramble_decrypt(image, key, progress=None):
+    indices = _scramble_indices(image, key, progress)
+    flat = image.reshape(-1)
+    decrypted_image = np.empty_like(flat)
+    for start in range(0, flat.size, PROGRESS_BLOCK):
+        end = min(start + PROGRESS_BLOCK, flat.size)
+        decrypted_image[indices[start:end]] = flat[start:end]
+        if progress:
+            progress(end / flat.size)
+    return decrypted_image.reshape(image.shape)
+
+# Keyed pixel permutation: a Feistel network over the index space, used with
+# cycle walking so it maps [0, n) onto itself. Indices are permuted one block
+# at a time, so the full permutation is never materialized.
+FEISTEL_ROUNDS = 6
+FEISTEL_BLOCK = 1 << 20
+
+def feistel_round_keys(key, rounds=FEISTEL_ROUNDS):
+    digest = hashlib.blake2b(key, digest_size=8 * rounds, person=b'img-feistel').digest()
+    return [int.from_bytes(digest[i:i + 8], 'little') for i in range(0, len(digest), 8)]
+
+def _feistel_mix(values, round_key):
+    """ Keyed integer hash: MurmurHash3 fmix32 for uint32, SplitMix64 for uint64 """
+    z = values + round_key
+    if z.dtype == np.uint32:
+        z ^= z >> np.uint32(16)
+        z *= np.uint32(0x85EBCA6B)
+        z ^= z >> np.uint32(13)
+        z *= np.uint32(0xC2B2AE35)
+        z ^= z >> np.uint32(16)
+    else:
+        z *= np.uint64(0x9E3779B97F4A7C15)
+        z ^= z >> np.uint64(30)
+        z *= np.uint64(0xBF58476D1CE4E5B9)
+        z ^= z >> np.uint64(27)
+        z *= np.uint64(0x94D049BB133111EB)
+        z ^= z >> np.uint64(31)
+    return z
+
+def feistel_permute(indices, size, round_keys):
+    """ Maps an array of indices in [0, size) to their keyed permutation in [0, size) """
+    bits = max(2, (size - 1).bit_length())
+    dtype = np.uint32 if bits <= 32 else np.uint64
+    keys = [dtype(round_key & np.iinfo(dtype).max) for round_key in round_keys]
+
+    def rounds(values):
+        # Unbalanced Feistel over `bits`-bit values: each round replaces
+        # (left, right) with (right, left ^ F(right)), so the halves swap widths.
+        left_bits, right_bits = bits // 2, bits - bits // 2
+        for round_key in keys:
+            left = values >> dtype(right_bits)
+            right = values & dtype((1 << right_bits) - 1)
+            left ^= _feistel_mix(right, round_key) & dtype((1 << left_bits) - 1)
+            right <<= dtype(left_bits)
+            values = right | left
+            left_bits, right_bits = right_bits, left_bits
+        return values
+
+    result = rounds(indices.astype(dtype))
+    # Cycle walking: the network permutes [0, 2**bits), so re-encrypt any
+    # value that lands outside [0, size) until it falls back inside.
+    outside = np.flatnonzero(result >= size)
+    while outside.size:
+        result[outside] = rounds(result[outside])
+        outside = outside[result[outside] >= size]
+    return result.astype(np.intp)
+
+def feistel_apply(image, key, inverse=False, block_size=FEISTEL_BLOCK, output=None, progress=None):
+    """
+    Scrambles (or with `inverse`, unscrambles) the values of `image` with the
+    keyed Feistel permutation, writing into `output` if given. Memory use
+    beyond the output is O(block_size) and the global NumPy RNG is not
+    touched. `progress` is called with the completed fraction after every
+    block.
+    """
+    image = np.ascontiguousarray(image)
+    if output is None:
+        output = np.empty_like(image)
+    flat_in, flat_out = image.reshape(-1), output.reshape(-1)
+    round_keys = feistel_round_keys(key)
+    for start in range(0, flat_in.size, block_size):
+        indices = np.arange(start, min(start + block_size, flat_in.size), dtype=np.uint64)
+        permuted = feistel_permute(indices, flat_in.size, round_keys)
+        if inverse:
+            flat_out[permuted] = flat_in[start:start + indices.size]
         else:
-            raise ValueError("Unsupported decryption method")
-    except Exception as e:
-        messagebox.showerror("Error", f"Error during decryption: {e}")
-        return None
+            flat_out[start:start + indices.size] = flat_in[permuted]
+        if progress:
+            progress(min(start + block_size, flat_in.size) / flat_in.size)
+    return output
 
-def scramble_encrypt(image, key):
-    try:
-        np.random.seed(int.from_bytes(key[:4], 'little'))
-        indices = np.arange(image.size)
-        np.random.shuffle(indices)
-        encrypted_image = image.flatten()[indices].reshape(image.shape)
-        return encrypted_image
-    except Exception as e:
-        messagebox.showerror("Error", f"Error in scrambling encryption: {e}")
-        return None
-
-def scramble_decrypt(image, key):
-    try:
-        np.random.seed(int.from_bytes(key[:4], 'little'))
-        indices = np.arange(image.size)
-        np.random.shuffle(indices)
-        decrypted_image = np.empty_like(image.flatten())
-        decrypted_image[indices] = image.flatten()
-        return decrypted_image.reshape(image.shape)
-    except Exception as e:
-        messagebox.showerror("Error", f"Error in scrambling decryption: {e}")
-        return None
-
-def aes_encrypt(image, key):
-    try:
-        cipher = Cipher(algorithms.AES(key), modes.ECB(), backend=default_backend())
-        encryptor = cipher.encryptor()
-        padded_image = pad_image(image)
-        encrypted_image = encryptor.update(padded_image.tobytes()) + encryptor.finalize()
-        return np.frombuffer(encrypted_image, dtype=np.uint8).reshape(padded_image.shape)
-    except Exception as e:
-        messagebox.showerror("Error", f"Error in AES encryption: {e}")
-        return None
-
-def aes_decrypt(image, key):
-    try:
-        cipher = Cipher(algorithms.AES(key), modes.ECB(), backend=default_backend())
-        decryptor = cipher.decryptor()
-        decrypted_image = decryptor.update(image.tobytes()) + decryptor.finalize()
-        return np.frombuffer(decrypted_image, dtype=np.uint8).reshape(image.shape)
-    except Exception as e:
-        messagebox.showerror("Error", f"Error in AES decryption: {e}")
-        return None
+def _ecb_blocks(context, image, progress):
+    # PROGRESS_BLOCK is a multiple of the AES block size, so ECB output lines up with input
+    flat = np.ascontiguousarray(image).reshape(-1)
+    output = np.empty_like(flat)
+    if progress:
+        progress(0.0)
+    for start in range(0, flat.size, PROGRESS_BLOCK):
+        end = min(start + PROGRESS_BLOCK, flat.size)
+        output[start:end] = np.frombuffer(context.update(flat[start:end]), dtype=np.uint8)
+        if progress:
+            progress(end / flat.size)
+    context.finalize()
+    return output.reshape(image.shape)
+
+def aes_encrypt(image, key, progress=None):
+    cipher = Cipher(algorithms.AES(aes_key_bytes(key)), modes.ECB(), backend=default_backend())
+    return _ecb_blocks(cipher.encryptor(), pad_image(image), progress)
+
+def aes_decrypt(image, key, progress=None):
+    cipher = Cipher(algorithms.AES(aes_key_bytes(key)), modes.ECB(), backend=default_backend())
+    return _ecb_blocks(cipher.decryptor(), image, progress)
+
+def aes_key_bytes(key):
+    """ Returns raw AES key bytes, decoding the base64 keys made by generate_key """
+    if len(key) in (16, 24, 32):
+        return key
+    raw = base64.urlsafe_b64decode(key)
+    if len(raw) not in (16, 24, 32):
+        raise ValueError("Key must be 16, 24 or 32 bytes (raw or base64-encoded)")
+    return raw
+
+# Streaming AES-CTR: the image buffer is encrypted chunk by chunk straight into
+# a preallocated output array. Each chunk starts its own counter at
+# nonce + byte_offset / 16, so chunks are independent and run on threads (the
+# cryptography backend releases the GIL). The nonce is stored in extra rows
+# appended below the image, so the result stays a self-contained image.
+AES_CTR_CHUNK = 4 * 1024 * 1024
+NONCE_SIZE = 16
+
+def _ctr_chunks(source, target, key, nonce, chunk_size, workers, progress=None):
+    counter = int.from_bytes(nonce, 'big')
+    source, target = memoryview(source).cast('B'), memoryview(target).cast('B')
+    total = len(source)
+    lock = threading.Lock()
+    state = {'done': 0, 'error': None}
+
+    def run(start):
+        if state['error']:
+            return
+        block = (counter + start // 16) % (1 << 128)
+        encryptor = Cipher(algorithms.AES(key), modes.CTR(block.to_bytes(16, 'big')), backend=default_backend()).encryptor()
+        end = min(start + chunk_size, total)
+        # Older cryptography releases want block_size - 1 spare bytes in the
+        # output buffer; the nonce rows after the pixels provide them.
+        encryptor.update_into(source[start:end], target[start:min(end + 15, len(target))])
+        if progress:
+            with lock:
+                state['done'] += end - start
+                try:
+                    progress(state['done'] / total)
+                except Exception as e:
+                    # Remaining chunks see the error and return without work
+                    state['error'] = e
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(run, range(0, total, chunk_size)))
+    if state['error']:
+        raise state['error']
+
+def _nonce_rows(shape):
+    row_bytes = int(np.prod(shape[1:], dtype=np.int64))
+    return -(-NONCE_SIZE // row_bytes)
+
+def aes_ctr_encrypt(image, key, chunk_size=AES_CTR_CHUNK, workers=None, progress=None, nonce=None):
+    """
+    Encrypts the image with AES-CTR into a new array holding the ciphertext
+    followed by nonce rows. Peak memory is about the image plus the output.
+    A random nonce is used unless one is given; never reuse a nonce with
+    the same key.
+    """
+    if image.dtype != np.uint8:
+        raise ValueError("AES-CTR expects a uint8 image")
+    if chunk_size % 16:
+        raise ValueError("Chunk size must be a multiple of 16 bytes")
+    image = np.ascontiguousarray(image)
+    if nonce is None:
+        nonce = os.urandom(NONCE_SIZE)
+    if len(nonce) != NONCE_SIZE:
+        raise ValueError(f"Nonce must be {NONCE_SIZE} bytes")
+    output = np.zeros((image.shape[0] + _nonce_rows(image.shape),) + image.shape[1:], dtype=np.uint8)
+    flat_out = output.reshape(-1)
+    _ctr_chunks(image.reshape(-1), flat_out, aes_key_bytes(key), nonce, chunk_size, workers, progress)
+    flat_out[image.size:image.size + NONCE_SIZE] = np.frombuffer(nonce, dtype=np.uint8)
+    return output
+
+def aes_ctr_decrypt(image, key, chunk_size=AES_CTR_CHUNK, workers=None, progress=None):
+    if chunk_size % 16:
+        raise ValueError("Chunk size must be a multiple of 16 bytes")
+    image = np.ascontiguousarray(image)
+    height = image.shape[0] - _nonce_rows(image.shape)
+    if height <= 0:
+        raise ValueError("Image is too small to hold an AES-CTR nonce")
+    flat_in = image.reshape(-1)
+    size = height * (image.size // image.shape[0])
+    nonce = flat_in[size:size + NONCE_SIZE].tobytes()
+    # Allocate 15 spare bytes past the pixels for older cryptography releases
+    buffer = np.empty(size + 15, dtype=np.uint8)
+    _ctr_chunks(flat_in[:size], buffer, aes_key_bytes(key), nonce, chunk_size, workers, progress)
+    return buffer[:size].reshape((height,) + image.shape[1:])
 
 def pad_image(image):
     """ Pads image data to be a multiple of 16 bytes for AES """
-    try:
-        h, w, c = image.shape
-        pad_h = (16 - h % 16) if h % 16 != 0 else 0
-        pad_w = (16 - w % 16) if w % 16 != 0 else 0
-        return np.pad(image, ((0, pad_h), (0, pad_w), (0, 0)), 'constant')
-    except Exception as e:
-        messagebox.showerror("Error", f"Error in padding image: {e}")
-        return None
+    h, w, c = image.shape
+    pad_h = (16 - h % 16) if h % 16 != 0 else 0
+    pad_w = (16 - w % 16) if w % 16 != 0 else 0
+    return np.pad(image, ((0, pad_h), (0, pad_w), (0, 0)), 'constant')
 
 # Module 4: File Management
-def save_image(image, output_path):
+def save_image(image, output_path, key=None, workers=None):
+    """ Saves the image; with a key, also writes an integrity tag next to it as <output_path>.tag """
+    im = Image.fromarray(image)
+    im.save(output_path)
+    if key is not None:
+        save_tag(tree_hash(image, key, workers=workers, header=image_header(image)), output_path + TAG_SUFFIX)
+
+def load_verified_image(filepath, key, workers=None):
+    """ Loads an encrypted image saved with a key, raising IntegrityError if it was modified """
+    image = np.array(Image.open(filepath))
+    verify_tree_hash(image, key, load_tag(filepath + TAG_SUFFIX), workers, header=image_header(image))
+    return image
+
+# Integrity tags: a keyed BLAKE2b tree hash in BLAKE2's own tree mode. Every
+# chunk of the ciphertext is a leaf (node depth 0, node offset = chunk index)
+# and the root hashes the concatenated leaf digests (node depth 1). Leaves are
+# independent, so they are hashed on threads (hashlib releases the GIL), and
+# one chunk can be checked against its stored leaf and the root alone. The
+# root also covers a header (shape, dtype, or a container's whole header), so
+# reshaping the data or editing the header breaks the tag too.
+INTEGRITY_CHUNK = 4 * 1024 * 1024
+TAG_SUFFIX = '.tag'
+
+class IntegrityError(ValueError):
+    """ Raised when ciphertext does not match its integrity tag """
+    def __init__(self, message, chunks=()):
+        super().__init__(message)
+        self.chunks = list(chunks)
+
+def integrity_key(key):
+    """ A 32-byte MAC key derived from the encryption key, so the two are never used alike """
+    return hashlib.blake2b(key, digest_size=32, person=b'img-integrity').digest()
+
+def _tree_params(chunk_size):
+    return {'digest_size': 32, 'fanout': 0, 'depth': 2, 'leaf_size': chunk_size, 'inner_size': 32}
+
+def _leaf_digest(mac_key, data, index, last, chunk_size):
+    return hashlib.blake2b(data, key=mac_key, node_offset=index, node_depth=0, last_node=last,
+                           **_tree_params(chunk_size)).digest()
+
+def image_header(image):
+    """ The header bound into an image's tag: its shape and dtype """
+    return {'shape': list(image.shape), 'dtype': image.dtype.str}
+
+def _header_bytes(header):
+    return json.dumps(header, sort_keys=True, separators=(',', ':')).encode()
+
+def _root_digest(mac_key, leaves, size, chunk_size, header):
+    root = hashlib.blake2b(key=mac_key, node_offset=0, node_depth=1, last_node=True, **_tree_params(chunk_size))
+    for leaf in leaves:
+        root.update(leaf)
+    root.update(size.to_bytes(8, 'little'))
+    encoded = _header_bytes(header)
+    root.update(len(encoded).to_bytes(8, 'little') + encoded)
+    return root.digest()
+
+def _leaf_digests(data, mac_key, chunk_size, workers):
+    count = max(1, -(-len(data) // chunk_size))
+
+    def run(index):
+        return _leaf_digest(mac_key, data[index * chunk_size:(index + 1) * chunk_size], index,
+                            index == count - 1, chunk_size)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run, range(count)))
+
+def _byte_view(data):
+    if isinstance(data, np.ndarray):
+        data = np.ascontiguousarray(data).reshape(-1)
+    return memoryview(data).cast('B')
+
+def tree_hash(data, key, chunk_size=INTEGRITY_CHUNK, workers=None, header=None):
+    """
+    Returns the integrity tag of `data` (an array, np.memmap or bytes) as a
+    JSON-serializable dict holding every leaf digest, the header and the root.
+    """
+    data = _byte_view(data)
+    mac_key = integrity_key(key)
+    leaves = _leaf_digests(data, mac_key, chunk_size, workers)
+    return {
+        'algorithm': 'blake2b-tree',
+        'chunk_size': chunk_size,
+        'size': len(data),
+        'header': header,
+        'leaves': [leaf.hex() for leaf in leaves],
+        'root': _root_digest(mac_key, leaves, len(data), chunk_size, header).hex(),
+    }
+
+def _checked_leaves(mac_key, tag, header):
+    """ Returns the tag's leaf digests after checking the header and the leaves against its root """
+    if 'header' not in tag:
+        raise IntegrityError("Integrity tag predates header binding; encrypt the image again")
+    if _header_bytes(tag['header']) != _header_bytes(header):
+        raise IntegrityError("Header does not match the integrity tag")
+    leaves = [bytes.fromhex(leaf) for leaf in tag['leaves']]
+    root = _root_digest(mac_key, leaves, tag['size'], tag['chunk_size'], header)
+    if not hmac.compare_digest(root, bytes.fromhex(tag['root'])):
+        raise IntegrityError("Integrity tag is invalid for this key")
+    return leaves
+
+def verify_tree_hash(data, key, tag, workers=None, header=None):
+    """ Rehashes `data` in parallel and raises IntegrityError naming the chunks that changed """
+    data = _byte_view(data)
+    mac_key = integrity_key(key)
+    expected = _checked_leaves(mac_key, tag, header)
+    if len(data) != tag['size']:
+        raise IntegrityError(f"Size mismatch: expected {tag['size']} bytes, found {len(data)}")
+    actual = _leaf_digests(data, mac_key, tag['chunk_size'], workers)
+    bad = [i for i, (a, b) in enumerate(zip(actual, expected)) if not hmac.compare_digest(a, b)]
+    if bad:
+        raise IntegrityError(f"{len(bad)} of {len(expected)} chunks were modified", bad)
+
+def verify_chunk(chunk, index, key, tag, header=None):
+    """ Checks one chunk (e.g. one tile's ciphertext) against the tag without reading the rest """
+    mac_key = integrity_key(key)
+    leaves = _checked_leaves(mac_key, tag, header)
+    if not 0 <= index < len(leaves):
+        raise IntegrityError(f"Chunk {index} is outside the tag", [index])
+    leaf = _leaf_digest(mac_key, _byte_view(chunk), index, index == len(leaves) - 1, tag['chunk_size'])
+    if not hmac.compare_digest(leaf, leaves[index]):
+        raise IntegrityError(f"Chunk {index} was modified", [index])
+
+def save_tag(tag, filepath):
+    with open(filepath, 'w') as f:
+        json.dump(tag, f)
+
+def load_tag(filepath):
+    if not os.path.isfile(filepath):
+        raise IntegrityError(f"No integrity tag found at {filepath}")
+    with open(filepath) as f:
+        return json.load(f)
+
+# File mode: the encoded file (JPEG, PNG, ...) is encrypted as-is, so there is
+# no decode or re-encode and the output is only 16 bytes per chunk larger than
+# the input, where pixel-mode ciphertext does not compress at all. The file is
+# FILE_MAGIC, the chunk size and an 8-byte nonce prefix, then AES-GCM chunks
+# in the STREAM construction: chunk i uses nonce prefix + i and the header plus
+# a last-chunk flag as associated data, so reordering, truncation and
+# tampering are all detected. The result is no longer a viewable image; use a
+# pixel method when one is needed.
+FILE_MAGIC = b'IMGAEAD\x01'
+FILE_CHUNK = 1024 * 1024
+FILE_SUFFIX = '.enc'
+
+def _file_chunks(src, chunk_size):
+    """ Yields (index, chunk, last) reading one chunk ahead, so the final chunk is known """
+    chunk = src.read(chunk_size)
+    index = 0
+    while True:
+        following = src.read(chunk_size)
+        yield index, chunk, not following
+        if not following:
+            return
+        chunk, index = following, index + 1
+
+def _chunk_nonce(prefix, index):
+    if index >= 1 << 32:
+        raise ValueError("File is too large for one nonce prefix")
+    return prefix + index.to_bytes(4, 'big')
+
+def encrypt_stream(src, dst, key, chunk_size=FILE_CHUNK):
+    """ Encrypts a binary stream chunk by chunk with AES-GCM; returns the bytes written """
+    header = FILE_MAGIC + chunk_size.to_bytes(4, 'little') + os.urandom(8)
+    cipher = AESGCM(aes_key_bytes(key))
+    dst.write(header)
+    written = len(header)
+    for index, chunk, last in _file_chunks(src, chunk_size):
+        sealed = cipher.encrypt(_chunk_nonce(header[-8:], index), chunk, header + (b'\x01' if last else b'\x00'))
+        dst.write(sealed)
+        written += len(sealed)
+    return written
+
+def decrypt_stream(src, dst, key):
+    """ Decrypts a stream written by encrypt_stream; raises IntegrityError if it was modified """
+    header = src.read(len(FILE_MAGIC) + 12)
+    if len(header) != len(FILE_MAGIC) + 12 or not header.startswith(FILE_MAGIC):
+        raise ValueError("Not an encrypted image file")
+    chunk_size = int.from_bytes(header[len(FILE_MAGIC):len(FILE_MAGIC) + 4], 'little')
+    cipher = AESGCM(aes_key_bytes(key))
+    written = 0
+    for index, chunk, last in _file_chunks(src, chunk_size + 16):
+        try:
+            plain = cipher.decrypt(_chunk_nonce(header[-8:], index), chunk, header + (b'\x01' if last else b'\x00'))
+        except InvalidTag:
+            raise IntegrityError(f"Chunk {index} failed authentication (wrong key, modified or truncated file)",
+                                 [index]) from None
+        dst.write(plain)
+        written += len(plain)
+    return written
+
+def _process_file(function, input_path, output_path, *args):
+    temp_path = output_path + '.part'
     try:
-        im = Image.fromarray(image)
-        im.save(output_path)
-    except Exception as e:
-        messagebox.showerror("Error", f"Error saving image: {e}")
+        with open(input_path, 'rb') as src, open(temp_path, 'wb') as dst:
+            written = function(src, dst, *args)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return written
+
+def encrypt_file(input_path, output_path, key, chunk_size=FILE_CHUNK):
+    """ Encrypts an encoded image file as-is; returns the output size """
+    return _process_file(encrypt_stream, input_path, output_path, key, chunk_size)
+
+def decrypt_file(input_path, output_path, key):
+    """ Restores the original encoded file; nothing is left at output_path if authentication fails """
+    return _process_file(decrypt_stream, input_path, output_path, key)
+
+# Tiled container format for images too large to hold in memory. The file is
+# CONTAINER_MAGIC, a 4-byte header length, a JSON header (salt, KDF
+# parameters, shape, dtype, method, tile size, nonce) padded to a page, then
+# one fixed-size slot per tile. Tiles are encrypted independently and the
+# data area is read and written through np.memmap, so work is done tile by
+# tile and any region can be decrypted without reading the rest of the file.
+CONTAINER_MAGIC = b'IMGCONT\x01'
+CONTAINER_METHODS = ("aes-ctr", "feistel")
+
+class ImageContainer:
+    def __init__(self, filepath, header, key, mode='r'):
+        self.filepath = filepath
+        self.header = header
+        self.key = key
+        self.shape = tuple(header['shape'])
+        self.dtype = np.dtype(header['dtype'])
+        self.method = header['method']
+        self.tile_height, self.tile_width = header['tile_size']
+        self.tiles_y = -(-self.shape[0] // self.tile_height)
+        self.tiles_x = -(-self.shape[1] // self.tile_width)
+        self.slot_bytes = header['slot_bytes']
+        self.nonce = int(header['nonce'], 16)
+        self.tag = None
+        self.slots = np.memmap(filepath, dtype=np.uint8, mode=mode, offset=header['data_offset'],
+                               shape=(self.tiles_y * self.tiles_x, self.slot_bytes))
+
+    @classmethod
+    def create(cls, filepath, shape, dtype, password, method="aes-ctr", tile_size=(1024, 1024), iterations=100000):
+        """ Writes a header and allocates the tile slots for a new container """
+        if method not in CONTAINER_METHODS:
+            raise ValueError(f"Unsupported container method: {method}")
+        if len(shape) < 2:
+            raise ValueError("Image must have at least two dimensions")
+        salt = os.urandom(16)
+        key, _ = generate_key(password, salt, iterations)
+        tile_height, tile_width = tile_size
+        tile_bytes = tile_height * tile_width * int(np.prod(shape[2:], dtype=np.int64)) * np.dtype(dtype).itemsize
+        header = {
+            'version': 1,
+            'salt': salt.hex(),
+            'kdf': {'name': 'pbkdf2-sha256', 'iterations': iterations, 'length': 32},
+            'shape': list(shape),
+            'dtype': np.dtype(dtype).str,
+            'method': method,
+            'tile_size': [tile_height, tile_width],
+            'slot_bytes': -(-tile_bytes // 16) * 16,
+            'nonce': os.urandom(16).hex(),
+            'data_offset': 0,
+        }
+        encoded = json.dumps(header).encode()
+        header['data_offset'] = -(-(len(CONTAINER_MAGIC) + 4 + len(encoded) + 32) // 4096) * 4096
+        encoded = json.dumps(header).encode()
+        tiles = -(-shape[0] // tile_height) * -(-shape[1] // tile_width)
+        with open(filepath, 'wb') as f:
+            f.write(CONTAINER_MAGIC + len(encoded).to_bytes(4, 'little') + encoded)
+            f.truncate(header['data_offset'] + tiles * header['slot_bytes'])
+        return cls(filepath, header, key, mode='r+')
+
+    @classmethod
+    def open(cls, filepath, password, mode='r'):
+        """ Reads the header and maps the tiles; the key is derived from the stored salt and KDF parameters """
+        with open(filepath, 'rb') as f:
+            if f.read(len(CONTAINER_MAGIC)) != CONTAINER_MAGIC:
+                raise ValueError(f"{filepath} is not an image container")
+            header = json.loads(f.read(int.from_bytes(f.read(4), 'little')))
+        key, _ = generate_key(password, bytes.fromhex(header['salt']), header['kdf']['iterations'])
+        return cls(filepath, header, key, mode)
+
+    def tile_bounds(self, ty, tx):
+        y0, x0 = ty * self.tile_height, tx * self.tile_width
+        return y0, min(y0 + self.tile_height, self.shape[0]), x0, min(x0 + self.tile_width, self.shape[1])
+
+    def _tile_key(self, index):
+        return self.key + index.to_bytes(8, 'little')
+
+    def _tile_nonce(self, index):
+        counter = (self.nonce + index * (self.slot_bytes // 16)) % (1 << 128)
+        return counter.to_bytes(16, 'big')
+
+    def write_tile(self, ty, tx, tile):
+        """ Encrypts one tile (already cut to its bounds) into its slot """
+        index = ty * self.tiles_x + tx
+        tile = np.ascontiguousarray(tile, dtype=self.dtype)
+        slot = self.slots[index]
+        if self.method == "aes-ctr":
+            _ctr_chunks(tile.view(np.uint8).reshape(-1), slot, aes_key_bytes(self.key),
+                        self._tile_nonce(index), AES_CTR_CHUNK, 1)
+        else:
+            output = slot[:tile.nbytes].view(self.dtype).reshape(tile.shape)
+            feistel_apply(tile, self._tile_key(index), output=output)
+
+    @property
+    def tag_path(self):
+        return self.filepath + TAG_SUFFIX
+
+    def seal(self, workers=None):
+        """ Writes the integrity tag of the tile slots (one tree-hash leaf per tile) and the header """
+        self.tag = tree_hash(self.slots, self.key, self.slot_bytes, workers, header=self.header)
+        save_tag(self.tag, self.tag_path)
+
+    def verify(self, workers=None):
+        """ Rehashes every tile in parallel; raises IntegrityError listing the modified tiles """
+        verify_tree_hash(self.slots, self.key, self._load_tag(), workers, header=self.header)
+
+    def verify_tile(self, ty, tx):
+        """ Checks a single tile against the tag without touching the other tiles """
+        index = ty * self.tiles_x + tx
+        verify_chunk(self.slots[index], index, self.key, self._load_tag(), header=self.header)
+
+    def _load_tag(self):
+        if self.tag is None:
+            self.tag = load_tag(self.tag_path)
+        return self.tag
+
+    def read_tile(self, ty, tx, verify=False):
+        """ Decrypts one tile and returns it as an array, checking it against the tag first if asked """
+        index = ty * self.tiles_x + tx
+        if verify:
+            self.verify_tile(ty, tx)
+        y0, y1, x0, x1 = self.tile_bounds(ty, tx)
+        shape = (y1 - y0, x1 - x0) + self.shape[2:]
+        nbytes = int(np.prod(shape, dtype=np.int64)) * self.dtype.itemsize
+        encrypted = np.asarray(self.slots[index, :nbytes])
+        if self.method == "aes-ctr":
+            buffer = np.empty(nbytes + 15, dtype=np.uint8)
+            _ctr_chunks(encrypted, buffer, aes_key_bytes(self.key), self._tile_nonce(index), AES_CTR_CHUNK, 1)
+            return buffer[:nbytes].view(self.dtype).reshape(shape)
+        return feistel_apply(encrypted.view(self.dtype).reshape(shape), self._tile_key(index), inverse=True)
+
+    def tiles(self):
+        return [(ty, tx) for ty in range(self.tiles_y) for tx in range(self.tiles_x)]
+
+    def encrypt_from(self, image, workers=None):
+        """ Encrypts every tile of `image` (an array or np.memmap) in bounded memory """
+        def run(tile):
+            y0, y1, x0, x1 = self.tile_bounds(*tile)
+            self.write_tile(*tile, image[y0:y1, x0:x1])
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(run, self.tiles()))
+        self.slots.flush()
+        self.seal(workers)
+
+    def decrypt_region(self, y0, y1, x0, x1, output=None, verify=False):
+        """ Decrypts rows y0:y1 and columns x0:x1, touching (and optionally verifying) only the tiles they overlap """
+        y0, x0 = max(y0, 0), max(x0, 0)
+        y1, x1 = min(y1, self.shape[0]), min(x1, self.shape[1])
+        if output is None:
+            output = np.empty((y1 - y0, x1 - x0) + self.shape[2:], dtype=self.dtype)
+        for ty in range(y0 // self.tile_height, -(-y1 // self.tile_height)):
+            for tx in range(x0 // self.tile_width, -(-x1 // self.tile_width)):
+                ty0, ty1, tx0, tx1 = self.tile_bounds(ty, tx)
+                tile = self.read_tile(ty, tx, verify)
+                sy0, sy1 = max(y0, ty0), min(y1, ty1)
+                sx0, sx1 = max(x0, tx0), min(x1, tx1)
+                output[sy0 - y0:sy1 - y0, sx0 - x0:sx1 - x0] = tile[sy0 - ty0:sy1 - ty0, sx0 - tx0:sx1 - tx0]
+        return output
+
+    def decrypt_to(self, output=None, workers=None, verify=False):
+        """ Decrypts the whole image into `output` (e.g. an np.memmap), tile by tile """
+        if verify:
+            self.verify(workers)
+        if output is None:
+            output = np.empty(self.shape, dtype=self.dtype)
+
+        def run(tile):
+            y0, y1, x0, x1 = self.tile_bounds(*tile)
+            output[y0:y1, x0:x1] = self.read_tile(*tile)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(run, self.tiles()))
+        return output
+
+def encrypt_to_container(image, filepath, password, method="aes-ctr", tile_size=(1024, 1024), workers=None):
+    """ Encrypts an array (or an np.memmap / np.load(..., mmap_mode='r') result) into a container file """
+    container = ImageContainer.create(filepath, image.shape, image.dtype, password, method, tile_size)
+    container.encrypt_from(image, workers)
+    return container
+
+def decrypt_container(filepath, password, output_path=None, workers=None, verify=False):
+    """ Decrypts a container, into a memory-mapped .npy file when `output_path` is given """
+    container = ImageContainer.open(filepath, password)
+    output = None
+    if output_path:
+        output = np.lib.format.open_memmap(output_path, mode='w+', dtype=container.dtype, shape=container.shape)
+    output = container.decrypt_to(output, workers, verify)
+    if output_path:
+        output.flush()
+    return output
+
+def decrypt_container_region(filepath, password, y0, y1, x0, x1, verify=False):
+    """ Decrypts one region of interest of a container """
+    return ImageContainer.open(filepath, password).decrypt_region(y0, y1, x0, x1, verify=verify)
 
 # Module 5: GUI Implementation
+PREVIEW_SIZE = 400
+
+def preview_array(image, size=PREVIEW_SIZE):
+    """
+    Returns a small strided view of `image` for display, so previews of very
+    large arrays never convert the full-resolution data.
+    """
+    step = max(1, -(-max(image.shape[:2]) // size))
+    return np.ascontiguousarray(image[::step, ::step])
+
 class ImageEncryptionApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Advanced Image Encryption Tool")
-        self.root.geometry("500x650")
+        self.root.geometry("500x700")
         
         self.image = None
         self.processed_image = None
@@ -154,6 +814,8 @@ class ImageEncryptionApp:
         self.method = StringVar(root)
         self.method.set("scramble")
         self.image_path = StringVar(root)
+        self.status = StringVar(root)
+        self.job = None
 
         # Layout
         Label(root, text="Image Encryption Tool", font=("Helvetica", 16)).pack(pady=10)
@@ -169,12 +831,66 @@ class ImageEncryptionApp:
         Button(root, text="Load Key", command=self.load_key).pack(pady=5)
         
         Label(root, text="Select Method:").pack(pady=5)
-        OptionMenu(root, self.method, "scramble", "aes").pack(pady=5)
+        OptionMenu(root, self.method, "scramble", "feistel", "aes", "aes-ctr").pack(pady=5)
         
         Button(root, text="Encrypt Image", command=self.encrypt_image).pack(pady=5)
         Button(root, text="Decrypt Image", command=self.decrypt_image).pack(pady=5)
-        Button(root, text="Save Image", command=self.save_image).pack(pady=20)
-    
+        Button(root, text="Save Image", command=self.save_image).pack(pady=10)
+
+        self.progress = ttk.Progressbar(root, orient="horizontal", length=300, mode="determinate", maximum=1.0)
+        self.progress.pack(pady=5)
+        Label(root, textvariable=self.status, font=("Helvetica", 10)).pack()
+        Button(root, text="Cancel", command=self.cancel_job).pack(pady=5)
+
+    # Long operations run on a worker thread. The worker only writes plain
+    # attributes of the job; the Tk main thread polls them with root.after and
+    # is the only thread that touches widgets.
+    def start_job(self, description, work, on_done):
+        if self.job is not None:
+            messagebox.showwarning("Warning", "Please wait for the current operation to finish or cancel it.")
+            return
+        job = {'cancel': threading.Event(), 'fraction': 0.0, 'result': None, 'error': None, 'done': False}
+
+        def progress(fraction):
+            if job['cancel'].is_set():
+                raise OperationCancelled()
+            job['fraction'] = fraction
+
+        def run():
+            try:
+                job['result'] = work(progress)
+            except Exception as e:
+                job['error'] = e
+            job['done'] = True
+
+        self.job = job
+        self.status.set(f"{description}...")
+        self.progress['value'] = 0.0
+        threading.Thread(target=run, daemon=True).start()
+        self.poll_job(description, on_done)
+
+    def poll_job(self, description, on_done):
+        job = self.job
+        self.progress['value'] = job['fraction']
+        if not job['done']:
+            self.root.after(50, self.poll_job, description, on_done)
+            return
+        self.job = None
+        if isinstance(job['error'], OperationCancelled):
+            self.status.set(f"{description} cancelled.")
+        elif job['error'] is not None:
+            self.status.set(f"{description} failed.")
+            messagebox.showerror("Error", f"{description} failed: {job['error']}")
+        else:
+            self.progress['value'] = 1.0
+            self.status.set(f"{description} finished.")
+            on_done(job['result'])
+
+    def cancel_job(self):
+        if self.job is not None:
+            self.job['cancel'].set()
+            self.status.set("Cancelling...")
+
     def load_image(self):
         filepath = filedialog.askopenfilename(
             title="Select Image", 
@@ -182,39 +898,47 @@ class ImageEncryptionApp:
         )
         if filepath:
             self.image_path.set(f"Loaded Image: {os.path.basename(filepath)}")
-            np_image, pil_image = load_image(filepath)
-            if np_image is not None:
-                self.image = np_image
-                self.display_image(pil_image)
-                messagebox.showinfo("Success", "Image loaded successfully.")
-            else:
-                messagebox.showerror("Error", "Failed to load the image.")
+
+            def loaded(result):
+                self.image = result
+                self.display_image(result)
+
+            self.start_job("Loading image", lambda progress: load_image(filepath)[0], loaded)
         else:
             messagebox.showwarning("Warning", "No image selected.")
 
-    def display_image(self, pil_image):
-        pil_image.thumbnail((400, 400))  # Resize for display
-        tk_image = ImageTk.PhotoImage(pil_image)
+    def display_image(self, image):
+        tk_image = ImageTk.PhotoImage(Image.fromarray(preview_array(image)))
         self.image_label.config(image=tk_image)
         self.image_label.image = tk_image
 
     def generate_key(self):
         password = simpledialog.askstring("Password", "Enter a password for key generation:", show='*')
         if password:
-            key, salt = generate_key(password)
-            if key is not None:
+            # Derive as a job, so the window never blocks on the KDF
+            def derive(progress):
+                progress(0.0)
+                key, salt = generate_key(password)
+                return key
+
+            def generated(key):
                 self.key = key
                 messagebox.showinfo("Success", "Key generated successfully.")
 
+            self.start_job("Generating key", derive, generated)
+
     def load_key(self):
         filepath = filedialog.askopenfilename(
             title="Select Key File", 
             filetypes=[("Key Files", "*.key"), ("All Files", "*.*")]
         )
         if filepath:
-            self.key = load_key(filepath)
-            if self.key is not None:
-                messagebox.showinfo("Success", "Key loaded successfully.")
+            try:
+                self.key = load_key(filepath)
+            except Exception as e:
+                messagebox.showerror("Error", f"Error loading key: {e}")
+                return
+            messagebox.showinfo("Success", "Key loaded successfully.")
     
     def encrypt_image(self):
         if self.image is None:
@@ -223,12 +947,13 @@ class ImageEncryptionApp:
         if self.key is None:
             messagebox.showwarning("Warning", "Please generate or load a key first.")
             return
-        method = self.method.get()
-        encrypted_image = encrypt_image(self.image, self.key, method)
-        if encrypted_image is not None:
-            self.processed_image = encrypted_image
-            self.display_image(Image.fromarray(encrypted_image))
-            messagebox.showinfo("Success", "Image encrypted successfully.")
+        image, key, method = self.image, self.key, self.method.get()
+
+        def encrypted(result):
+            self.processed_image = result
+            self.display_image(result)
+
+        self.start_job("Encryption", lambda progress: encrypt_image(image, key, method, progress), encrypted)
 
     def decrypt_image(self):
         if self.processed_image is None:
@@ -237,11 +962,8 @@ class ImageEncryptionApp:
         if self.key is None:
             messagebox.showwarning("Warning", "Please generate or load a key first.")
             return
-        method = self.method.get()
-        decrypted_image = decrypt_image(self.processed_image, self.key, method)
-        if decrypted_image is not None:
-            self.display_image(Image.fromarray(decrypted_image))
-            messagebox.showinfo("Success", "Image decrypted successfully.")
+        image, key, method = self.processed_image, self.key, self.method.get()
+        self.start_job("Decryption", lambda progress: decrypt_image(image, key, method, progress), self.display_image)
 
     def save_image(self):
         if self.processed_image is None:
@@ -252,10 +974,13 @@ class ImageEncryptionApp:
             filetypes=[("PNG files", "*.png"), ("All files", "*.*")]
         )
         if filepath:
-            save_image(self.processed_image, filepath)
-            messagebox.showinfo("Success", "Image saved successfully.")
+            image, key = self.processed_image, self.key
+            # The encrypted image is saved with an integrity tag next to it
+            self.start_job("Saving image", lambda progress: save_image(image, filepath, key), lambda result: None)
 
 if __name__ == "__main__":
+    if Tk is None:
+        sys.exit("Tkinter is not available; use Image_Encrypt_Batch.py for command-line encryption.")
     root = Tk()
     app = ImageEncryptionApp(root)
     root.mainloop()
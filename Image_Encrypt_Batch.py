@@ -0,0 +1,182 @@
+import argparse
+import getpass
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+from PIL import Image
+from Image_Encrypt import (load_image, load_key, generate_key, encrypt_image, decrypt_image, tree_hash,
+                           verify_tree_hash, save_tag, load_tag, TAG_SUFFIX, encrypt_file, decrypt_file,
+                           FILE_SUFFIX, image_header)
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+PIXEL_SUFFIX = '.png'
+SALT_FILE = '.salt'
+
+def find_images(input_dir, output_dir, extensions=IMAGE_EXTENSIONS):
+    """ Yields (input_path, relative_path) for every image under input_dir, skipping output_dir """
+    output_dir = os.path.abspath(output_dir)
+    for dirpath, dirnames, filenames in os.walk(input_dir):
+        dirnames[:] = sorted(d for d in dirnames if os.path.abspath(os.path.join(dirpath, d)) != output_dir)
+        for filename in sorted(filenames):
+            if filename.lower().endswith(extensions):
+                path = os.path.join(dirpath, filename)
+                yield path, os.path.relpath(path, input_dir)
+
+def output_path_for(relative_path, output_dir, decrypt=False, method="feistel"):
+    """
+    Encrypted outputs are lossless PNGs named <original>.png, or <original>.enc
+    for the file method. Decryption strips that suffix again, so a round trip
+    restores the original name (decrypted pixels are still stored as PNG data):
+
+    >>> encrypted = output_path_for('a.jpg', '')
+    >>> encrypted, output_path_for(encrypted, '', decrypt=True)
+    ('a.jpg.png', 'a.jpg')
+    >>> encrypted = output_path_for('a.jpg', '', method='file')
+    >>> encrypted, output_path_for(encrypted, '', decrypt=True, method='file')
+    ('a.jpg.enc', 'a.jpg')
+    """
+    suffix = FILE_SUFFIX if method == "file" else PIXEL_SUFFIX
+    if not decrypt:
+        return os.path.join(output_dir, relative_path + suffix)
+    if relative_path.lower().endswith(suffix):
+        relative_path = relative_path[:-len(suffix)]
+    return os.path.join(output_dir, relative_path)
+
+def process_pixels(input_path, output_path, key, method, decrypt, result):
+    if decrypt:
+        image = np.array(Image.open(input_path))
+        verify_tree_hash(image, key, load_tag(input_path + TAG_SUFFIX), workers=1, header=image_header(image))
+        processed = decrypt_image(image, key, method)
+    else:
+        image, _ = load_image(input_path)
+        processed = encrypt_image(image, key, method)
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    temp_path = output_path + '.part.png'
+    Image.fromarray(processed).save(temp_path, format='PNG')
+    if not decrypt:
+        save_tag(tree_hash(processed, key, workers=1, header=image_header(processed)), output_path + TAG_SUFFIX)
+    os.replace(temp_path, output_path)
+    result['bytes'] = int(image.nbytes)
+
+def process_file(input_path, output_path, key, method, decrypt=False):
+    """
+    Decodes, encrypts (or decrypts) and encodes one image. Never raises:
+    the outcome is returned as a result dict with a status of "ok" or
+    "error". Output is written to a temporary file and renamed, so an
+    interrupted run never leaves a partial file that looks finished.
+    Encrypted outputs get an integrity tag (<output>.tag); on decryption
+    the input is checked against its tag, and a missing tag is an error. The file method
+    encrypts the encoded file itself, with authentication built in.
+    """
+    result = {'input': input_path, 'output': output_path, 'status': 'ok', 'error': None, 'bytes': 0}
+    start = time.perf_counter()
+    try:
+        if method == "file":
+            os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+            if decrypt:
+                decrypt_file(input_path, output_path, key)
+            else:
+                encrypt_file(input_path, output_path, key)
+            result['bytes'] = os.path.getsize(input_path)
+        else:
+            process_pixels(input_path, output_path, key, method, decrypt, result)
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = round(time.perf_counter() - start, 4)
+    return result
+
+def run_batch(input_dir, output_dir, key, method="feistel", decrypt=False, workers=None, resume=False):
+    """
+    Walks input_dir and fans the images out to a process pool, so decoding,
+    encryption and encoding of different files overlap. Yields one result
+    dict per file as it finishes; with `resume`, files whose output already
+    exists are yielded as "skipped" without being processed.
+    """
+    workers = workers or os.cpu_count() or 1
+    pending = set()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        extensions = (FILE_SUFFIX,) if method == "file" and decrypt else IMAGE_EXTENSIONS
+        for input_path, relative_path in find_images(input_dir, output_dir, extensions):
+            output_path = output_path_for(relative_path, output_dir, decrypt, method)
+            if resume and os.path.exists(output_path):
+                yield {'input': input_path, 'output': output_path, 'status': 'skipped', 'error': None,
+                       'bytes': 0, 'seconds': 0.0}
+                continue
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for job in done:
+                    yield job.result()
+            pending.add(pool.submit(process_file, input_path, output_path, key, method, decrypt))
+        for job in pending:
+            yield job.result()
+
+def batch_key(args):
+    """ Returns the key from --key-file, or derives it from a password and the batch salt file """
+    if args.key_file:
+        return load_key(args.key_file)
+    password = args.password or getpass.getpass("Password: ")
+    salt_path = os.path.join(args.input_dir if args.decrypt else args.output_dir, SALT_FILE)
+    if os.path.isfile(salt_path):
+        with open(salt_path, 'rb') as f:
+            salt = f.read()
+    elif args.decrypt:
+        raise FileNotFoundError(f"No {SALT_FILE} file in {args.input_dir}; use --key-file instead")
+    else:
+        salt = os.urandom(16)
+        os.makedirs(args.output_dir, exist_ok=True)
+        with open(salt_path, 'wb') as f:
+            f.write(salt)
+    key, _ = generate_key(password, salt)
+    return key
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless batch image encryption over a directory tree.")
+    parser.add_argument('input_dir')
+    parser.add_argument('output_dir')
+    parser.add_argument('-m', '--method', default='feistel', choices=['scramble', 'feistel', 'aes', 'aes-ctr', 'file'],
+                        help="pixel method, or 'file' to encrypt the encoded files as-is (smallest output)")
+    parser.add_argument('-d', '--decrypt', action='store_true', help="decrypt instead of encrypt")
+    parser.add_argument('--key-file', help="key file written by the GUI or save_key")
+    parser.add_argument('--password', help="derive the key from a password (prompted if neither option is given)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--resume', action='store_true', help="skip files whose output already exists")
+    parser.add_argument('--report', help="write one JSON result per file to this JSONL file")
+    args = parser.parse_args(argv)
+
+    try:
+        key = batch_key(args)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    report = open(args.report, 'w') if args.report else None
+    counts = {'ok': 0, 'skipped': 0, 'error': 0}
+    total_bytes = 0
+    start = time.perf_counter()
+    try:
+        for result in run_batch(args.input_dir, args.output_dir, key, args.method, args.decrypt,
+                                args.workers, args.resume):
+            counts[result['status']] += 1
+            total_bytes += result['bytes']
+            if report:
+                report.write(json.dumps(result) + '\n')
+            if result['status'] == 'ok':
+                rate = result['bytes'] / result['seconds'] / 1e6 if result['seconds'] else 0.0
+                print(f"ok      {result['input']} ({result['seconds']:.2f}s, {rate:.1f} MB/s)")
+            elif result['status'] == 'error':
+                print(f"error   {result['input']}: {result['error']}")
+    finally:
+        if report:
+            report.close()
+
+    elapsed = time.perf_counter() - start
+    rate = total_bytes / elapsed / 1e6 if elapsed > 0 else 0.0
+    print(f"{counts['ok']} processed, {counts['skipped']} skipped, {counts['error']} failed - "
+          f"{total_bytes / 1e6:,.1f} MB of pixels in {elapsed:.2f}s ({rate:.1f} MB/s)", file=sys.stderr)
+    return 1 if counts['error'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
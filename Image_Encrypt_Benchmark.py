@@ -0,0 +1,320 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+import numpy as np
+from PIL import Image
+try:
+    import resource
+except ImportError:  # Windows: peak memory comes from tracemalloc instead
+    resource = None
+from Image_Encrypt import (encrypt_image, decrypt_image, generate_key, pad_image, load_image, save_image,
+                           encrypt_file, decrypt_file, KEY_CACHE)
+
+BENCHMARK_METHODS = ("scramble", "feistel", "aes", "aes-ctr")
+DEFAULT_SIZES = (1, 10, 50, 200)
+BENCHMARK_KEY = bytes(range(32))
+
+# Module 1: Measurement
+def reset_peak_rss():
+    """ Resets the kernel's peak-RSS counter for this process where Linux allows it """
+    if resource is None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        return True
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process in MB (since the last reset on
+    Linux). Without the resource module (Windows) it is the peak traced by
+    tracemalloc, which covers NumPy buffers but not the interpreter itself.
+    """
+    if resource is None:
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024) if tracemalloc.is_tracing() else 0.0
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+def synthetic_image(megapixels, seed=0):
+    """ A reproducible random RGB image of roughly `megapixels` million pixels, 4:3 aspect """
+    width = int((megapixels * 1_000_000 * 4 / 3) ** 0.5)
+    height = int(megapixels * 1_000_000 // width)
+    return np.random.default_rng(seed).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+def timed(function, *args, repeat=1):
+    """ Returns (result, best wall time, peak RSS in MB) over `repeat` runs """
+    best = None
+    result = None
+    reset_peak_rss()
+    for _ in range(repeat):
+        result = None
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best, peak_rss_mb()
+
+def record(name, direction, megapixels, nbytes, seconds, rss):
+    return {
+        'method': name,
+        'direction': direction,
+        'megapixels': megapixels,
+        'bytes': int(nbytes),
+        'seconds': round(seconds, 4),
+        'mb_per_sec': round(nbytes / seconds / 1e6, 2) if seconds > 0 else None,
+        'peak_rss_mb': round(rss, 1),
+    }
+
+# Module 2: Cases
+def run_case(method, megapixels, repeat=1):
+    """
+    Benchmarks one method at one size, both directions. Runs in a fresh
+    worker process so peak RSS is not inflated by earlier cases. Returns a
+    list of records, or one record with an "error" field if the case fails
+    (for example, out of memory at 200 MP), so one failure never stops the
+    suite.
+    """
+    try:
+        image = synthetic_image(megapixels)
+        if method == "pad_image":
+            _, seconds, rss = timed(pad_image, image, repeat=repeat)
+            return [record(method, "pad", megapixels, image.nbytes, seconds, rss)]
+        encrypted, seconds, rss = timed(encrypt_image, image, BENCHMARK_KEY, method, repeat=repeat)
+        results = [record(method, "encrypt", megapixels, image.nbytes, seconds, rss)]
+        decrypted, seconds, rss = timed(decrypt_image, encrypted, BENCHMARK_KEY, method, repeat=repeat)
+        results.append(record(method, "decrypt", megapixels, image.nbytes, seconds, rss))
+        if decrypted.shape == image.shape and not np.array_equal(decrypted, image):
+            raise ValueError("decryption did not restore the image")
+        return results
+    except Exception as e:
+        return [error_record(method, megapixels, e)]
+
+def error_record(name, megapixels, error):
+    return {'method': name, 'megapixels': megapixels, 'error': f"{type(error).__name__}: {error}"}
+
+def photo_image(megapixels, seed=0):
+    """ A smooth, photo-like synthetic image, so JPEG encoding compresses it realistically """
+    width = int((megapixels * 1_000_000 * 4 / 3) ** 0.5)
+    height = int(megapixels * 1_000_000 // width)
+    y = np.linspace(0, 1, height, dtype=np.float32)[:, None]
+    x = np.linspace(0, 1, width, dtype=np.float32)[None, :]
+    noise = np.random.default_rng(seed).normal(0, 6, (height, width)).astype(np.float32)
+    channels = [128 + 100 * np.sin(6 * x + 3 * y + phase) + noise for phase in (0, 2, 4)]
+    return np.clip(np.stack(channels, axis=-1), 0, 255).astype(np.uint8)
+
+def run_mode_case(megapixels, repeat=1):
+    """
+    Compares the two ways to encrypt an encoded JPEG: pixel mode (decode,
+    aes-ctr on the pixels, save as PNG) and file mode (AEAD over the JPEG
+    bytes as-is). Records carry the output size next to the timings. A mode
+    that fails yields one record with an "error" field, as in run_case.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, 'photo.jpg')
+        try:
+            Image.fromarray(photo_image(megapixels)).save(source, quality=90)
+        except Exception as e:
+            return [error_record(name, megapixels, e) for name in ("pixel-aes-ctr", "file-aead")]
+        size = os.path.getsize(source)
+        pixel_path = os.path.join(directory, 'pixel.png')
+        file_path = os.path.join(directory, 'photo.jpg.enc')
+
+        def pixel_encrypt():
+            save_image(encrypt_image(load_image(source)[0], BENCHMARK_KEY, "aes-ctr"), pixel_path)
+
+        def pixel_decrypt():
+            save_image(decrypt_image(np.array(Image.open(pixel_path)), BENCHMARK_KEY, "aes-ctr"),
+                       os.path.join(directory, 'pixel_restored.png'))
+
+        cases = (
+            ("pixel-aes-ctr", pixel_path, pixel_encrypt, pixel_decrypt),
+            ("file-aead", file_path, lambda: encrypt_file(source, file_path, BENCHMARK_KEY),
+             lambda: decrypt_file(file_path, os.path.join(directory, 'restored.jpg'), BENCHMARK_KEY)),
+        )
+        results = []
+        for name, output_path, encrypt, decrypt in cases:
+            try:
+                records = []
+                for direction, function in (("encrypt", encrypt), ("decrypt", decrypt)):
+                    _, seconds, rss = timed(function, repeat=repeat)
+                    result = record(name, direction, megapixels, size, seconds, rss)
+                    result['output_bytes'] = os.path.getsize(output_path)
+                    records.append(result)
+                results += records
+            except Exception as e:
+                results.append(error_record(name, megapixels, e))
+        return results
+
+def run_kdf_case(iterations=100000, repeat=1, files=20):
+    """
+    generate_key does not depend on image size. It is timed as a batch of
+    `files` derivations with one password and salt, reported per file:
+    "derive" with the key cache off, "cached" with it on, where only
+    the first derivation pays for PBKDF2.
+    """
+    salt = bytes(16)
+
+    def batch(use_cache):
+        KEY_CACHE.clear()
+        for _ in range(files):
+            generate_key("benchmark-password", salt, iterations, use_cache)
+
+    results = []
+    for direction, use_cache in (("derive", False), ("cached", True)):
+        _, seconds, rss = timed(batch, use_cache, repeat=repeat)
+        results.append({'method': 'generate_key', 'direction': direction, 'megapixels': None, 'bytes': 0,
+                        'seconds': round(seconds / files, 4), 'mb_per_sec': None, 'peak_rss_mb': round(rss, 1)})
+    KEY_CACHE.clear()
+    return results
+
+def run_suite(methods=BENCHMARK_METHODS, sizes=DEFAULT_SIZES, repeat=1, include_pad=True, include_kdf=True,
+              include_modes=False):
+    """
+    Runs every case in its own spawned process and yields the records as
+    they finish. A case whose process dies (say, killed for memory) is
+    recorded as an error and the suite goes on.
+    """
+    cases = []
+    if include_kdf:
+        cases.append(("generate_key", None, run_kdf_case, (100000, repeat)))
+    cases += [(method, megapixels, run_case, (method, megapixels, repeat)) for megapixels in sizes for method in methods]
+    if include_pad:
+        cases += [("pad_image", megapixels, run_case, ("pad_image", megapixels, repeat)) for megapixels in sizes]
+    if include_modes:
+        cases += [("modes", megapixels, run_mode_case, (megapixels, repeat)) for megapixels in sizes]
+    context = get_context('spawn')
+    for name, megapixels, function, args in cases:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            try:
+                records = pool.submit(function, *args).result()
+            except BrokenProcessPool as e:
+                records = [error_record(name, megapixels, e)]
+        yield from records
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+# Module 3: Baseline comparison
+def _case_key(result):
+    return (result['method'], result.get('direction'), result['megapixels'])
+
+def compare(results, baseline, tolerance=0.10):
+    """
+    Compares results with a baseline run and returns the regressions: cases
+    whose time or peak RSS grew by more than `tolerance` (a fraction), or
+    that now fail although the baseline succeeded.
+    """
+    previous = {_case_key(result): result for result in baseline['results'] if 'error' not in result}
+    passed = {(key[0], key[2]) for key in previous}
+    regressions = []
+    for result in results:
+        if 'error' in result:
+            if (result['method'], result['megapixels']) in passed:
+                regressions.append(dict(result, metric='error'))
+            continue
+        old = previous.get(_case_key(result))
+        if old is None:
+            continue
+        for metric in ('seconds', 'peak_rss_mb', 'output_bytes'):
+            if old.get(metric) and result.get(metric) is not None and result[metric] > old[metric] * (1 + tolerance):
+                regressions.append({
+                    'method': result['method'],
+                    'direction': result['direction'],
+                    'megapixels': result['megapixels'],
+                    'metric': metric,
+                    'baseline': old[metric],
+                    'current': result[metric],
+                    'change': round(result[metric] / old[metric] - 1, 4),
+                })
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless benchmark of the Image_Encrypt methods.")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="image sizes in megapixels (default: 1,10,50,200)")
+    parser.add_argument('--methods', default=','.join(BENCHMARK_METHODS), help="methods to run (default: all)")
+    parser.add_argument('--repeat', type=int, default=1, help="runs per case, best time kept (default: 1)")
+    parser.add_argument('--no-pad', action='store_true', help="skip the pad_image cases")
+    parser.add_argument('--no-kdf', action='store_true', help="skip the generate_key case")
+    parser.add_argument('--modes', action='store_true',
+                        help="also compare output size and time of pixel mode and file (AEAD) mode on JPEGs")
+    parser.add_argument('-o', '--output', help="write the results to this JSON file")
+    parser.add_argument('--baseline', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help="allowed slowdown or memory growth before flagging (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    methods = args.methods.split(',')
+    unknown = set(methods) - set(BENCHMARK_METHODS)
+    if unknown:
+        parser.error(f"Unknown methods: {', '.join(sorted(unknown))}")
+    try:
+        sizes = [float(size) if '.' in size else int(size) for size in args.sizes.split(',')]
+        baseline = None
+        if args.baseline:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    results = []
+    for result in run_suite(methods, sizes, args.repeat, not args.no_pad, not args.no_kdf, args.modes):
+        results.append(result)
+        size = '-' if result['megapixels'] is None else f"{result['megapixels']} MP"
+        if 'error' in result:
+            print(f"{result['method']:<13} {size:>8}  error: {result['error']}")
+        else:
+            rate = f"{result['mb_per_sec']:,.1f} MB/s" if result['mb_per_sec'] else '-'
+            print(f"{result['method']:<13} {result['direction']:<8} {size:>8}  {result['seconds']:8.3f}s  "
+                  f"{rate:>14}  peak {result['peak_rss_mb']:,.0f} MB"
+                  + (f"  {result['bytes'] / 1e6:,.2f} -> {result['output_bytes'] / 1e6:,.2f} MB"
+                     if 'output_bytes' in result else ''))
+
+    report = {'environment': environment(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if baseline is None:
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        if regression['metric'] == 'error':
+            print(f"REGRESSION {regression['method']} {regression['megapixels']} MP now fails: {regression['error']}")
+        else:
+            print(f"REGRESSION {regression['method']} {regression['direction']} {regression['megapixels']} MP "
+                  f"{regression['metric']}: {regression['baseline']} -> {regression['current']} "
+                  f"({regression['change']:+.0%})")
+    print(f"{len(regressions)} regressions against {args.baseline}", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
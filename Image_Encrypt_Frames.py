@@ -0,0 +1,188 @@
+import argparse
+import hashlib
+import os
+import queue
+import re
+import sys
+import threading
+import time
+import numpy as np
+from PIL import Image, ImageSequence
+from Image_Encrypt import aes_ctr_encrypt, aes_ctr_decrypt, feistel_apply
+from Image_Encrypt_Batch import batch_key
+
+FRAME_METHODS = ("feistel", "aes-ctr")
+FRAME_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.gif')
+_DONE = object()
+
+# Module 1: Frame sources
+def _natural_key(filename):
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', filename)]
+
+def frame_index(filename):
+    """ Returns the frame number in a name like frame_000042.png """
+    numbers = re.findall(r'\d+', os.path.basename(filename))
+    if not numbers:
+        raise ValueError(f"No frame number in {filename}")
+    return int(numbers[-1])
+
+def iter_frames(source, decrypt=False):
+    """
+    Yields (index, array) for every frame of a directory of numbered frames,
+    a multi-page TIFF or an animated GIF, one frame at a time. Frames to be
+    encrypted are converted to RGB. Encrypted frames are read as stored and
+    take their index from the file name.
+    """
+    if os.path.isdir(source):
+        names = sorted((name for name in os.listdir(source) if name.lower().endswith(FRAME_EXTENSIONS)),
+                       key=_natural_key)
+        for position, name in enumerate(names):
+            with Image.open(os.path.join(source, name)) as image:
+                if decrypt:
+                    yield frame_index(name), np.array(image)
+                else:
+                    yield position, np.array(image.convert('RGB'))
+    else:
+        with Image.open(source) as image:
+            for position, frame in enumerate(ImageSequence.Iterator(image)):
+                yield position, np.array(frame if decrypt else frame.convert('RGB'))
+
+# Module 2: Per-frame keys
+def frame_key(key, index):
+    """ Feistel key for one frame: the sequence key extended by the frame index """
+    return key + index.to_bytes(8, 'little')
+
+def frame_nonce(key, seed, index):
+    """
+    AES-CTR nonce for one frame, from the sequence key, a random per-run
+    seed and the frame index. The seed keeps two runs under the same key
+    from reusing a keystream; the nonce is stored in the frame's nonce rows,
+    so decryption needs neither the seed nor the index.
+    """
+    return hashlib.blake2b(seed + index.to_bytes(8, 'little'), key=key[:64], digest_size=16,
+                           person=b'img-frame').digest()
+
+def process_frame(index, frame, key, method, decrypt=False, seed=b''):
+    if method == "feistel":
+        return feistel_apply(frame, frame_key(key, index), inverse=decrypt)
+    if method == "aes-ctr":
+        if decrypt:
+            return aes_ctr_decrypt(frame, key, workers=1)
+        return aes_ctr_encrypt(frame, key, workers=1, nonce=frame_nonce(key, seed, index))
+    raise ValueError(f"Unsupported frame method: {method}")
+
+# Module 3: Pipeline
+def run_pipeline(source, output_dir, key, method="feistel", decrypt=False, workers=None, depth=4):
+    """
+    Streams a frame sequence through three stages connected by bounded
+    queues: one decode thread, `workers` cipher threads (NumPy and the AES
+    backend release the GIL) and one encode thread writing numbered PNGs.
+    At most about 2 * depth + workers frames are in memory at once,
+    whatever the sequence length. Returns (frames, bytes).
+    """
+    workers = workers or os.cpu_count() or 1
+    seed = os.urandom(16)
+    os.makedirs(output_dir, exist_ok=True)
+    decoded = queue.Queue(maxsize=depth)
+    encrypted = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    errors = []
+    totals = {'frames': 0, 'bytes': 0}
+
+    def put(q, item):
+        # Give up instead of blocking forever once another stage has failed
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def get(q):
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return _DONE
+
+    def guarded(stage):
+        def run():
+            try:
+                stage()
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+        return run
+
+    def decode():
+        try:
+            for item in iter_frames(source, decrypt):
+                if not put(decoded, item):
+                    return
+        finally:
+            for _ in range(workers):
+                put(decoded, _DONE)
+
+    def cipher():
+        try:
+            while True:
+                item = get(decoded)
+                if item is _DONE:
+                    return
+                index, frame = item
+                if not put(encrypted, (index, frame.nbytes, process_frame(index, frame, key, method, decrypt, seed))):
+                    return
+        finally:
+            put(encrypted, _DONE)
+
+    def encode():
+        finished = 0
+        while finished < workers:
+            item = get(encrypted)
+            if item is _DONE:
+                finished += 1
+                continue
+            index, nbytes, frame = item
+            Image.fromarray(frame).save(os.path.join(output_dir, f"frame_{index:06d}.png"))
+            totals['frames'] += 1
+            totals['bytes'] += nbytes
+
+    threads = [threading.Thread(target=guarded(decode))]
+    threads += [threading.Thread(target=guarded(cipher)) for _ in range(workers)]
+    threads.append(threading.Thread(target=guarded(encode)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return totals['frames'], totals['bytes']
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Encrypt frame sequences, multi-page TIFFs and animated GIFs.")
+    parser.add_argument('input_dir', metavar='source', help="directory of numbered frames, multi-page TIFF or animated GIF")
+    parser.add_argument('output_dir', help="directory for the numbered PNG output frames")
+    parser.add_argument('-m', '--method', default='feistel', choices=FRAME_METHODS)
+    parser.add_argument('-d', '--decrypt', action='store_true', help="decrypt a directory of encrypted frames")
+    parser.add_argument('--key-file', help="key file written by the GUI or save_key")
+    parser.add_argument('--password', help="derive the key from a password (prompted if neither option is given)")
+    parser.add_argument('--workers', type=int, help="cipher threads (default: CPU count)")
+    parser.add_argument('--depth', type=int, default=4, help="frames buffered between stages (default: 4)")
+    args = parser.parse_args(argv)
+
+    try:
+        key = batch_key(args)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    frames, total = run_pipeline(args.input_dir, args.output_dir, key, args.method, args.decrypt, args.workers, args.depth)
+    elapsed = time.perf_counter() - start
+    rate = frames / elapsed if elapsed > 0 else 0.0
+    print(f"{frames} frames ({total / 1e6:,.1f} MB) in {elapsed:.2f}s - {rate:.1f} frames/sec", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+import argparse
+import json
+import mmap
+import os
+import random
+import string
+import sys
+import time
+from array import array
+from bisect import bisect_left
+
+# Bump FORMAT_VERSION whenever SECTIONS change; it is written both as the
+# byte after ACBLK in the magic and as "version" in the JSON header
+FORMAT_VERSION = 2
+INDEX_MAGIC = b'ACBLK' + bytes([FORMAT_VERSION, 0, 0])
+HEADER_SIZE = 4096
+
+# Aho-Corasick automaton over the UTF-8 bytes of the lowercased blocklist.
+# Nodes are numbered breadth-first with each level in lexicographic order, so
+# the children of a node are the contiguous ids first_child[u] to
+# first_child[u + 1] - 1, sorted by label, and need no edge table. Every array
+# is flat and fixed-width (about 17 bytes per trie node), so a saved index is
+# used straight from a read-only memory map without parsing.
+SECTIONS = (
+    ('first_child', 'I'),   # per node + 1: id of the node's first child
+    ('label', 'B'),         # per node: byte on the edge from its parent
+    ('fail', 'I'),          # per node: longest proper suffix that is also a node
+    ('word_id', 'i'),       # per node: blocked word ending here, or -1
+    ('out_link', 'i'),      # per node: nearest node on the fail chain that ends a word, or -1
+    ('word_offsets', 'I'),  # per word + 1: offsets into word_bytes
+    ('word_bytes', 'B'),    # the blocked words, concatenated
+    ('word_rank', 'I'),     # per word: 1-based position in the source list (lists are usually most common first)
+)
+
+def _normalize(word):
+    return word.strip().lower().encode('utf-8')
+
+def build_arrays(words):
+    """ Compiles an iterable of words into the automaton's flat arrays """
+    ranks = {}
+    for word in map(_normalize, words):
+        if word and word not in ranks:
+            ranks[word] = len(ranks) + 1
+    words = sorted(ranks)
+    word_ids = {word: i for i, word in enumerate(words)}
+    label = array('B', [0])
+    parent = array('I', [0])
+    word_id = array('i', [-1])
+    child_count = array('I', [0])
+
+    # Pass 1: one level of the trie per depth, from the sorted words
+    previous = {b'': 0}
+    active = words
+    depth = 1
+    while active:
+        active = [word for word in active if len(word) >= depth]
+        level = {}
+        last = None
+        for word in active:
+            prefix = word[:depth]
+            if prefix == last:
+                continue
+            last = prefix
+            node = len(label)
+            level[prefix] = node
+            up = previous[prefix[:-1]]
+            child_count[up] += 1
+            label.append(prefix[-1])
+            parent.append(up)
+            word_id.append(word_ids.get(prefix, -1))
+            child_count.append(0)
+        previous = level
+        depth += 1
+
+    nodes = len(label)
+    first_child = array('I', [1])
+    for count in child_count:
+        first_child.append(first_child[-1] + count)
+
+    # Pass 2: failure and output links, breadth-first so parents are done first
+    fail = array('I', bytes(4 * nodes))
+    out_link = array('i', [-1]) * nodes
+    for node in range(1, nodes):
+        up = parent[node]
+        if up:
+            byte = label[node]
+            state = fail[up]
+            while True:
+                child = _child(first_child, label, state, byte)
+                if child >= 0 or state == 0:
+                    break
+                state = fail[state]
+            fail[node] = child if child >= 0 else 0
+        target = fail[node]
+        out_link[node] = target if word_id[target] >= 0 else out_link[target]
+
+    word_offsets = array('I', [0])
+    for word in words:
+        word_offsets.append(word_offsets[-1] + len(word))
+    return {
+        'first_child': first_child,
+        'label': label,
+        'fail': fail,
+        'word_id': word_id,
+        'out_link': out_link,
+        'word_offsets': word_offsets,
+        'word_bytes': array('B', b''.join(words)),
+        'word_rank': array('I', [ranks[word] for word in words]),
+    }
+
+def _child(first_child, label, node, byte):
+    lo, hi = first_child[node], first_child[node + 1]
+    i = bisect_left(label, byte, lo, hi)
+    return i if i < hi and label[i] == byte else -1
+
+class BlocklistIndex:
+    """
+    Multi-pattern substring index: matches() finds every blocked word inside
+    a password in O(len(password)) steps, whatever the size of the list.
+    """
+    def __init__(self, arrays, source=None):
+        self.arrays = arrays
+        self.source = source
+        for name, _ in SECTIONS:
+            setattr(self, name, arrays[name])
+        self.nodes = len(self.label)
+        self.words = len(self.word_offsets) - 1
+
+    @classmethod
+    def from_words(cls, words):
+        return cls(build_arrays(words))
+
+    @classmethod
+    def from_wordlist(cls, filepath):
+        """ Builds from a text file with one blocked word per line """
+        with open(filepath, encoding='utf-8', errors='surrogateescape') as f:
+            return cls.from_words(line for line in f)
+
+    def save(self, filepath):
+        """ Writes the arrays after a JSON header of section offsets, each section 8-byte aligned """
+        sections = {}
+        offset = HEADER_SIZE
+        for name, typecode in SECTIONS:
+            nbytes = len(self.arrays[name]) * array(typecode).itemsize
+            sections[name] = [offset, nbytes, typecode]
+            offset += -(-nbytes // 8) * 8
+        header = json.dumps({'version': FORMAT_VERSION, 'nodes': self.nodes, 'words': self.words,
+                             'sections': sections}).encode()
+        if len(INDEX_MAGIC) + 4 + len(header) > HEADER_SIZE:
+            raise ValueError("Index header does not fit")
+        temp_path = filepath + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(INDEX_MAGIC + len(header).to_bytes(4, 'little') + header)
+            for name, _ in SECTIONS:
+                start, nbytes, _ = sections[name]
+                f.seek(start)
+                f.write(memoryview(self.arrays[name]).cast('B'))
+            f.truncate(offset)
+        os.replace(temp_path, filepath)
+
+    @classmethod
+    def load(cls, filepath):
+        """ Memory-maps a saved index; pages are read lazily as lookups touch them """
+        with open(filepath, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic = mapped[:len(INDEX_MAGIC)]
+        if magic[:5] != INDEX_MAGIC[:5]:
+            mapped.close()
+            raise ValueError(f"{filepath} is not a blocklist index")
+        length = int.from_bytes(mapped[len(INDEX_MAGIC):len(INDEX_MAGIC) + 4], 'little')
+        try:
+            header = json.loads(mapped[len(INDEX_MAGIC) + 4:len(INDEX_MAGIC) + 4 + length])
+        except ValueError:
+            header = {}
+        if magic != INDEX_MAGIC or header.get('version') != FORMAT_VERSION:
+            mapped.close()
+            raise ValueError(f"{filepath} is not a format {FORMAT_VERSION} blocklist index "
+                             f"(magic version {magic[5]}, header version {header.get('version')}); rebuild the index")
+        view = memoryview(mapped)
+        arrays = {name: view[start:start + nbytes].cast(typecode)
+                  for name, (start, nbytes, typecode) in header['sections'].items()}
+        index = cls(arrays, source=mapped)
+        return index
+
+    def close(self):
+        if self.source is not None:
+            for name, _ in SECTIONS:
+                getattr(self, name).release()
+            self.source.close()
+            self.source = None
+
+    def word(self, word_id):
+        start, end = self.word_offsets[word_id], self.word_offsets[word_id + 1]
+        return bytes(self.word_bytes[start:end]).decode('utf-8', 'surrogateescape')
+
+    def rank(self, word_id):
+        return self.word_rank[word_id]
+
+    def step(self, state, byte):
+        """ Advances the automaton by one byte of lowercased UTF-8; state 0 is the start """
+        first_child, label, fail = self.first_child, self.label, self.fail
+        while True:
+            lo, hi = first_child[state], first_child[state + 1]
+            child = bisect_left(label, byte, lo, hi)
+            if child < hi and label[child] == byte:
+                return child
+            if state == 0:
+                return 0
+            state = fail[state]
+
+    def words_ending(self, state):
+        """ Yields the ids of the blocked words that end at this state """
+        word_id, out_link = self.word_id, self.out_link
+        node = state if word_id[state] >= 0 else out_link[state]
+        while node >= 0:
+            yield word_id[node]
+            node = out_link[node]
+
+    def matches(self, password):
+        """ Returns the blocked words found anywhere in the password (case-insensitive), in order found """
+        first_child, label, fail = self.first_child, self.label, self.fail
+        word_id, out_link = self.word_id, self.out_link
+        found = []
+        state = 0
+        # step() and words_ending() inlined: this is the hot loop of bulk audits
+        for byte in password.lower().encode('utf-8', 'surrogateescape'):
+            while True:
+                lo, hi = first_child[state], first_child[state + 1]
+                child = bisect_left(label, byte, lo, hi)
+                if child < hi and label[child] == byte:
+                    state = child
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+            node = state if word_id[state] >= 0 else out_link[state]
+            while node >= 0:
+                found.append(word_id[node])
+                node = out_link[node]
+        return [self.word(i) for i in dict.fromkeys(found)]
+
+    def __contains__(self, password):
+        return bool(self.matches(password))
+
+def random_words(count, seed=0):
+    """ Synthetic blocklist for benchmarks: lowercase words of 4-12 letters and digits """
+    rng = random.Random(seed)
+    alphabet = string.ascii_lowercase + string.digits
+    return [''.join(rng.choices(alphabet, k=rng.randint(4, 12))) for _ in range(count)]
+
+def benchmark(words, filepath, checks=100000, seed=1):
+    """ Prints build, save, load and per-check times for an index over `words` """
+    start = time.perf_counter()
+    index = BlocklistIndex.from_words(words)
+    built = time.perf_counter()
+    index.save(filepath)
+    saved = time.perf_counter()
+    loaded_index = BlocklistIndex.load(filepath)
+    loaded = time.perf_counter()
+
+    rng = random.Random(seed)
+    passwords = [''.join(rng.choices(string.ascii_letters + string.digits + '!@#', k=rng.randint(8, 16)))
+                 for _ in range(checks)]
+    check_start = time.perf_counter()
+    hits = sum(1 for password in passwords if loaded_index.matches(password))
+    per_check = (time.perf_counter() - check_start) / checks
+    print(f"{index.words:,} words, {index.nodes:,} nodes, {os.path.getsize(filepath) / 1e6:,.1f} MB on disk")
+    print(f"build {built - start:.2f}s, save {saved - built:.3f}s, load {(loaded - saved) * 1000:.2f} ms")
+    print(f"check {per_check * 1e6:.1f} us per password ({hits:,} of {checks:,} random passwords matched)")
+    loaded_index.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile and query an Aho-Corasick password blocklist index.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="compile a wordlist (one word per line) into an index file")
+    build.add_argument('wordlist')
+    build.add_argument('index')
+    match = commands.add_parser('match', help="print the blocked words contained in each password")
+    match.add_argument('index')
+    match.add_argument('passwords', nargs='+')
+    bench = commands.add_parser('benchmark', help="time build, load and lookups")
+    bench.add_argument('--wordlist', help="wordlist to index (default: synthetic words)")
+    bench.add_argument('--words', type=int, default=200000, help="synthetic word count (default: 200000)")
+    bench.add_argument('--checks', type=int, default=100000, help="passwords to look up (default: 100000)")
+    bench.add_argument('--index', default='blocklist_benchmark.acb', help="index file to write")
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        index = BlocklistIndex.from_wordlist(args.wordlist)
+        index.save(args.index)
+        print(f"Indexed {index.words:,} words ({index.nodes:,} nodes) in {time.perf_counter() - start:.2f}s")
+    elif args.command == 'match':
+        index = BlocklistIndex.load(args.index)
+        for password in args.passwords:
+            print(f"{password}: {', '.join(index.matches(password)) or '-'}")
+        index.close()
+    else:
+        if args.wordlist:
+            with open(args.wordlist, encoding='utf-8', errors='surrogateescape') as f:
+                words = f.read().splitlines()
+        else:
+            words = random_words(args.words)
+        benchmark(words, args.index, args.checks)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+
+BREACH_MAGIC = b'SHA1IDX\x01'
+HEADER_SIZE = 4096
+DIGEST_SIZE = 20
+FANOUT_BITS = 16
+BUCKETS = 256
+
+# Index file: BREACH_MAGIC, a 4-byte header length and a JSON header padded to
+# a page, then three sections. The fan-out table holds 2**16 + 1 cumulative
+# record counts, so the records starting with a given 2-byte prefix are
+# records[fanout[p]:fanout[p + 1]]. The optional Bloom filter is a bit array
+# probed with k positions taken straight from the digest (SHA-1 output is
+# already uniform). The records are the distinct 20-byte digests, sorted.
+# Everything is read through one read-only memory map, so memory use stays
+# bounded by the pages a lookup touches, whatever the corpus size.
+
+# Module 1: Import
+def _parse_digests(lines, plaintext=False):
+    """ Turns a batch of "HEX[:COUNT]" lines (or plaintext passwords) into an (n, 20) uint8 array """
+    if plaintext:
+        raw = b''.join(hashlib.sha1(line.rstrip(b'\r\n')).digest() for line in lines)
+    else:
+        raw = bytes.fromhex(b''.join(line[:2 * DIGEST_SIZE] for line in lines if line.strip()).decode('ascii'))
+    return np.frombuffer(raw, dtype=np.uint8).reshape(-1, DIGEST_SIZE)
+
+def _bloom_positions(digests, bits, hashes):
+    """ Bloom bit positions of each digest (rows), by double hashing on two 64-bit words of the digest """
+    h1 = digests[:, 0:8].copy().view('>u8').ravel() % np.uint64(bits)
+    h2 = digests[:, 8:16].copy().view('>u8').ravel() % np.uint64(bits) | np.uint64(1)
+    steps = np.arange(hashes, dtype=np.uint64)
+    return (h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(bits)
+
+def bloom_parameters(count, bits_per_entry):
+    bits = max(64, -(-count * bits_per_entry // 64) * 64)
+    hashes = max(1, round(bits_per_entry * 0.693))
+    return bits, hashes
+
+def build_index(corpus_path, index_path, bloom_bits_per_entry=10, plaintext=False, batch_lines=1 << 20):
+    """
+    Converts a corpus of SHA-1 hashes, one "HEX" or "HEX:COUNT" per line,
+    into an index file. The corpus is first split into 256 bucket files by
+    the first digest byte; each bucket (1/256 of the corpus) is then sorted
+    and deduplicated in memory and appended to the index. The Bloom filter
+    is set through a memory map of its section of the output file, so memory
+    use is one bucket (plus the 512 KiB fan-out table) rather than the whole
+    corpus or the whole filter. Returns the record count.
+    """
+    work_dir = tempfile.mkdtemp(prefix='breach-', dir=os.path.dirname(os.path.abspath(index_path)))
+    try:
+        bucket_paths = [os.path.join(work_dir, f"{b:02x}") for b in range(BUCKETS)]
+        buckets = [open(path, 'wb') for path in bucket_paths]
+        total = 0
+        try:
+            with open(corpus_path, 'rb') as corpus:
+                while True:
+                    lines = corpus.readlines(batch_lines * (2 * DIGEST_SIZE + 8))
+                    if not lines:
+                        break
+                    digests = _parse_digests(lines, plaintext)
+                    total += len(digests)
+                    order = np.argsort(digests[:, 0], kind='stable')
+                    digests = digests[order]
+                    bounds = np.searchsorted(digests[:, 0], np.arange(BUCKETS + 1))
+                    for b in range(BUCKETS):
+                        if bounds[b] < bounds[b + 1]:
+                            buckets[b].write(digests[bounds[b]:bounds[b + 1]].tobytes())
+        finally:
+            for bucket in buckets:
+                bucket.close()
+
+        bloom_bits, bloom_hashes = bloom_parameters(total, bloom_bits_per_entry) if bloom_bits_per_entry else (0, 0)
+        fanout_bytes = 8 * ((1 << FANOUT_BITS) + 1)
+        bloom_bytes = bloom_bits // 8
+        fanout_offset = HEADER_SIZE
+        bloom_offset = fanout_offset + fanout_bytes
+        records_offset = -(-(bloom_offset + bloom_bytes) // 4096) * 4096
+
+        fanout = np.zeros((1 << FANOUT_BITS) + 1, dtype=np.uint64)
+        temp_path = index_path + '.tmp'
+        with open(temp_path, 'wb') as out:
+            out.truncate(records_offset)
+        bloom = None
+        if bloom_bytes:
+            bloom = np.memmap(temp_path, dtype=np.uint8, mode='r+', offset=bloom_offset, shape=(bloom_bytes,))
+        count = 0
+        with open(temp_path, 'r+b') as out:
+            out.seek(records_offset)
+            for path in bucket_paths:
+                records = np.fromfile(path, dtype='V20')
+                os.remove(path)
+                if not len(records):
+                    continue
+                records = np.unique(records)
+                digests = records.view(np.uint8).reshape(-1, DIGEST_SIZE)
+                prefixes = digests[:, 0].astype(np.int64) << 8 | digests[:, 1]
+                fanout[1:] += np.bincount(prefixes, minlength=1 << FANOUT_BITS).astype(np.uint64)
+                if bloom_bits:
+                    positions = _bloom_positions(digests, bloom_bits, bloom_hashes).ravel()
+                    np.bitwise_or.at(bloom, (positions >> np.uint64(3)).astype(np.int64),
+                                     (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)))
+                out.write(records.tobytes())
+                count += len(records)
+            fanout = np.cumsum(fanout, dtype=np.uint64)
+            header = json.dumps({
+                'version': 1,
+                'count': count,
+                'digest': 'sha1',
+                'fanout_bits': FANOUT_BITS,
+                'bloom': {'bits': bloom_bits, 'hashes': bloom_hashes},
+                'sections': {
+                    'fanout': [fanout_offset, fanout_bytes],
+                    'bloom': [bloom_offset, bloom_bytes],
+                    'records': [records_offset, count * DIGEST_SIZE],
+                },
+            }).encode()
+            out.seek(0)
+            out.write(BREACH_MAGIC + len(header).to_bytes(4, 'little') + header)
+            out.seek(fanout_offset)
+            out.write(fanout.tobytes())
+        if bloom is not None:
+            bloom.flush()
+            del bloom  # unmap before the rename
+        os.replace(temp_path, index_path)
+        return count
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+# Module 2: Lookup
+class BreachIndex:
+    """ Memory-mapped membership test over a sorted SHA-1 index built by build_index """
+    def __init__(self, filepath):
+        with open(filepath, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.map[:len(BREACH_MAGIC)] != BREACH_MAGIC:
+            self.map.close()
+            raise ValueError(f"{filepath} is not a breach index")
+        length = int.from_bytes(self.map[len(BREACH_MAGIC):len(BREACH_MAGIC) + 4], 'little')
+        self.header = json.loads(self.map[len(BREACH_MAGIC) + 4:len(BREACH_MAGIC) + 4 + length])
+        self.count = self.header['count']
+        self.bloom_bits = self.header['bloom']['bits']
+        self.bloom_hashes = self.header['bloom']['hashes']
+        view = memoryview(self.map)
+        sections = self.header['sections']
+        start, nbytes = sections['fanout']
+        self.fanout = view[start:start + nbytes].cast('Q')
+        start, nbytes = sections['bloom']
+        self.bloom = view[start:start + nbytes]
+        start, nbytes = sections['records']
+        self.records = view[start:start + nbytes]
+
+    def close(self):
+        self.fanout.release()
+        self.bloom.release()
+        self.records.release()
+        self.map.close()
+
+    def _maybe_present(self, digest):
+        if not self.bloom_bits:
+            return True
+        h1 = int.from_bytes(digest[0:8], 'big') % self.bloom_bits
+        h2 = int.from_bytes(digest[8:16], 'big') % self.bloom_bits | 1
+        for i in range(self.bloom_hashes):
+            position = (h1 + i * h2) % self.bloom_bits
+            if not self.bloom[position >> 3] >> (position & 7) & 1:
+                return False
+        return True
+
+    def contains_digest(self, digest):
+        """ Binary search within the digest's 2-byte prefix range, after the Bloom filter """
+        if len(digest) != DIGEST_SIZE:
+            raise ValueError("SHA-1 digests are 20 bytes")
+        if not self._maybe_present(digest):
+            return False
+        prefix = digest[0] << 8 | digest[1]
+        lo, hi = self.fanout[prefix], self.fanout[prefix + 1]
+        records = self.records
+        while lo < hi:
+            middle = (lo + hi) // 2
+            record = records[middle * DIGEST_SIZE:(middle + 1) * DIGEST_SIZE]
+            if record == digest:
+                return True
+            if record.tobytes() < digest:
+                lo = middle + 1
+            else:
+                hi = middle
+        return False
+
+    def __contains__(self, password):
+        return self.contains_digest(hashlib.sha1(password.encode('utf-8', 'surrogateescape')).digest())
+
+def benchmark(index_path, lookups=100000, seed=0):
+    """ Prints mean lookup latency for random (almost surely absent) and present passwords """
+    index = BreachIndex(index_path)
+    rng = np.random.default_rng(seed)
+    absent = [bytes(d) for d in rng.integers(0, 256, (lookups, DIGEST_SIZE), dtype=np.uint8)]
+    picks = rng.integers(0, max(index.count, 1), min(lookups, index.count))
+    present = [index.records[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE].tobytes() for i in picks]
+    for name, digests in (("absent", absent), ("present", present)):
+        if not digests:
+            continue
+        start = time.perf_counter()
+        hits = sum(index.contains_digest(digest) for digest in digests)
+        per_lookup = (time.perf_counter() - start) / len(digests)
+        print(f"{name}: {per_lookup * 1e6:.1f} us per lookup ({hits:,} of {len(digests):,} found)")
+    index.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline breached-password index over SHA-1 hashes.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='import a corpus of "SHA1HEX[:COUNT]" lines')
+    build.add_argument('corpus')
+    build.add_argument('index')
+    build.add_argument('--bloom-bits', type=int, default=10,
+                       help="Bloom filter bits per entry, 0 to disable (default: 10, about 1%% false positives)")
+    build.add_argument('--plaintext', action='store_true', help="corpus holds plaintext passwords, one per line")
+    check = commands.add_parser('check', help="report whether each password is in the index")
+    check.add_argument('index')
+    check.add_argument('passwords', nargs='+')
+    bench = commands.add_parser('benchmark', help="time lookups against an index")
+    bench.add_argument('index')
+    bench.add_argument('--lookups', type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'build':
+            start = time.perf_counter()
+            count = build_index(args.corpus, args.index, args.bloom_bits, args.plaintext)
+            print(f"Indexed {count:,} distinct hashes in {time.perf_counter() - start:.2f}s "
+                  f"({os.path.getsize(args.index) / 1e6:,.1f} MB)")
+        elif args.command == 'check':
+            index = BreachIndex(args.index)
+            for password in args.passwords:
+                print(f"{password}: {'BREACHED' if password in index else 'not found'}")
+            index.close()
+        else:
+            benchmark(args.index, args.lookups)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,160 +1,593 @@
+import argparse
 import hashlib
+import json
+import os
+import queue
 import random
 import string
+import sys
 import threading
-import tkinter as tk
-from tkinter import filedialog, messagebox
-from tkinter import ttk  # Import ttk for Progressbar
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+SYMBOLS = r"!@#$%^&*()_+-=[]{};':,./<>?"
+
+# Character classes in enumeration order
+CHARACTER_CLASSES = (string.ascii_lowercase, string.ascii_uppercase, string.digits, SYMBOLS)
+
+DICTIONARY_SIZE = 10_000
+REFRESH_MS = 250
+
+# Supported target algorithms, told apart by digest length
+ALGORITHMS = {'md5': hashlib.md5, 'sha1': hashlib.sha1, 'sha256': hashlib.sha256}
+ALGORITHM_BY_SIZE = {constructor().digest_size: name for name, constructor in ALGORITHMS.items()}
 
 # Function to hash the password
 def hash_password(password):
     return hashlib.md5(password.encode()).hexdigest()
 
-# Function to generate password candidates with randomized order
-def generate_candidates(num_small, num_capital, num_digits, num_symbols):
-    # Define character sets
-    small_letters = string.ascii_lowercase
-    capital_letters = string.ascii_uppercase
-    digits = string.digits
-    symbols = r"!@#$%^&*()_+-=[]{};':,./<>?"
+# Module 1: Keyspace enumeration
+class Keyspace:
+    """
+    Every password made of exactly the given number of lowercase letters,
+    capitals, digits and symbols, each numbered 0 to size - 1. Index i is
+    split into a layout (which class sits at each position, ranked among
+    all arrangements of the class counts) and a fill (the characters, read
+    as a mixed-radix number with the last position fastest), so candidate(i)
+    needs no state and any index range can be enumerated on its own.
+    """
+    def __init__(self, num_small, num_capital, num_digits, num_symbols):
+        self.counts = (num_small, num_capital, num_digits, num_symbols)
+        if min(self.counts) < 0 or not sum(self.counts):
+            raise ValueError("Specify a non-negative count for each character class, at least one above zero")
+        self.length = sum(self.counts)
+        # Multinomial coefficient: arrangements of the classes over the positions
+        self.layouts = 1
+        placed = 0
+        for count in self.counts:
+            for k in range(1, count + 1):
+                placed += 1
+                self.layouts = self.layouts * placed // k
+        self.fills = 1
+        for alphabet, count in zip(CHARACTER_CLASSES, self.counts):
+            self.fills *= len(alphabet) ** count
+        self.size = self.layouts * self.fills
+
+    def layout(self, layout_index):
+        """ Alphabet of each position for the layout with this rank """
+        counts = list(self.counts)
+        arrangements = self.layouts
+        alphabets = []
+        for remaining in range(self.length, 0, -1):
+            for c, count in enumerate(counts):
+                if not count:
+                    continue
+                # Arrangements of the remaining positions that start with class c
+                block = arrangements * count // remaining
+                if layout_index < block:
+                    alphabets.append(CHARACTER_CLASSES[c])
+                    counts[c] -= 1
+                    arrangements = block
+                    break
+                layout_index -= block
+        return alphabets
+
+    def _digits(self, alphabets, fill):
+        digits = []
+        for alphabet in reversed(alphabets):
+            fill, digit = divmod(fill, len(alphabet))
+            digits.append(digit)
+        digits.reverse()
+        return digits
 
-    # Generate random password candidates
-    candidates = []
-    for _ in range(10_000):  # Generate 10,000 random candidates
-        password = []
+    def candidate(self, index):
+        """ The index-th password of the keyspace """
+        if not 0 <= index < self.size:
+            raise IndexError("Keyspace index out of range")
+        layout_index, fill = divmod(index, self.fills)
+        alphabets = self.layout(layout_index)
+        return ''.join(alphabet[d] for alphabet, d in zip(alphabets, self._digits(alphabets, fill)))
 
-        # Generate small letters
-        password.extend(random.sample(small_letters, num_small))
+    def candidates(self, start=0, stop=None):
+        """ Lazily yields candidate(start) to candidate(stop - 1), in index order """
+        stop = self.size if stop is None else min(stop, self.size)
+        index = start
+        while index < stop:
+            layout_index, fill = divmod(index, self.fills)
+            alphabets = self.layout(layout_index)
+            digits = self._digits(alphabets, fill)
+            remaining = min(stop - index, self.fills - fill)
+            index += remaining
+            # Odometer over the fill: the last position runs through its
+            # alphabet under a fixed prefix, then the carry moves the prefix
+            last = alphabets[-1]
+            while remaining:
+                prefix = ''.join(alphabet[d] for alphabet, d in zip(alphabets, digits[:-1]))
+                run = last[digits[-1]:digits[-1] + remaining]
+                for character in run:
+                    yield prefix + character
+                remaining -= len(run)
+                digits[-1] = 0
+                position = len(digits) - 2
+                while position >= 0:
+                    digits[position] += 1
+                    if digits[position] < len(alphabets[position]):
+                        break
+                    digits[position] = 0
+                    position -= 1
 
-        # Generate capital letters
-        password.extend(random.sample(capital_letters, num_capital))
+# Function to save generated candidates to a file
+def save_candidates_to_file(candidates, filename):
+    """ Writes candidates one per line; returns the number written """
+    count = 0
+    with open(filename, 'w') as file:
+        for candidate in candidates:
+            file.write(candidate + '\n')
+            count += 1
+    return count
 
-        # Generate digits
-        password.extend(random.sample(digits, num_digits))
+# Module 2: Target hashes
+class TargetSet:
+    """
+    Hashes to search for, as raw digest bytes in one dict per algorithm, so a
+    candidate costs one hash per algorithm and one O(1) lookup per hash
+    whatever the number of targets. Targets sharing a digest share an entry.
+    """
+    def __init__(self):
+        self.tables = {}
+        self.ids = set()
 
-        # Generate symbols
-        password.extend(random.sample(symbols, num_symbols))
+    def add(self, target_id, hex_digest):
+        """ Adds one target; the algorithm follows from the digest length """
+        try:
+            digest = bytes.fromhex(hex_digest.strip())
+        except ValueError:
+            digest = b''
+        algorithm = ALGORITHM_BY_SIZE.get(len(digest))
+        if algorithm is None:
+            raise ValueError(f"{target_id}: expected an MD5, SHA-1 or SHA-256 hex digest")
+        table = self.tables.setdefault(algorithm, {})
+        table[digest] = table.get(digest, ()) + (target_id,)
+        self.ids.add(target_id)
 
-        # Shuffle the password characters
-        random.shuffle(password)
+    @classmethod
+    def from_hashes(cls, hashes):
+        """ Targets identified by their own hex digest """
+        targets = cls()
+        for hex_digest in hashes:
+            targets.add(hex_digest.strip(), hex_digest)
+        return targets
 
-        # Join the characters to form the password string
-        candidates.append(''.join(password))
+    @classmethod
+    def from_file(cls, filepath):
+        """ One "ID:HEX" or "HEX" per line (ID defaults to the line number), as in most hash dumps """
+        targets = cls()
+        with open(filepath, encoding='utf-8', errors='surrogateescape') as f:
+            for number, line in enumerate(f, 1):
+                line = line.strip()
+                if line:
+                    target_id, _, hex_digest = line.rpartition(':')
+                    targets.add(target_id or str(number), hex_digest)
+        return targets
 
-    return candidates
+    def __len__(self):
+        return len(self.ids)
 
-# Function to save generated candidates to a file
-def save_candidates_to_file(candidates, filename):
+    def fingerprint(self):
+        """ SHA-256 over the sorted digests and their ids, to tie a checkpoint to its target set """
+        h = hashlib.sha256()
+        for name in sorted(self.tables):
+            h.update(name.encode())
+            for digest in sorted(self.tables[name]):
+                h.update(digest)
+                for target_id in sorted(set(self.tables[name][digest])):
+                    encoded = target_id.encode('utf-8', 'surrogateescape')
+                    h.update(len(encoded).to_bytes(4, 'little') + encoded)
+        return h.hexdigest()
+
+# Module 3: Progress and checkpoints
+def format_duration(seconds):
+    if seconds is None:
+        return "unknown"
+    if seconds >= 365.25 * 86400:
+        return f"{seconds / (365.25 * 86400):,.0f} years"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    return f"{days}d {hours:02}:{minutes:02}:{seconds:02}" if days else f"{hours:02}:{minutes:02}:{seconds:02}"
+
+class ProgressMeter:
+    """ Hash rate over a sliding window of recent batches, and the ETA it gives for the rest of the keyspace """
+    def __init__(self, total, done=0, hashes_per_candidate=1, window=10.0):
+        self.total = total
+        self.done = done
+        self.hashes_per_candidate = hashes_per_candidate
+        self.window = window
+        self.samples = deque([(time.monotonic(), done)])
+
+    def update(self, done):
+        now = time.monotonic()
+        self.done = done
+        self.samples.append((now, done))
+        while len(self.samples) > 2 and now - self.samples[1][0] >= self.window:
+            self.samples.popleft()
+
+    def rate(self):
+        """ Candidates per second """
+        (t0, d0), (t1, d1) = self.samples[0], self.samples[-1]
+        return (d1 - d0) / (t1 - t0) if t1 > t0 else 0.0
+
+    def eta(self):
+        rate = self.rate()
+        return (self.total - self.done) / rate if rate else None
+
+    def status(self):
+        return (f"{self.done * 100 / self.total:.2f}% of {self.total:,} - "
+                f"{self.rate() * self.hashes_per_candidate:,.0f} hashes/sec - ETA {format_duration(self.eta())}")
+
+class Checkpoint:
+    """
+    JSON file holding the search cursor and the targets found, written to a
+    temporary file and renamed so a crash never leaves it half-written. It
+    records the class counts and a fingerprint of the targets, and refuses
+    to resume a different search.
+    """
+    def __init__(self, filepath, keyspace, targets, interval=60.0):
+        self.filepath = filepath
+        self.search = {'counts': list(keyspace.counts), 'targets': targets.fingerprint()}
+        self.interval = interval
+        self.saved = time.monotonic()
+
+    def load(self):
+        """ Returns (cursor, found) to resume from; (0, {}) without a checkpoint file """
+        if not os.path.exists(self.filepath):
+            return 0, {}
+        with open(self.filepath, encoding='utf-8') as f:
+            state = json.load(f)
+        if {key: state.get(key) for key in self.search} != self.search:
+            raise ValueError(f"{self.filepath} is a checkpoint of a different keyspace or target set")
+        return state['cursor'], {target_id: tuple(hit) for target_id, hit in state['found'].items()}
+
+    def save(self, cursor, found):
+        temp_path = self.filepath + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(self.search, version=1, cursor=cursor, found=found), f)
+        os.replace(temp_path, self.filepath)
+        self.saved = time.monotonic()
+
+    def update(self, cursor, found):
+        """ Saves if `interval` seconds have passed since the last save """
+        if time.monotonic() - self.saved >= self.interval:
+            self.save(cursor, found)
+
+    def remove(self):
+        """ Deletes the checkpoint file once its search has finished """
+        if os.path.exists(self.filepath):
+            os.remove(self.filepath)
+
+# Module 4: Parallel search
+_TARGETS = None
+
+def _init_worker(targets):
+    """ Installs the target tables once per worker process instead of once per batch """
+    global _TARGETS
+    _TARGETS = [(name, ALGORITHMS[name], table) for name, table in targets.tables.items()]
+
+def _crack_range(counts, start, stop):
+    """ Worker task: hashes one contiguous index range, returns (target id, algorithm, password) hits """
+    hits = []
+    groups = _TARGETS
+    for candidate in Keyspace(*counts).candidates(start, stop):
+        data = candidate.encode()
+        for name, constructor, table in groups:
+            target_ids = table.get(constructor(data).digest())
+            if target_ids:
+                hits.extend((target_id, name, candidate) for target_id in target_ids)
+    return hits
+
+def dictionary_attack(targets, keyspace, workers=None, batch_size=100_000, progress=None, on_hit=None,
+                      checkpoint=None):
+    """
+    Searches the keyspace for every target. Workers enumerate and hash
+    index ranges of `batch_size` candidates themselves, so only (start,
+    stop) pairs and hits cross processes, and at most 2 * workers ranges
+    are queued. Ranges are collected in order, so every index below the
+    cursor has been hashed;
+    a checkpoint saves the cursor and the targets found, and a later call
+    with the same checkpoint resumes from there. progress(cursor, total) is
+    called at the start and once per batch, on_hit(target_id, algorithm,
+    password) for each new target found. Stops early once every target is
+    found; returns {target_id: (algorithm, password)}. If a worker raises,
+    the queued ranges are cancelled, the checkpoint is saved at the last
+    completed range and the exception propagates.
+    """
+    if not len(targets):
+        raise ValueError("No target hashes given")
+    cursor, found = checkpoint.load() if checkpoint else (0, {})
+    batches = ((start, min(start + batch_size, keyspace.size)) for start in range(cursor, keyspace.size, batch_size))
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = 2 * workers
+    if progress:
+        progress(cursor, keyspace.size)
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(targets,))
     try:
-        with open(filename, 'w') as file:
-            for candidate in candidates:
-                file.write(candidate + '\n')
-        messagebox.showinfo("Success", f"Dictionary saved to {filename}")
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to save dictionary: {e}")
-
-# Function to crack the hashed password using dictionary attack
-def dictionary_attack(hashed_password, num_small, num_capital, num_digits, num_symbols, progress_var):
+        in_flight = []
+        while len(found) < len(targets):
+            for start, stop in islice(batches, max_in_flight - len(in_flight)):
+                in_flight.append((stop, pool.submit(_crack_range, keyspace.counts, start, stop)))
+            if not in_flight:
+                break
+            stop, future = in_flight.pop(0)
+            for target_id, algorithm, password in future.result():
+                if target_id not in found:
+                    found[target_id] = (algorithm, password)
+                    if on_hit:
+                        on_hit(target_id, algorithm, password)
+            cursor = stop
+            if checkpoint:
+                checkpoint.update(cursor, found)
+            if progress:
+                progress(cursor, keyspace.size)
+        return found
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        if checkpoint:
+            checkpoint.save(cursor, found)
+
+def random_targets(count, algorithm='md5', seed=0):
+    """ Synthetic targets for benchmarks: random digests, almost surely matching nothing """
+    rng = random.Random(seed)
+    size = ALGORITHMS[algorithm]().digest_size
+    targets = TargetSet()
+    for i in range(count):
+        targets.add(str(i), rng.randbytes(size).hex())
+    return targets
+
+def benchmark(keyspace, target_counts=(1, 1000, 1_000_000), candidates=500_000, algorithm='md5'):
+    """ Prints single-process hashing throughput over the same candidates for growing target sets """
+    for count in target_counts:
+        targets = random_targets(count, algorithm)
+        _init_worker(targets)
+        start = time.perf_counter()
+        _crack_range(keyspace.counts, 0, candidates)
+        elapsed = time.perf_counter() - start
+        print(f"{count:>9,} {algorithm} targets: {min(candidates, keyspace.size) / elapsed:,.0f} hashes/sec")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exhaustive hash search over a keyspace of class counts.")
+    parser.add_argument('hashes', nargs='*', help="MD5, SHA-1 or SHA-256 hex digests to search for")
+    parser.add_argument('-t', '--targets', metavar='FILE', help='hash dump with one "ID:HEX" or "HEX" per line')
+    parser.add_argument('-l', '--lower', type=int, default=0, help="number of lowercase letters")
+    parser.add_argument('-u', '--upper', type=int, default=0, help="number of capital letters")
+    parser.add_argument('-d', '--digits', type=int, default=0, help="number of digits")
+    parser.add_argument('-s', '--symbols', type=int, default=0, help="number of symbols")
+    parser.add_argument('--dictionary', metavar='FILE', help="write the keyspace to FILE, one candidate per line")
+    parser.add_argument('--limit', type=int, help="with --dictionary, write only the first LIMIT candidates")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--batch-size', type=int, default=100_000, help="candidates per worker task (default: 100000)")
+    parser.add_argument('--checkpoint', metavar='FILE', help="save the search cursor to FILE and resume from it")
+    parser.add_argument('--checkpoint-interval', type=float, default=60, help="seconds between checkpoints (default: 60)")
+    parser.add_argument('--benchmark', action='store_true', help="time hashing against 1, 1k and 1M random targets")
+    args = parser.parse_args(argv)
+    if not args.hashes and not args.targets and not args.dictionary and not args.benchmark:
+        parser.error("give hashes to search for, --targets FILE, --dictionary FILE or --benchmark")
+
     try:
-        candidates = generate_candidates(num_small, num_capital, num_digits, num_symbols)
-        total_candidates = len(candidates)
-        for i, password in enumerate(candidates):
-            if hash_password(password) == hashed_password:
-                progress_var.set(100)  # Set progress to 100% when password found
-                return password
-            progress_var.set((i + 1) * 100 // total_candidates)  # Update progress percentage
-    except Exception as e:
-        messagebox.showerror("Error", f"Dictionary attack error: {e}")
-
-    progress_var.set(100)  # Set progress to 100% if no password found
-    return None
-
-# Function to handle start button click
-def on_start():
-    num_small = int(small_letters_var.get() or 0)
-    num_capital = int(capital_letters_var.get() or 0)
-    num_digits = int(digits_var.get() or 0)
-    num_symbols = int(symbols_var.get() or 0)
-    hashed_password = hashed_password_var.get() or None
-    attack_mode = attack_mode_var.get()
+        keyspace = Keyspace(args.lower, args.upper, args.digits, args.symbols)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Keyspace: {keyspace.size:,} candidates of length {keyspace.length}", file=sys.stderr)
+    if args.dictionary:
+        try:
+            count = save_candidates_to_file(keyspace.candidates(0, args.limit), args.dictionary)
+        except OSError as e:
+            parser.error(str(e))
+        print(f"Wrote {count:,} candidates to {args.dictionary}", file=sys.stderr)
+    if args.benchmark:
+        benchmark(keyspace)
+        return 0
+    if not args.hashes and not args.targets:
+        return 0
 
     try:
-        if not (num_small > 0 or num_capital > 0 or num_digits > 0 or num_symbols > 0):
-            messagebox.showwarning("Warning", "Please specify at least one type of character.")
+        targets = TargetSet.from_file(args.targets) if args.targets else TargetSet()
+        for hex_digest in args.hashes:
+            targets.add(hex_digest, hex_digest)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    checkpoint = Checkpoint(args.checkpoint, keyspace, targets, args.checkpoint_interval) if args.checkpoint else None
+
+    # Status goes to stderr at most once a second on a terminal, every 30s in logs
+    interactive = sys.stderr.isatty()
+    status = {'meter': None, 'shown': 0.0}
+    printed = set()
+
+    def progress(cursor, total):
+        if status['meter'] is None:
+            status['meter'] = ProgressMeter(total, cursor, len(targets.tables))
+            if cursor:
+                print(f"Resuming at candidate {cursor:,}", file=sys.stderr)
             return
+        meter = status['meter']
+        meter.update(cursor)
+        now = time.monotonic()
+        if now - status['shown'] >= (1 if interactive else 30) or cursor == total:
+            status['shown'] = now
+            print(f"\r{meter.status()}   " if interactive else meter.status(), end='' if interactive else '\n',
+                  file=sys.stderr, flush=True)
 
-        if attack_mode == 'dictionary':
-            progress_var.set(0)  # Initialize progress bar
-            progress_window = tk.Toplevel()
-            progress_window.title("Password Cracking Progress")
-            progress_bar = ttk.Progressbar(progress_window, orient=tk.HORIZONTAL, mode='determinate')
-            progress_bar.pack(padx=10, pady=10)
-            progress_var.set(1)  # Start progress
-            threading.Thread(target=lambda: dictionary_attack(hashed_password, num_small, num_capital, num_digits, num_symbols, progress_var)).start()
-            
-            # Save dictionary automatically
-            candidates = generate_candidates(num_small, num_capital, num_digits, num_symbols)
-            filename = f"password_dictionary_{num_small}_{num_capital}_{num_digits}_{num_symbols}.txt"
-            save_candidates_to_file(candidates, filename)
-
-        elif attack_mode == 'live':
-            progress_var.set(0)  # Initialize progress bar
+    def on_hit(target_id, algorithm, password):
+        printed.add(target_id)
+        if interactive and status['shown']:
+            print(file=sys.stderr)  # end the status line
+        print(f"{target_id} ({algorithm}): {password}", flush=True)
+
+    start = time.perf_counter()
+    try:
+        found = dictionary_attack(targets, keyspace, args.workers, args.batch_size, progress, on_hit, checkpoint)
+    except KeyboardInterrupt:
+        print(f"\nInterrupted{'; resume with the same --checkpoint' if checkpoint else ''}", file=sys.stderr)
+        return 130
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - start
+    if interactive and status['shown']:
+        print(file=sys.stderr)
+    for target_id, (algorithm, password) in found.items():
+        if target_id not in printed:
+            print(f"{target_id} ({algorithm}): {password}")
+    print(f"Found {len(found):,} of {len(targets):,} targets in {elapsed:.2f}s", file=sys.stderr)
+    return 0 if found else 1
+
+def run_gui():
+    import tkinter as tk
+    from tkinter import messagebox
+    from tkinter import ttk  # Import ttk for Progressbar
+
+    def report(found):
+        if not found:
+            messagebox.showinfo("Result", "Password not found in keyspace.")
+        else:
+            algorithm, password = next(iter(found.values()))
+            messagebox.showinfo("Result", f"Password found ({algorithm}): {password}")
+
+    # The search thread only puts events on a queue; Tk is touched from the
+    # main loop alone, which drains the queue every REFRESH_MS
+    def attack(targets, keyspace, checkpoint, events):
+        try:
+            found = dictionary_attack(targets, keyspace, progress=lambda cursor, total: events.put(('progress', cursor)),
+                                      checkpoint=checkpoint)
+            # The search finished, so there is nothing left to resume
+            checkpoint.remove()
+        except Exception as e:
+            events.put(('error', e))
+            return
+        events.put(('done', found))
+
+    def poll(events, meter, status_var, progress_window):
+        cursor = None
+        while True:
+            try:
+                kind, value = events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                cursor = value
+                continue
+            if progress_window.winfo_exists():
+                progress_window.destroy()
+            if kind == 'error':
+                messagebox.showerror("Error", f"Dictionary attack error: {value}")
+                return
+            else:
+                progress_var.set(100)
+                report(value)
+                return
+        if cursor is not None:
+            meter.update(cursor)
+            progress_var.set(cursor * 100 // meter.total)
+            status_var.set(meter.status())
+        root.after(REFRESH_MS, poll, events, meter, status_var, progress_window)
+
+    # Function to handle start button click
+    def on_start():
+        hashed_password = hashed_password_var.get().strip() or None
+        attack_mode = attack_mode_var.get()
+
+        try:
+            num_small = int(small_letters_var.get() or 0)
+            num_capital = int(capital_letters_var.get() or 0)
+            num_digits = int(digits_var.get() or 0)
+            num_symbols = int(symbols_var.get() or 0)
+            if not (num_small > 0 or num_capital > 0 or num_digits > 0 or num_symbols > 0):
+                messagebox.showwarning("Warning", "Please specify at least one type of character.")
+                return
+            keyspace = Keyspace(num_small, num_capital, num_digits, num_symbols)
+
+            if attack_mode == 'dictionary':
+                # Save the start of the keyspace as a dictionary
+                filename = f"password_dictionary_{num_small}_{num_capital}_{num_digits}_{num_symbols}.txt"
+                try:
+                    save_candidates_to_file(keyspace.candidates(0, DICTIONARY_SIZE), filename)
+                    messagebox.showinfo("Success", f"Dictionary saved to {filename}")
+                except Exception as e:
+                    messagebox.showerror("Error", f"Failed to save dictionary: {e}")
+
+            if hashed_password is None:
+                if attack_mode == 'live':
+                    messagebox.showwarning("Warning", "Enter a hashed password to attack.")
+                return
+
+            targets = TargetSet.from_hashes([hashed_password])
+            # Runs resume from the checkpoint of the same keyspace and hash
+            checkpoint = Checkpoint(f"password_checkpoint_{num_small}_{num_capital}_{num_digits}_{num_symbols}_"
+                                    f"{targets.fingerprint()[:16]}.json", keyspace, targets)
+            cursor, _ = checkpoint.load()
+            meter = ProgressMeter(keyspace.size, cursor, len(targets.tables))
+            progress_var.set(cursor * 100 // keyspace.size)  # Initialize progress bar
             progress_window = tk.Toplevel()
             progress_window.title("Password Cracking Progress")
-            progress_bar = ttk.Progressbar(progress_window, orient=tk.HORIZONTAL, mode='determinate')
+            progress_bar = ttk.Progressbar(progress_window, orient=tk.HORIZONTAL, length=300, mode='determinate',
+                                           variable=progress_var)
             progress_bar.pack(padx=10, pady=10)
-            progress_var.set(1)  # Start progress
-            threading.Thread(target=lambda: live_attack(hashed_password, num_small, num_capital, num_digits, num_symbols, progress_var)).start()
+            status_var = tk.StringVar(value="Resuming from checkpoint..." if cursor else "Starting...")
+            tk.Label(progress_window, textvariable=status_var).pack(padx=10, pady=(0, 10))
+            events = queue.Queue()
+            threading.Thread(target=attack, args=(targets, keyspace, checkpoint, events), daemon=True).start()
+            root.after(REFRESH_MS, poll, events, meter, status_var, progress_window)
 
-    except ValueError as ve:
-        messagebox.showerror("Error", f"Invalid input: {ve}")
-    except Exception as e:
-        messagebox.showerror("Error", f"An error occurred: {e}")
+        except ValueError as ve:
+            messagebox.showerror("Error", f"Invalid input: {ve}")
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred: {e}")
 
-# Function to save generated dictionary to a file (no longer used directly)
-def save_dictionary():
-    pass  # This function is no longer needed for direct user interaction
+    # GUI Setup
+    root = tk.Tk()
+    root.title("Advanced Password Cracker")
 
-# GUI Setup
-root = tk.Tk()
-root.title("Advanced Password Cracker")
+    # Initialize variables for GUI components
+    small_letters_var = tk.StringVar()
+    capital_letters_var = tk.StringVar()
+    digits_var = tk.StringVar()
+    symbols_var = tk.StringVar()
+    hashed_password_var = tk.StringVar()
+    attack_mode_var = tk.StringVar(value='live')  # Default to live attack mode
+    progress_var = tk.IntVar()
 
-# Initialize variables for GUI components
-small_letters_var = tk.StringVar()
-capital_letters_var = tk.StringVar()
-digits_var = tk.StringVar()
-symbols_var = tk.StringVar()
-hashed_password_var = tk.StringVar()
-attack_mode_var = tk.StringVar(value='live')  # Default to live attack mode
-progress_var = tk.IntVar()
+    # Create main frame
+    frame = tk.Frame(root)
+    frame.pack(padx=10, pady=10)
 
-# Create main frame
-frame = tk.Frame(root)
-frame.pack(padx=10, pady=10)
+    # Labels and Entry fields for character specifications
+    tk.Label(frame, text="Number of Small Letters:").grid(row=0, column=0, sticky="w")
+    tk.Entry(frame, textvariable=small_letters_var).grid(row=0, column=1, sticky="w")
 
-# Labels and Entry fields for character specifications
-tk.Label(frame, text="Number of Small Letters:").grid(row=0, column=0, sticky="w")
-tk.Entry(frame, textvariable=small_letters_var).grid(row=0, column=1, sticky="w")
+    tk.Label(frame, text="Number of Capital Letters:").grid(row=1, column=0, sticky="w")
+    tk.Entry(frame, textvariable=capital_letters_var).grid(row=1, column=1, sticky="w")
 
-tk.Label(frame, text="Number of Capital Letters:").grid(row=1, column=0, sticky="w")
-tk.Entry(frame, textvariable=capital_letters_var).grid(row=1, column=1, sticky="w")
+    tk.Label(frame, text="Number of Digits:").grid(row=2, column=0, sticky="w")
+    tk.Entry(frame, textvariable=digits_var).grid(row=2, column=1, sticky="w")
 
-tk.Label(frame, text="Number of Digits:").grid(row=2, column=0, sticky="w")
-tk.Entry(frame, textvariable=digits_var).grid(row=2, column=1, sticky="w")
+    tk.Label(frame, text="Number of Symbols:").grid(row=3, column=0, sticky="w")
+    tk.Entry(frame, textvariable=symbols_var).grid(row=3, column=1, sticky="w")
 
-tk.Label(frame, text="Number of Symbols:").grid(row=3, column=0, sticky="w")
-tk.Entry(frame, textvariable=symbols_var).grid(row=3, column=1, sticky="w")
+    tk.Label(frame, text="Optional Hashed Password:").grid(row=4, column=0, sticky="w")
+    tk.Entry(frame, textvariable=hashed_password_var).grid(row=4, column=1, sticky="w")
 
-tk.Label(frame, text="Optional Hashed Password:").grid(row=4, column=0, sticky="w")
-tk.Entry(frame, textvariable=hashed_password_var).grid(row=4, column=1, sticky="w")
+    # Radio buttons for Attack Mode selection
+    tk.Label(frame, text="Select Attack Mode:").grid(row=5, column=0, sticky="w")
+    tk.Radiobutton(frame, text="Live Attack", variable=attack_mode_var, value='live').grid(row=5, column=1, sticky="w")
+    tk.Radiobutton(frame, text="Dictionary Attack", variable=attack_mode_var, value='dictionary').grid(row=5, column=2, sticky="w")
 
-# Radio buttons for Attack Mode selection
-tk.Label(frame, text="Select Attack Mode:").grid(row=5, column=0, sticky="w")
-tk.Radiobutton(frame, text="Live Attack", variable=attack_mode_var, value='live').grid(row=5, column=1, sticky="w")
-tk.Radiobutton(frame, text="Dictionary Attack", variable=attack_mode_var, value='dictionary').grid(row=5, column=2, sticky="w")
+    # Button to start the password cracking process
+    tk.Button(frame, text="Start", command=on_start).grid(row=6, column=0, columnspan=3, pady=10)
 
-# Button to start the password cracking process
-tk.Button(frame, text="Start", command=on_start).grid(row=6, column=0, columnspan=3, pady=10)
+    # Run the main GUI event loop
+    root.mainloop()
 
-# Run the main GUI event loop
-root.mainloop()
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(main())
+    run_gui()
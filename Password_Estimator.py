@@ -0,0 +1,335 @@
+import argparse
+import math
+import random
+import statistics
+import string
+import sys
+import time
+from Password_Blocklist import BlocklistIndex
+
+# Guess-count estimator in the style of zxcvbn: the password is covered by a
+# minimum-guesses sequence of dictionary words, keyboard walks, character
+# sequences, repeats and brute-forced characters. Every matcher only needs
+# the previous character's state, so the estimator keeps one frame per
+# character; typing or deleting at the end pushes or pops frames instead of
+# starting over.
+BRUTEFORCE_CARDINALITY = 10
+MIN_SUBMATCH_GUESSES = 50
+SCORE_THRESHOLDS = (1e3, 1e6, 1e8, 1e10)
+MAX_REPEAT_PERIOD = 4
+
+# Module 1: Keyboard graph
+KEYBOARD_ROWS = (
+    ("`1234567890-=", "~!@#$%^&*()_+"),
+    ("qwertyuiop[]\\", "QWERTYUIOP{}|"),
+    ("asdfghjkl;'", 'ASDFGHJKL:"'),
+    ("zxcvbnm,./", "ZXCVBNM<>?"),
+)
+
+def keyboard_graph(rows=KEYBOARD_ROWS):
+    """
+    Maps each key character to (position, shifted) and each position pair to
+    a direction 0-5 (left, right, up-left, up-right, down-left, down-right)
+    on a staggered keyboard, where the number row sits half a key left of
+    the letter rows.
+    """
+    keys = {}
+    positions = {}
+    for r, (plain, shifted) in enumerate(rows):
+        for c, (low, high) in enumerate(zip(plain, shifted)):
+            keys[low] = ((r, c), False)
+            keys[high] = ((r, c), True)
+            positions[(r, c)] = True
+    directions = {}
+    for (r, c) in positions:
+        up = 1 if r == 1 else 0
+        down = 1 if r == 0 else 0
+        neighbours = ((r, c - 1), (r, c + 1), (r - 1, c + up), (r - 1, c + up + 1),
+                      (r + 1, c - down - 1), (r + 1, c - down))
+        for direction, neighbour in enumerate(neighbours):
+            if neighbour in positions:
+                directions[((r, c), neighbour)] = direction
+    degree = len(directions) / len(positions)
+    return keys, directions, 2 * len(positions), degree
+
+KEYBOARD_KEYS, KEYBOARD_DIRECTIONS, KEYBOARD_STARTS, KEYBOARD_DEGREE = keyboard_graph()
+
+# Module 2: Guess estimates per pattern
+def _cardinality(token):
+    size = 0
+    if any(c.islower() for c in token):
+        size += 26
+    if any(c.isupper() for c in token):
+        size += 26
+    if any(c.isdigit() for c in token):
+        size += 10
+    if any(not c.isalnum() for c in token):
+        size += 33
+    return size or BRUTEFORCE_CARDINALITY
+
+def uppercase_variations(token):
+    """ How many ways the capitalisation of a dictionary word could have been chosen """
+    upper = sum(1 for c in token if c.isupper())
+    lower = sum(1 for c in token if c.islower())
+    if upper == 0:
+        return 1
+    if lower == 0 or upper == 1 and (token[0].isupper() or token[-1].isupper()):
+        return 2
+    return sum(math.comb(upper + lower, i) for i in range(1, min(upper, lower) + 1))
+
+def dictionary_guesses(token, rank):
+    return rank * uppercase_variations(token)
+
+def sequence_guesses(token, ascending):
+    first = token[0]
+    if first in 'aAzZ019':
+        base = 4
+    elif first.isdigit():
+        base = 10
+    else:
+        base = 26
+    return base * len(token) * (1 if ascending else 2)
+
+def spatial_guesses(length, turns, shifted):
+    guesses = 0
+    for i in range(2, length + 1):
+        for j in range(1, min(turns, i - 1) + 1):
+            guesses += math.comb(i - 1, j - 1) * KEYBOARD_STARTS * KEYBOARD_DEGREE ** j
+    unshifted = length - shifted
+    if shifted and unshifted:
+        guesses *= sum(math.comb(length, i) for i in range(1, min(shifted, unshifted) + 1))
+    elif shifted:
+        guesses *= 2
+    return guesses
+
+def repeat_guesses(unit, count):
+    return _cardinality(unit) ** len(unit) * count
+
+# Module 3: Incremental estimator
+class _Frame:
+    """ Matcher and DP state after one more character """
+    __slots__ = ('char', 'byte_end', 'ac_state', 'seq_start', 'seq_delta', 'walk_start', 'walk_turns',
+                 'walk_direction', 'walk_shifted', 'repeats', 'cost', 'back')
+
+class StrengthEstimator:
+    """
+    Keeps per-character state for the current password. update() reuses the
+    frames of the longest common prefix with the previous password, so a
+    keystroke at the end costs one frame of matching, whatever the length
+    of the password or the size of the dictionary.
+    """
+    def __init__(self, dictionary=None):
+        self.dictionary = dictionary
+        self.frames = []
+        self.password = ''
+
+    def reset(self):
+        self.frames = []
+        self.password = ''
+
+    def update(self, password):
+        """ Re-estimates for a new password value and returns the result """
+        common = 0
+        limit = min(len(password), len(self.password))
+        while common < limit and password[common] == self.password[common]:
+            common += 1
+        del self.frames[common:]
+        for char in password[common:]:
+            self._push(char)
+        self.password = password
+        return self.result()
+
+    def _push(self, char):
+        frames = self.frames
+        j = len(frames)
+        previous = frames[-1] if frames else None
+        frame = _Frame()
+        frame.char = char
+        matches = []
+
+        # Dictionary words, through the blocklist's Aho-Corasick automaton
+        encoded = char.lower().encode('utf-8', 'surrogateescape')
+        byte_start = previous.byte_end if previous else 0
+        frame.byte_end = byte_start + len(encoded)
+        if self.dictionary is not None:
+            state = previous.ac_state if previous else 0
+            for byte in encoded:
+                state = self.dictionary.step(state, byte)
+            frame.ac_state = state
+            for word_id in self.dictionary.words_ending(state):
+                word_bytes = self.dictionary.word_offsets[word_id + 1] - self.dictionary.word_offsets[word_id]
+                start = self._char_at_byte(frame.byte_end - word_bytes)
+                token = self.password_prefix(start, j) + char
+                matches.append(('dictionary', start, dictionary_guesses(token, self.dictionary.rank(word_id))))
+        else:
+            frame.ac_state = 0
+
+        # Sequences such as abc, 2468 or zyx: a run of equal steps of size 1-5
+        frame.seq_start, frame.seq_delta = j, None
+        if previous is not None:
+            delta = ord(char) - ord(previous.char)
+            if previous.seq_delta == delta:
+                frame.seq_start, frame.seq_delta = previous.seq_start, delta
+            elif delta and abs(delta) <= 5:
+                frame.seq_start, frame.seq_delta = j - 1, delta
+        if frame.seq_delta is not None and j - frame.seq_start >= 2:
+            token = self.password_prefix(frame.seq_start, j) + char
+            matches.append(('sequence', frame.seq_start, sequence_guesses(token, frame.seq_delta > 0)))
+
+        # Keyboard walks: runs of adjacent keys, counting changes of direction
+        key = KEYBOARD_KEYS.get(char)
+        frame.walk_start, frame.walk_turns, frame.walk_direction = j, 0, None
+        frame.walk_shifted = 1 if key and key[1] else 0
+        if key and previous is not None and previous.char in KEYBOARD_KEYS:
+            direction = KEYBOARD_DIRECTIONS.get((KEYBOARD_KEYS[previous.char][0], key[0]))
+            if direction is not None:
+                frame.walk_start = previous.walk_start
+                turned = direction != previous.walk_direction
+                frame.walk_turns = previous.walk_turns + turned
+                frame.walk_direction = direction
+                frame.walk_shifted = previous.walk_shifted + (1 if key[1] else 0)
+        if j - frame.walk_start >= 2:
+            matches.append(('spatial', frame.walk_start,
+                            spatial_guesses(j - frame.walk_start + 1, frame.walk_turns, frame.walk_shifted)))
+
+        # Repeats such as aaa or abcabc: for each period p, how many characters
+        # in a row have matched the character p places earlier
+        repeats = []
+        for period in range(1, MAX_REPEAT_PERIOD + 1):
+            run = 0
+            if j >= period and frames[j - period].char == char:
+                run = (previous.repeats[period - 1] if previous else 0) + 1
+            repeats.append(run)
+            total = run + period
+            if run >= period and run % period == 0 and total >= 3:
+                start = j - total + 1
+                unit = self.password_prefix(start, start + period)
+                matches.append(('repeat', start, repeat_guesses(unit, total // period)))
+        frame.repeats = repeats
+
+        # Minimum guesses: brute-force this character, or end a match here
+        before = previous.cost if previous else 0.0
+        frame.cost, frame.back = before + math.log10(BRUTEFORCE_CARDINALITY), None
+        for pattern, start, guesses in matches:
+            cost = (frames[start - 1].cost if start else 0.0) + math.log10(max(guesses, MIN_SUBMATCH_GUESSES))
+            if cost < frame.cost:
+                frame.cost, frame.back = cost, (pattern, start, guesses)
+        frames.append(frame)
+
+    def _char_at_byte(self, byte_offset):
+        """ Index of the character that starts at byte_offset of the lowercased UTF-8 password """
+        if byte_offset == 0:
+            return 0
+        # Frames' byte_end values are increasing, so the start is one past the frame ending there
+        lo, hi = 0, len(self.frames)
+        while lo < hi:
+            middle = (lo + hi) // 2
+            if self.frames[middle].byte_end < byte_offset:
+                lo = middle + 1
+            else:
+                hi = middle
+        return lo + 1
+
+    def password_prefix(self, start, end):
+        """ Characters start:end of the password being built (end may be the frame being pushed) """
+        return ''.join(frame.char for frame in self.frames[start:end])
+
+    def result(self):
+        frames = self.frames
+        sequence = []
+        j = len(frames) - 1
+        while j >= 0:
+            back = frames[j].back
+            if back is None:
+                start = j
+                while start > 0 and frames[start - 1].back is None:
+                    start -= 1
+                sequence.append({'pattern': 'bruteforce', 'start': start, 'end': j,
+                                 'token': self.password_prefix(start, j + 1),
+                                 'guesses': BRUTEFORCE_CARDINALITY ** (j - start + 1)})
+                j = start - 1
+            else:
+                pattern, start, guesses = back
+                sequence.append({'pattern': pattern, 'start': start, 'end': j,
+                                 'token': self.password_prefix(start, j + 1), 'guesses': guesses})
+                j = start - 1
+        sequence.reverse()
+        log_guesses = frames[-1].cost if frames else 0.0
+        score = sum(1 for threshold in SCORE_THRESHOLDS if log_guesses >= math.log10(threshold + 5))
+        return {
+            'guesses': 10 ** log_guesses if log_guesses < sys.float_info.max_10_exp else float('inf'),
+            'log10_guesses': round(log_guesses, 3),
+            'score': score,
+            'sequence': sequence,
+            'feedback': feedback(sequence, score),
+        }
+
+def feedback(sequence, score):
+    if score >= 3:
+        return []
+    advice = []
+    patterns = {match['pattern'] for match in sequence}
+    if 'dictionary' in patterns:
+        advice.append("Avoid common words and passwords, even with capital letters added.")
+    if 'spatial' in patterns:
+        advice.append("Avoid keyboard patterns like qwerty or zxcvb.")
+    if 'sequence' in patterns:
+        advice.append("Avoid sequences like abc or 6543.")
+    if 'repeat' in patterns:
+        advice.append("Avoid repeated characters and patterns like aaa or abcabc.")
+    advice.append("Add another word or two; uncommon words are better.")
+    return advice
+
+def estimate_strength(password, dictionary=None):
+    """ One-off estimate; keep a StrengthEstimator instead when the password changes key by key """
+    return StrengthEstimator(dictionary).update(password)
+
+# Module 4: Benchmark
+def benchmark(dictionary, passwords=2000, seed=0):
+    """ Types and partly deletes random passwords one keystroke at a time, timing every update """
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + '!@#$%'
+    estimator = StrengthEstimator(dictionary)
+    timings = []
+    for _ in range(passwords):
+        target = ''.join(rng.choices(alphabet, k=rng.randint(8, 24)))
+        typed = ''
+        for char in target:
+            typed += char
+            start = time.perf_counter()
+            estimator.update(typed)
+            timings.append(time.perf_counter() - start)
+        for _ in range(rng.randint(0, 4)):
+            typed = typed[:-1]
+            start = time.perf_counter()
+            estimator.update(typed)
+            timings.append(time.perf_counter() - start)
+        estimator.reset()
+    timings.sort()
+    print(f"{len(timings):,} keystrokes: mean {statistics.mean(timings) * 1e6:.1f} us, "
+          f"p99 {timings[int(len(timings) * 0.99)] * 1e6:.1f} us, max {timings[-1] * 1e6:.1f} us")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Estimate password guess counts from common patterns.")
+    parser.add_argument('passwords', nargs='*')
+    parser.add_argument('--dictionary', help="blocklist index built with Password_Blocklist.py build")
+    parser.add_argument('--benchmark', action='store_true', help="time keystroke-by-keystroke updates")
+    args = parser.parse_args(argv)
+
+    try:
+        dictionary = BlocklistIndex.load(args.dictionary) if args.dictionary else None
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if args.benchmark:
+        benchmark(dictionary)
+    for password in args.passwords:
+        result = estimate_strength(password, dictionary)
+        print(f"{password}: score {result['score']}/4, about 10^{result['log10_guesses']:.1f} guesses")
+        for match in result['sequence']:
+            print(f"  {match['pattern']:<10} {match['token']!r} ({match['guesses']:,.0f} guesses)")
+        for advice in result['feedback']:
+            print(f"  - {advice}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import json
+import random
+import string
+import sys
+import time
+from Password_Strength_Service import DEFAULT_SOCKET
+
+# Load generator for Password_Strength_Service.py: `concurrency` clients each
+# hold one keep-alive connection and send /check requests back to back.
+# Passwords are drawn from a pool of `unique` values, so a small pool
+# exercises the result cache and a large one the batching path.
+
+async def _open(socket_path, port):
+    if port is not None:
+        return await asyncio.open_connection('127.0.0.1', port)
+    return await asyncio.open_unix_connection(socket_path)
+
+async def request(reader, writer, method, path, body=None):
+    """ Sends one HTTP/1.1 request on an open connection and returns the decoded JSON reply """
+    payload = json.dumps(body).encode() if body is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = 0
+    for line in head.decode('latin-1').split('\r\n')[1:]:
+        name, _, value = line.partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    reply = json.loads(await reader.readexactly(length))
+    if status != 200:
+        raise RuntimeError(f"{method} {path} failed with {status}: {reply.get('error')}")
+    return reply
+
+async def client(socket_path, port, passwords, count, latencies):
+    reader, writer = await _open(socket_path, port)
+    try:
+        for password in passwords[:count]:
+            start = time.perf_counter()
+            await request(reader, writer, 'POST', '/check', {'password': password})
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+async def run(socket_path=None, port=None, requests=10000, concurrency=64, unique=1000, seed=0):
+    """ Runs the load and returns client-side statistics plus the service's own /metrics """
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + '!@#$%'
+    pool = [''.join(rng.choices(alphabet, k=rng.randint(6, 16))) for _ in range(unique)]
+    shares = [requests // concurrency + (i < requests % concurrency) for i in range(concurrency)]
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(socket_path, port, rng.choices(pool, k=share), share, latencies)
+                           for share in shares if share))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await _open(socket_path, port)
+    try:
+        metrics = await request(reader, writer, 'GET', '/metrics')
+    finally:
+        writer.close()
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'seconds': round(elapsed, 3),
+        'requests_per_sec': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(latencies[len(latencies) // 2] * 1000, 3),
+        'p99_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 3),
+        'service': metrics,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test a running password strength service.")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help=f"Unix socket path (default: {DEFAULT_SOCKET})")
+    parser.add_argument('--port', type=int, help="connect to 127.0.0.1:PORT instead of a Unix socket")
+    parser.add_argument('-n', '--requests', type=int, default=10000, help="total requests (default: 10000)")
+    parser.add_argument('-c', '--concurrency', type=int, default=64, help="concurrent connections (default: 64)")
+    parser.add_argument('--unique', type=int, default=1000, help="distinct passwords to draw from (default: 1000)")
+    parser.add_argument('--json', action='store_true', help="print the full report as JSON")
+    args = parser.parse_args(argv)
+    if min(args.requests, args.concurrency, args.unique) < 1:
+        parser.error("--requests, --concurrency and --unique must be positive")
+
+    try:
+        report = asyncio.run(run(args.socket, args.port, args.requests, args.concurrency, args.unique))
+    except (OSError, RuntimeError) as e:
+        print(f"Load test failed: {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    service = report['service']
+    print(f"{report['requests']:,} requests in {report['seconds']}s: {report['requests_per_sec']:,} req/s, "
+          f"p50 {report['p50_ms']} ms, p99 {report['p99_ms']} ms (client side)")
+    print(f"service: p50 {service['p50_ms']} ms, p99 {service['p99_ms']} ms, "
+          f"mean batch {service['mean_batch_size']}, cache {service['cache_hits']:,} hits / "
+          f"{service['cache_misses']:,} misses")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,67 @@
-import tkinter as tk
-from tkinter import messagebox
-import re
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from Password_Blocklist import BlocklistIndex
+from Password_Breach_Index import BreachIndex
+from Password_Estimator import StrengthEstimator
 
 # List of common passwords or dictionary words for the uniqueness check
 COMMON_PASSWORDS = ["password", "123456", "12345678", "qwerty", "abc123"]
 
-def check_password_strength(password):
+# Blocklist used by the uniqueness check: COMMON_PASSWORDS unless a compiled
+# index (see Password_Blocklist.py) is loaded with load_blocklist
+BLOCKLIST = BlocklistIndex.from_words(COMMON_PASSWORDS)
+
+def load_blocklist(filepath):
+    """ Memory-maps a blocklist index built by Password_Blocklist.py and uses it for every check """
+    global BLOCKLIST
+    BLOCKLIST = BlocklistIndex.load(filepath)
+    return BLOCKLIST
+
+# Optional breached-password index (see Password_Breach_Index.py); None skips the check
+BREACH_INDEX = None
+
+def load_breach_index(filepath):
+    """ Memory-maps a breach index built by Password_Breach_Index.py and uses it for every check """
+    global BREACH_INDEX
+    BREACH_INDEX = BreachIndex(filepath)
+    return BREACH_INDEX
+
+SPECIAL_CHARACTERS = '!@#$%^&*(),.?":{}|<>'
+
+class _ClassTable(dict):
+    """
+    str.translate table mapping every character to its class: U (uppercase
+    A-Z), L (lowercase a-z), D (digit) or S (special); anything else is
+    dropped. set(password.translate(...)) finds all classes in one pass.
+    """
+    def __init__(self):
+        super().__init__()
+        for chars, name in (('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'U'), ('abcdefghijklmnopqrstuvwxyz', 'L'),
+                            ('0123456789', 'D'), (SPECIAL_CHARACTERS, 'S')):
+            for char in chars:
+                self[ord(char)] = name
+
+    def __missing__(self, key):
+        return None
+
+CLASS_TABLE = _ClassTable()
+
+def character_classes(password):
+    return set(password.translate(CLASS_TABLE))
+
+def check_password_strength(password, blocklist=None, breach_index=None):
     strength = {
         "length_score": 0,
         "complexity_score": 0,
         "uniqueness_score": 0,
+        "blocked_words": [],
+        "breached": None,
         "suggestions": []
     }
     
@@ -24,30 +76,37 @@ def check_password_strength(password):
         strength["length_score"] = 3
 
     # Check Complexity
-    if re.search(r'[A-Z]', password):
+    classes = character_classes(password)
+    if 'U' in classes:
         strength["complexity_score"] += 1
     else:
         strength["suggestions"].append("Add at least one uppercase letter.")
         
-    if re.search(r'[a-z]', password):
+    if 'L' in classes:
         strength["complexity_score"] += 1
     else:
         strength["suggestions"].append("Add at least one lowercase letter.")
         
-    if re.search(r'[0-9]', password):
+    if 'D' in classes:
         strength["complexity_score"] += 1
     else:
         strength["suggestions"].append("Add at least one digit.")
         
-    if re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+    if 'S' in classes:
         strength["complexity_score"] += 1
     else:
         strength["suggestions"].append("Add at least one special character (e.g., !, @, #).")
 
     # Check Uniqueness
-    if any(common_pass in password.lower() for common_pass in COMMON_PASSWORDS):
+    strength["blocked_words"] = (blocklist or BLOCKLIST).matches(password)
+    breach_index = breach_index or BREACH_INDEX
+    if breach_index is not None:
+        strength["breached"] = password in breach_index
+    if strength["blocked_words"]:
         strength["suggestions"].append("Avoid using common words or sequences.")
-    else:
+    if strength["breached"]:
+        strength["suggestions"].append("This password appears in a known data breach; never use it.")
+    if not strength["blocked_words"] and not strength["breached"]:
         strength["uniqueness_score"] = 1
 
     # Calculate Total Score
@@ -65,73 +124,220 @@ def check_password_strength(password):
     
     return strength
 
-def on_password_change(event):
-    password = password_entry.get()
-    
-    if not password:
-        strength_label.config(text="Enter a password to check its strength", fg="black")
-        suggestions_text.config(state=tk.NORMAL)
-        suggestions_text.delete(1.0, tk.END)
-        suggestions_text.config(state=tk.DISABLED)
-        return
-    
+# Bulk audit: each worker process maps the blocklist and breach indexes once
+# (load_indexes is its initializer) and scores whole batches, so only the
+# passwords and their JSONL lines or histogram Counters cross processes.
+def load_indexes(blocklist_path=None, breach_path=None):
+    """ Loads whichever indexes are given; also the initializer of worker processes """
+    if blocklist_path:
+        load_blocklist(blocklist_path)
+    if breach_path:
+        load_breach_index(breach_path)
+
+def _audit_batch(first_line, passwords, summary, show_passwords):
+    """ Scores one batch; returns JSONL lines, or Counters when only a summary is wanted """
+    if summary:
+        levels, suggestions, lengths = Counter(), Counter(), Counter()
+        for password in passwords:
+            strength = check_password_strength(password)
+            levels[strength["level"]] += 1
+            suggestions.update(strength["suggestions"])
+            lengths[min(len(password), 32)] += 1
+        return levels, suggestions, lengths
+    lines = []
+    for number, password in enumerate(passwords, first_line):
+        strength = check_password_strength(password)
+        strength["line"] = number
+        if show_passwords:
+            strength["password"] = password
+        lines.append(json.dumps(strength))
+    return lines
+
+def audit_file(src, dst, summary=False, workers=None, batch_size=10000, show_passwords=False,
+               blocklist_path=None, breach_path=None):
+    """
+    Scores every password in `src` (one per line). Writes one JSON object
+    per password to `dst` in input order, or with `summary` one JSON object
+    of level, suggestion and length histograms. Reads at most 2 * workers
+    batches ahead of the output; if a worker raises, the batches not yet
+    started are cancelled and the exception propagates. Returns the password
+    count.
+    """
+    passwords = (line.rstrip('\r\n') for line in src)
+    workers = workers or os.cpu_count() or 1
+    levels, suggestions, lengths = Counter(), Counter(), Counter()
+    count = 0
+    max_in_flight = 2 * workers
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=load_indexes, initargs=(blocklist_path, breach_path))
     try:
+        in_flight = []
+        while True:
+            while len(in_flight) < max_in_flight:
+                batch = list(islice(passwords, batch_size))
+                if not batch:
+                    break
+                in_flight.append(pool.submit(_audit_batch, count + 1, batch, summary, show_passwords))
+                count += len(batch)
+            if not in_flight:
+                break
+            result = in_flight.pop(0).result()
+            if summary:
+                levels.update(result[0])
+                suggestions.update(result[1])
+                lengths.update(result[2])
+            else:
+                dst.write('\n'.join(result) + '\n')
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    if summary:
+        json.dump({
+            'passwords': count,
+            'levels': dict(levels.most_common()),
+            'suggestions': dict(suggestions.most_common()),
+            'lengths': {('32+' if length == 32 else str(length)): n for length, n in sorted(lengths.items())},
+        }, dst, indent=2)
+        dst.write('\n')
+    return count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score password strength from the command line.")
+    parser.add_argument('passwords', nargs='*')
+    parser.add_argument('--blocklist', help="blocklist index built with Password_Blocklist.py build")
+    parser.add_argument('--breach-index', help="breached-password index built with Password_Breach_Index.py build")
+    parser.add_argument('--audit', metavar='FILE', help="score every password in FILE (one per line, - for stdin)")
+    parser.add_argument('--summary', action='store_true', help="with --audit, print histograms instead of JSONL")
+    parser.add_argument('--show-passwords', action='store_true', help="with --audit, include passwords in the JSONL")
+    parser.add_argument('-o', '--output', help="with --audit, output file (default: stdout)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--batch-size', type=int, default=10000, help="passwords per worker task (default: 10000)")
+    args = parser.parse_args(argv)
+    if not args.passwords and not args.audit:
+        parser.error("give passwords to check or --audit FILE")
+
+    # Load the indexes here first, so a bad path is reported before any worker starts
+    try:
+        load_indexes(args.blocklist, args.breach_index)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    if args.audit:
+        src = dst = None
+        start = time.perf_counter()
+        try:
+            src = sys.stdin if args.audit == '-' else open(args.audit, encoding='utf-8', errors='surrogateescape')
+            dst = open(args.output, 'w', encoding='utf-8', errors='surrogateescape') if args.output else sys.stdout
+            count = audit_file(src, dst, args.summary, args.workers, args.batch_size, args.show_passwords,
+                               args.blocklist, args.breach_index)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        finally:
+            if src is not None and src is not sys.stdin:
+                src.close()
+            if args.output and dst is not None:
+                dst.close()
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed * 60 if elapsed > 0 else 0.0
+        print(f"Audited {count:,} passwords in {elapsed:.2f}s - {rate:,.0f} passwords/min", file=sys.stderr)
+        return 0
+
+    for password in args.passwords:
         strength = check_password_strength(password)
-        strength_level = strength["level"]
-        
-        if strength_level == "Very Strong":
-            strength_label.config(text="Very Strong", fg="green")
-        elif strength_level == "Strong":
-            strength_label.config(text="Strong", fg="blue")
-        elif strength_level == "Fair":
-            strength_label.config(text="Fair", fg="orange")
-        else:
-            strength_label.config(text="Weak", fg="red")
-        
-        # Display suggestions
+        blocked = f" (contains: {', '.join(strength['blocked_words'])})" if strength['blocked_words'] else ''
+        breached = " [BREACHED]" if strength['breached'] else ''
+        print(f"{password}: {strength['level']}{blocked}{breached}")
+        for suggestion in strength['suggestions']:
+            print(f"  - {suggestion}")
+    return 0
+
+def run_gui():
+    import tkinter as tk
+    from tkinter import messagebox
+
+    # The estimator keeps per-character state, so each keystroke only matches
+    # the new character; the suggestions box is redrawn only when it changes
+    estimator = StrengthEstimator(BLOCKLIST)
+    shown = {'suggestions': None}
+
+    def show_suggestions(suggestions):
+        if suggestions == shown['suggestions']:
+            return
+        shown['suggestions'] = suggestions
         suggestions_text.config(state=tk.NORMAL)
         suggestions_text.delete(1.0, tk.END)
-        if strength['suggestions']:
+        if suggestions is None:
+            pass
+        elif suggestions:
             suggestions_text.insert(tk.END, "Suggestions:\n")
-            for suggestion in strength['suggestions']:
+            for suggestion in suggestions:
                 suggestions_text.insert(tk.END, f"- {suggestion}\n")
         else:
             suggestions_text.insert(tk.END, "No suggestions. Your password is strong!")
         suggestions_text.config(state=tk.DISABLED)
+
+    def on_password_change(event):
+        password = password_entry.get()
+        if not password:
+            strength_label.config(text="Enter a password to check its strength", fg="black")
+            show_suggestions(None)
+            return
+    
+        try:
+            estimate = estimator.update(password)
+            strength = check_password_strength(password)
+            strength_level = strength["level"]
+            guesses = f" (~10^{estimate['log10_guesses']:.0f} guesses)"
+        
+            if strength_level == "Very Strong":
+                strength_label.config(text="Very Strong" + guesses, fg="green")
+            elif strength_level == "Strong":
+                strength_label.config(text="Strong" + guesses, fg="blue")
+            elif strength_level == "Fair":
+                strength_label.config(text="Fair" + guesses, fg="orange")
+            else:
+                strength_label.config(text="Weak" + guesses, fg="red")
+        
+            # Display suggestions
+            show_suggestions(strength['suggestions'] + [advice for advice in estimate['feedback']
+                                                        if advice not in strength['suggestions']])
     
-    except Exception as e:
-        messagebox.showerror("Error", f"An error occurred: {str(e)}")
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
 
-def on_submit():
-    password = password_entry.get()
-    if not password:
-        messagebox.showwarning("Input Error", "Please enter a password.")
-    else:
-        strength = check_password_strength(password)
-        messagebox.showinfo("Password Strength", f"Your password is {strength['level']}")
+    def on_submit():
+        password = password_entry.get()
+        if not password:
+            messagebox.showwarning("Input Error", "Please enter a password.")
+        else:
+            strength = check_password_strength(password)
+            messagebox.showinfo("Password Strength", f"Your password is {strength['level']}")
+
+    # Create the main application window
+    root = tk.Tk()
+    root.title("Password Strength Checker")
+    root.geometry("400x300")
 
-# Create the main application window
-root = tk.Tk()
-root.title("Password Strength Checker")
-root.geometry("400x300")
+    # Password Entry
+    tk.Label(root, text="Enter Password:").pack(pady=10)
+    password_entry = tk.Entry(root, show="*", width=30)
+    password_entry.pack()
+    password_entry.bind("<KeyRelease>", on_password_change)
 
-# Password Entry
-tk.Label(root, text="Enter Password:").pack(pady=10)
-password_entry = tk.Entry(root, show="*", width=30)
-password_entry.pack()
-password_entry.bind("<KeyRelease>", on_password_change)
+    # Strength Label
+    strength_label = tk.Label(root, text="Enter a password to check its strength", font=('Helvetica', 12))
+    strength_label.pack(pady=10)
 
-# Strength Label
-strength_label = tk.Label(root, text="Enter a password to check its strength", font=('Helvetica', 12))
-strength_label.pack(pady=10)
+    # Suggestions Text Box
+    suggestions_text = tk.Text(root, height=8, width=50, state=tk.DISABLED)
+    suggestions_text.pack(pady=10)
 
-# Suggestions Text Box
-suggestions_text = tk.Text(root, height=8, width=50, state=tk.DISABLED)
-suggestions_text.pack(pady=10)
+    # Submit Button
+    submit_button = tk.Button(root, text="Check Password Strength", command=on_submit)
+    submit_button.pack(pady=10)
 
-# Submit Button
-submit_button = tk.Button(root, text="Check Password Strength", command=on_submit)
-submit_button.pack(pady=10)
+    # Start the GUI event loop
+    root.mainloop()
 
-# Start the GUI event loop
-root.mainloop()
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(main())
+    run_gui()
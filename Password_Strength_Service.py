@@ -0,0 +1,275 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import signal
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from Password_Strength_Checker import check_password_strength, load_indexes
+
+DEFAULT_SOCKET = '/tmp/password_strength.sock'
+
+# Long-running local checker: dictionaries are loaded once and requests are
+# answered over a minimal HTTP/1.1 on a Unix socket or localhost TCP, e.g.
+#   curl --unix-socket /tmp/password_strength.sock -d '{"password": "hunter2"}' http://localhost/check
+# Concurrent requests are gathered into micro-batches that are scored
+# off the event loop in one executor call, and repeat checks are answered
+# from an LRU cache keyed by a salted hash, so no plaintext is kept.
+
+# Module 1: Result cache
+class ResultCache:
+    """ LRU of results keyed by BLAKE2b(password) under a per-process random salt """
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self.salt = os.urandom(16)
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, password):
+        return hashlib.blake2b(password.encode('utf-8', 'surrogateescape'), key=self.salt, digest_size=16).digest()
+
+    def get(self, key):
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return result
+
+    def put(self, key, result):
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+# Module 2: Metrics
+class Metrics:
+    """ Request counters plus latency percentiles over the most recent requests """
+    def __init__(self, window=10000):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.batches = 0
+        self.batched = 0
+        self.latencies = deque(maxlen=window)
+        self.recent = deque(maxlen=window)
+
+    def record(self, latency):
+        now = time.monotonic()
+        self.requests += 1
+        self.latencies.append(latency)
+        self.recent.append(now)
+
+    def snapshot(self, cache):
+        latencies = sorted(self.latencies)
+        now = time.monotonic()
+
+        def percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 3) if latencies else None
+
+        span = now - self.recent[0] if len(self.recent) > 1 else 0.0
+        return {
+            'requests': self.requests,
+            'uptime_seconds': round(now - self.started, 1),
+            'requests_per_sec': round(self.requests / (now - self.started), 1),
+            'recent_requests_per_sec': round(len(self.recent) / span, 1) if span else None,
+            'p50_ms': percentile(0.50),
+            'p99_ms': percentile(0.99),
+            'batches': self.batches,
+            'mean_batch_size': round(self.batched / self.batches, 2) if self.batches else None,
+            'cache_hits': cache.hits,
+            'cache_misses': cache.misses,
+            'cache_size': len(cache.entries),
+        }
+
+# Module 3: Micro-batching
+def _check_batch(passwords):
+    return [check_password_strength(password) for password in passwords]
+
+class StrengthService:
+    """
+    Queues checks and scores them in micro-batches: a batch is sent as soon
+    as `batch_size` checks are waiting or `max_delay` seconds after its first
+    check, whichever comes first. Cache hits never enter the queue.
+    """
+    def __init__(self, executor, batch_size=256, max_delay=0.002, cache_size=100000):
+        self.executor = executor
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.cache = ResultCache(cache_size)
+        self.metrics = Metrics()
+        self.queue = asyncio.Queue()
+        self.batcher = None
+
+    def start(self):
+        self.batcher = asyncio.get_running_loop().create_task(self._run_batches())
+
+    async def check(self, password):
+        start = time.perf_counter()
+        key = self.cache.key(password)
+        result = self.cache.get(key)
+        if result is None:
+            future = asyncio.get_running_loop().create_future()
+            await self.queue.put((password, key, future))
+            result = await future
+        self.metrics.record(time.perf_counter() - start)
+        return result
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # The same password may be queued twice before its first result is cached
+            unique = list(dict.fromkeys(password for password, _, _ in batch))
+            try:
+                results = dict(zip(unique, await loop.run_in_executor(self.executor, _check_batch, unique)))
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.metrics.batches += 1
+            self.metrics.batched += len(batch)
+            for password, key, future in batch:
+                self.cache.put(key, results[password])
+                if not future.done():
+                    future.set_result(results[password])
+
+# Module 4: HTTP front end
+async def _respond(writer, status, body):
+    payload = json.dumps(body).encode()
+    reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large',
+              500: 'Internal Server Error'}[status]
+    writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+    await writer.drain()
+
+def _parse_check(body):
+    """ Returns (passwords, batched) for a /check body; raises ValueError, KeyError or TypeError if malformed """
+    request = json.loads(body)
+    if 'passwords' in request:
+        return [str(p) for p in request['passwords']], True
+    return [str(request['password'])], False
+
+async def handle_connection(service, reader, writer):
+    """ Serves keep-alive HTTP/1.1 requests until the client closes the connection """
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            # A request that cannot be framed is answered and the connection closed
+            try:
+                lines = head.decode('latin-1').split('\r\n')
+                method, path = lines[0].split(' ')[:2]
+                headers = {name.strip().lower(): value.strip()
+                           for name, _, value in (line.partition(':') for line in lines[1:] if line)}
+                length = int(headers.get('content-length', 0))
+                if length < 0:
+                    raise ValueError("negative Content-Length")
+            except ValueError:
+                await _respond(writer, 400, {'error': 'malformed request'})
+                return
+            if length > 1 << 20:
+                await _respond(writer, 413, {'error': 'request too large'})
+                return
+            body = await reader.readexactly(length) if length else b''
+
+            if method == 'GET' and path == '/metrics':
+                await _respond(writer, 200, service.metrics.snapshot(service.cache))
+            elif method == 'GET' and path == '/health':
+                await _respond(writer, 200, {'status': 'ok'})
+            elif method == 'POST' and path == '/check':
+                try:
+                    passwords, batched = _parse_check(body)
+                except (ValueError, KeyError, TypeError):
+                    await _respond(writer, 400, {'error': 'expected {"password": ...} or {"passwords": [...]}'})
+                else:
+                    try:
+                        results = await asyncio.gather(*(service.check(p) for p in passwords))
+                    except Exception:
+                        await _respond(writer, 500, {'error': 'password check failed'})
+                    else:
+                        await _respond(writer, 200, {'results': results} if batched else results[0])
+            else:
+                await _respond(writer, 404, {'error': 'not found'})
+            if headers.get('connection', '').lower() == 'close':
+                return
+    finally:
+        writer.close()
+
+async def serve(socket_path=None, port=None, workers=0, batch_size=256, max_delay=0.002, cache_size=100000,
+                blocklist_path=None, breach_path=None):
+    """
+    Runs the service until SIGINT or SIGTERM. With workers=0 batches are scored on
+    one thread in this process; otherwise on a process pool whose workers
+    map the dictionaries once at start-up.
+    """
+    load_indexes(blocklist_path, breach_path)
+    if workers:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=load_indexes,
+                                       initargs=(blocklist_path, breach_path))
+    else:
+        executor = ThreadPoolExecutor(max_workers=1)
+    service = StrengthService(executor, batch_size, max_delay, cache_size)
+    service.start()
+
+    def handler(reader, writer):
+        return handle_connection(service, reader, writer)
+
+    if port is not None:
+        server = await asyncio.start_server(handler, '127.0.0.1', port)
+        where = f"http://127.0.0.1:{port}"
+    else:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = await asyncio.start_unix_server(handler, socket_path)
+        os.chmod(socket_path, 0o600)
+        where = f"unix:{socket_path}"
+    print(f"Password strength service listening on {where}", file=sys.stderr)
+    stop = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        asyncio.get_running_loop().add_signal_handler(signum, stop.set)
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if port is None and os.path.exists(socket_path):
+            os.remove(socket_path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local password strength service with batching and caching.")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help=f"Unix socket path (default: {DEFAULT_SOCKET})")
+    parser.add_argument('--port', type=int, help="listen on 127.0.0.1:PORT instead of a Unix socket")
+    parser.add_argument('--workers', type=int, default=0, help="scoring processes (default: 0, one thread)")
+    parser.add_argument('--batch-size', type=int, default=256, help="maximum checks per batch (default: 256)")
+    parser.add_argument('--max-delay', type=float, default=2.0, help="batching delay in ms (default: 2)")
+    parser.add_argument('--cache-size', type=int, default=100000, help="cached results (default: 100000)")
+    parser.add_argument('--blocklist', help="blocklist index built with Password_Blocklist.py build")
+    parser.add_argument('--breach-index', help="breached-password index built with Password_Breach_Index.py build")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.socket, args.port, args.workers, args.batch_size, args.max_delay / 1000,
+                          args.cache_size, args.blocklist, args.breach_index))
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())